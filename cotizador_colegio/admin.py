@@ -11,6 +11,8 @@ from .models import (
     DetallePedido,
     Editorial,
     Producto,
+    OrdenCompra,
+    DetalleOrdenCompra,
 )
 
 
@@ -96,3 +98,5 @@ admin.site.register(Adopcion)
 admin.site.register(DetalleAdopcion)
 admin.site.register(Pedido)
 admin.site.register(DetallePedido)
+admin.site.register(OrdenCompra)
+admin.site.register(DetalleOrdenCompra)
@@ -1,35 +1,99 @@
+from decimal import Decimal
+
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
 
-from .models import Producto, Cotizacion, Adopcion, Pedido, DetalleCotizacion, EstadoCotizacion
+from .models import Producto, Cotizacion, Adopcion, Pedido, DetalleCotizacion, EstadoCotizacion, OrdenCompra
 from .serializers import (
     ProductoCatalogoSerializer,
     CotizacionPanelSerializer,
     CotizacionDetalleSerializer,
     AdopcionPanelSerializer,
     PedidoSerializer,
+    OrdenCompraSerializer,
 )
 
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter
 
-from .pricing import calcular_item
+from .busqueda import BusquedaProductoFilter
+from .filters import CotizacionFilter, AdopcionFilter, PedidoFilter
+from .paginacion import CatalogoOpcionalPagination, PanelPagination
+from .pricing import (
+    calcular_batch,
+    simular_escenarios,
+    resolver_objetivo,
+    validar_tipo_venta,
+    validar_backend,
+    validar_item,
+)
+from .catalogo import precios_productos, catalogo_condicional
+from .estados import normalizar_cambios, transicionar_cotizaciones
+from .consolidacion import consolidar_pedidos
+
+
+def _error_items(items):
+    """Motivo del 400 si items no es una lista no vacía de objetos con producto_id."""
+    if not isinstance(items, list) or not items:
+        return "items debe ser una lista no vacía."
+    if any(not isinstance(it, dict) for it in items):
+        return "Cada item debe ser un objeto."
+    if any(not it.get("producto_id") for it in items):
+        return "Cada item requiere producto_id."
+    return None
+
+
+def _es_numero(value) -> bool:
+    """Número finito (o texto numérico); bool / basura / NaN no."""
+    if isinstance(value, bool):
+        return False
+    try:
+        return Decimal(str(value).strip()).is_finite()
+    except (ArithmeticError, ValueError):
+        return False
 
 
+def _productos_de_items(items):
+    """Precios (snapshot) alineados con items; 404 si algún producto_id no existe."""
+    ids = []
+    for it in items:
+        try:
+            ids.append(int(it.get("producto_id")))
+        except (TypeError, ValueError):
+            raise Http404
+
+    snapshot = precios_productos(ids)
+    if any(pid not in snapshot for pid in ids):
+        raise Http404
+    return [snapshot[pid] for pid in ids]
+
+
+@method_decorator(catalogo_condicional, name="list")
+@method_decorator(catalogo_condicional, name="retrieve")
 class ProductoViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Producto.objects.select_related("editorial").filter(estado=True).order_by("nombre")
     serializer_class = ProductoCatalogoSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, BusquedaProductoFilter]
     filterset_fields = ["editorial", "nivel", "grado", "area"]
-    search_fields = ["nombre", "codigo"]
+    pagination_class = CatalogoOpcionalPagination
 
 
 class CotizacionViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Cotizacion.objects.select_related("institucion", "asesor").prefetch_related("detalles__producto").order_by("-id")
+    queryset = Cotizacion.objects.select_related("institucion", "asesor").order_by("-id")
     serializer_class = CotizacionPanelSerializer
+    pagination_class = PanelPagination
+    filterset_class = CotizacionFilter
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        # el panel usa el resumen denormalizado; los detalles solo en retrieve
+        if self.action == "retrieve":
+            qs = qs.prefetch_related("detalles__producto__editorial")
+        return qs
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -40,44 +104,172 @@ class CotizacionViewSet(viewsets.ReadOnlyModelViewSet):
     def calcular_batch(self, request):
         """
         POST /api/v2/cotizaciones/calcular-batch/
-        { tipo_venta, items: [{producto_id, precio_be, descuento_ie, precio_ppff, desc_consigna, comision, comi_coo}] }
+        { tipo_venta, backend?: "centavos"|"decimal", items: [{producto_id, cantidad, tipo_venta?, precio_be, descuento_ie, precio_ppff, desc_consigna, comision, comi_coo}] }
+
+        Un item puede traer su propio tipo_venta. Los items inválidos no cortan el lote:
+        se devuelven en "errores" con su posición. Totales ponderados por cantidad.
         """
         data = request.data or {}
         tipo_venta = (data.get("tipo_venta") or "").upper().strip()
         items = data.get("items") or []
+        backend = data.get("backend")
 
         if not tipo_venta:
             return Response({"detail": "tipo_venta es requerido."}, status=400)
         if not isinstance(items, list) or not items:
             return Response({"detail": "items debe ser una lista no vacía."}, status=400)
+        try:
+            validar_tipo_venta(tipo_venta)
+            validar_backend(backend)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
 
-        out_items = []
-        for it in items:
-            pid = it.get("producto_id")
-            if not pid:
-                return Response({"detail": "Cada item requiere producto_id."}, status=400)
+        # 1) validar items y juntar ids (sin consultas)
+        errores = []
+        validos = []   # (index, item, producto_id, tipo_venta, cantidad)
+        for i, it in enumerate(items):
+            if not isinstance(it, dict):
+                errores.append({"index": i, "producto_id": None, "detail": "Item inválido."})
+                continue
 
-            producto = get_object_or_404(Producto, id=pid)
             try:
-                calc = calcular_item(tipo_venta, producto, it)
+                pid, tv, cantidad = validar_item(it, tipo_venta)
             except ValueError as e:
-                return Response({"detail": str(e)}, status=400)
+                errores.append({"index": i, "producto_id": it.get("producto_id"), "detail": str(e)})
+                continue
 
-            out_items.append(calc)
+            validos.append((i, it, pid, tv, cantidad))
 
-        # totales simples (fase 1)
-        total_bruto = sum([float(i.get("precio_ie", i.get("precio_consigna", 0))) for i in out_items])
-        total_utilidad = sum([float(i.get("utilidad_be_x_un", 0)) for i in out_items])
+        # 2) una sola carga de productos para todo el lote
+        productos = precios_productos([pid for _, _, pid, _, _ in validos])
+
+        grupos = {}
+        for v in validos:
+            i, it, pid, tv, cantidad = v
+            if pid not in productos:
+                errores.append({"index": i, "producto_id": pid, "detail": "Producto no existe."})
+                continue
+            grupos.setdefault(tv, []).append(v)
+
+        # 3) cálculo por tipo_venta + totales exactos (Decimal) ponderados por cantidad
+        filas = {}
+        por_tipo = {}
+        for tv, grupo in grupos.items():
+            rows = calcular_batch(
+                tv, [it for _, it, _, _, _ in grupo], [productos[pid] for _, _, pid, _, _ in grupo], backend=backend
+            )
+            tot = por_tipo.setdefault(tv, {
+                "items": 0,
+                "cantidad": 0,
+                "total_bruto": Decimal("0.00"),
+                "total_costo": Decimal("0.00"),
+                "total_utilidad": Decimal("0.00"),
+            })
+            for (i, _, _, _, cantidad), row in zip(grupo, rows):
+                filas[i] = row
+                tot["items"] += 1
+                tot["cantidad"] += cantidad
+                tot["total_bruto"] += row.get("precio_ie", row.get("precio_consigna", 0)) * cantidad
+                tot["total_costo"] += row["precio_proveedor"] * cantidad
+                tot["total_utilidad"] += row["utilidad_be_x_un"] * cantidad
+
+        out_items = [filas[i] for i in sorted(filas)]
+        errores.sort(key=lambda e: e["index"])
 
         return Response({
             "tipo_venta": tipo_venta,
             "items": out_items,
+            "errores": errores,
             "totales": {
-                "total_bruto": round(total_bruto, 2),
-                "total_utilidad": round(total_utilidad, 2),
+                "total_bruto": sum((t["total_bruto"] for t in por_tipo.values()), Decimal("0.00")),
+                "total_utilidad": sum((t["total_utilidad"] for t in por_tipo.values()), Decimal("0.00")),
+                "por_tipo_venta": por_tipo,
             }
         }, status=200)
 
+    @action(detail=False, methods=["post"], url_path="escenarios")
+    def escenarios(self, request):
+        """
+        POST /api/v2/cotizaciones/escenarios/
+        {
+          tipo_venta,
+          items: [{producto_id, cantidad, precio_be, descuento_ie, precio_ppff, comi_coo, desc_consigna, comision}],
+          rangos: {
+            descuento_ie: {desde: 10, hasta: 30, paso: 2.5},   // PV / FERIA
+            comi_coo: [0, 2, 4],                                // PV / FERIA
+            desc_consigna: {...}, comision: [...]               // CONSIGNA
+          }
+        }
+        Devuelve un escenario por combinación con total_bruto, total_utilidad, total_costo y roi_percent.
+        """
+        data = request.data or {}
+        tipo_venta = (data.get("tipo_venta") or "").upper().strip()
+        items = data.get("items") or []
+        rangos = data.get("rangos") or {}
+
+        if not tipo_venta:
+            return Response({"detail": "tipo_venta es requerido."}, status=400)
+        error = _error_items(items)
+        if error:
+            return Response({"detail": error}, status=400)
+        if not isinstance(rangos, dict):
+            return Response({"detail": "rangos debe ser un objeto."}, status=400)
+
+        productos = _productos_de_items(items)
+
+        try:
+            out = simular_escenarios(tipo_venta, items, productos, rangos)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        return Response(out, status=200)
+
+    @action(detail=False, methods=["post"], url_path="objetivo")
+    def objetivo(self, request):
+        """
+        POST /api/v2/cotizaciones/objetivo/
+        {
+          tipo_venta, items: [{producto_id, cantidad, ..., valor_objetivo?}],
+          objetivo: "roi" | "precio" | "total",
+          valor: 25,                         // % para roi, soles para precio / total
+          variable?: "descuento" | "comision",
+          modo?: "linea" | "uniforme"
+        }
+        Devuelve el descuento / comisión que cumple el objetivo y los items recalculados.
+        """
+        data = request.data or {}
+        tipo_venta = (data.get("tipo_venta") or "").upper().strip()
+        items = data.get("items") or []
+
+        if not tipo_venta:
+            return Response({"detail": "tipo_venta es requerido."}, status=400)
+        error = _error_items(items)
+        if error:
+            return Response({"detail": error}, status=400)
+        if data.get("valor") in [None, ""]:
+            return Response({"detail": "valor es requerido."}, status=400)
+        if not _es_numero(data.get("valor")):
+            return Response({"detail": "valor debe ser numérico."}, status=400)
+        if any("valor_objetivo" in it and not _es_numero(it["valor_objetivo"]) for it in items):
+            return Response({"detail": "valor_objetivo debe ser numérico."}, status=400)
+
+        productos = _productos_de_items(items)
+
+        try:
+            out = resolver_objetivo(
+                tipo_venta,
+                items,
+                productos,
+                objetivo=data.get("objetivo"),
+                valor=data.get("valor"),
+                variable=data.get("variable"),
+                modo=data.get("modo"),
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        return Response(out, status=200)
+
     @action(detail=True, methods=["patch"], url_path="estado")
     def cambiar_estado(self, request, pk=None):
         cot = self.get_object()
@@ -90,12 +282,61 @@ class CotizacionViewSet(viewsets.ReadOnlyModelViewSet):
         cot.save(update_fields=["estado"])
         return Response({"detail": "Estado actualizado.", "estado": cot.estado}, status=200)
 
+    @action(detail=False, methods=["post"], url_path="estado-lote")
+    def cambiar_estado_lote(self, request):
+        try:
+            cambios = normalizar_cambios(request.data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        return Response(transicionar_cotizaciones(cambios), status=200)
+
 
 class AdopcionViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Adopcion.objects.select_related("cotizacion", "cotizacion__institucion", "cotizacion__asesor").order_by("-id")
+    queryset = (
+        Adopcion.objects.select_related("cotizacion", "cotizacion__institucion", "cotizacion__asesor")
+        .prefetch_related("detalles__producto")
+        .order_by("-id")
+    )
     serializer_class = AdopcionPanelSerializer
+    pagination_class = PanelPagination
+    filterset_class = AdopcionFilter
 
 
 class PedidoViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Pedido.objects.select_related("adopcion").order_by("-fecha_pedido")
+    queryset = (
+        Pedido.objects.select_related("adopcion__cotizacion")
+        .prefetch_related("detalles__producto")
+        .order_by("-fecha_pedido")
+    )
     serializer_class = PedidoSerializer
+    pagination_class = PanelPagination
+    filterset_class = PedidoFilter
+
+
+class OrdenCompraViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = (
+        OrdenCompra.objects.select_related("editorial")
+        .prefetch_related("pedidos", "detalles__producto")
+        .order_by("-id")
+    )
+    serializer_class = OrdenCompraSerializer
+    pagination_class = PanelPagination
+
+    @action(detail=False, methods=["post"], url_path="consolidar")
+    def consolidar(self, request):
+        """
+        POST {"hasta": "YYYY-MM-DD" (opcional), "preview": true|false}
+        Consolida los pedidos EMITIDO en una orden de compra por editorial.
+        """
+        hasta = request.data.get("hasta") or None
+        if hasta:
+            hasta = parse_date(str(hasta))
+            if hasta is None:
+                return Response({"detail": "hasta inválido (YYYY-MM-DD)."}, status=400)
+        preview = str(request.data.get("preview", "")).lower() in ("1", "true", "si", "sí")
+
+        ordenes = consolidar_pedidos(hasta=hasta, guardar=not preview)
+        return Response(
+            {"preview": preview, "ordenes": ordenes},
+            status=status.HTTP_200_OK if preview else status.HTTP_201_CREATED,
+        )
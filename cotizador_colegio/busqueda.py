@@ -0,0 +1,112 @@
+# cotizador_colegio/busqueda.py
+import unicodedata
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Func, Q, TextField, Value, When
+from django.db.models.functions import Lower
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Editorial
+
+
+# ============================
+# ✅ Búsqueda de catálogo
+# ============================
+# En PostgreSQL usa los índices de la migración 0006:
+# - productos_nombre_trgm_idx   -> f_unaccent(lower(nombre)) gin_trgm_ops
+# - productos_nombre_fts_idx    -> to_tsvector('spanish', f_unaccent(lower(nombre)))
+# - productos_codigo_prefix_idx -> upper(codigo) text_pattern_ops
+# Las expresiones de abajo tienen que coincidir EXACTAMENTE con las de los índices.
+
+MODO_RANKED = "ranked"
+MODO_CONTAINS = "contains"   # comportamiento anterior (icontains)
+
+
+class SinTildes(Func):
+    function = "f_unaccent"
+    output_field = TextField()
+
+
+class VectorNombre(Func):
+    template = "to_tsvector('spanish'::regconfig, %(expressions)s)"
+    output_field = SearchVectorField()
+
+
+def normalizar(texto: str) -> str:
+    """'Comunicación' -> 'comunicacion' (mismo criterio que f_unaccent(lower(...)))."""
+    texto = unicodedata.normalize("NFKD", (texto or "").lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def _parece_codigo(texto: str) -> bool:
+    return " " not in texto and any(c.isdigit() for c in texto)
+
+
+def buscar_productos(qs, texto, modo=None):
+    """
+    Filtra (y en modo ranked ordena por relevancia) un queryset de Producto.
+    - Si el texto parece un código y hay productos con ese prefijo, solo devuelve esos.
+    - Si no: nombre (parcial, sin tildes, con errores de tipeo), full-text, prefijo
+      de código o nombre de editorial, ordenado por relevancia.
+    Fuera de PostgreSQL (o con modo="contains") se usa el icontains de siempre.
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        return qs
+
+    modo = (modo or MODO_RANKED).lower().strip()
+    if modo != MODO_RANKED or connection.vendor != "postgresql":
+        return qs.filter(
+            Q(nombre__icontains=texto)
+            | Q(codigo__icontains=texto)
+            | Q(editorial__nombre__icontains=texto)
+        )
+
+    # camino rápido: prefijo exacto de código
+    if _parece_codigo(texto):
+        por_codigo = qs.filter(codigo__istartswith=texto)
+        if por_codigo.exists():
+            return por_codigo.annotate(rank=Value(1.0, output_field=FloatField())).order_by("codigo", "id")
+
+    termino = SinTildes(Lower(Value(texto)))
+    consulta = SearchQuery(termino, config="spanish")
+
+    # editoriales: tabla chica, se resuelven antes para que el OR quede sobre índices de productos
+    editoriales = list(
+        Editorial.objects.filter(nombre__unaccent__icontains=texto).values_list("id", flat=True)
+    )
+
+    return (
+        qs.annotate(
+            nombre_busqueda=SinTildes(Lower("nombre")),
+            vector_busqueda=VectorNombre(SinTildes(Lower("nombre"))),
+        )
+        .filter(
+            Q(nombre_busqueda__contains=normalizar(texto))
+            | Q(nombre_busqueda__trigram_word_similar=termino)
+            | Q(vector_busqueda=consulta)
+            | Q(codigo__istartswith=texto)
+            | Q(editorial_id__in=editoriales)
+        )
+        .annotate(
+            rank=(
+                Case(When(codigo__istartswith=texto, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+                + TrigramWordSimilarity(termino, F("nombre_busqueda"))
+                + SearchRank(F("vector_busqueda"), consulta)
+            )
+        )
+        .order_by("-rank", "id")
+    )
+
+
+class BusquedaProductoFilter(BaseFilterBackend):
+    """Reemplaza a SearchFilter en la API v2: ?search=...&search_mode=ranked|contains"""
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        return buscar_productos(
+            queryset,
+            request.query_params.get(self.search_param),
+            request.query_params.get("search_mode"),
+        )
@@ -0,0 +1,456 @@
+# cotizador_colegio/catalogo.py
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Subquery
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .models import CambioProducto, CatalogoVersion, Editorial, Producto
+from .pricing import precompilar_producto, _centavos
+
+
+# ============================
+# ✅ Versión global del catálogo
+# ============================
+def version_catalogo() -> int:
+    v = CatalogoVersion.objects.filter(pk=1).values_list("version", flat=True).first()
+    return v or 0
+
+
+def incrementar_version_catalogo() -> int:
+    """
+    Sube la versión y la devuelve. El UPDATE bloquea la fila hasta el commit, así que
+    las versiones se confirman en orden (lo que necesita el log de cambios).
+    """
+    with transaction.atomic():
+        updated = CatalogoVersion.objects.filter(pk=1).update(version=F("version") + 1)
+        if not updated:
+            CatalogoVersion.objects.get_or_create(pk=1, defaults={"version": 1})
+        return CatalogoVersion.objects.filter(pk=1).values_list("version", flat=True).get()
+
+
+# ============================
+# ✅ Log de cambios de Producto (sync por delta)
+# ============================
+MAX_CAMBIOS_DELTA = 5000
+
+
+def registrar_cambio_producto(producto_id) -> int:
+    with transaction.atomic():
+        version = incrementar_version_catalogo()
+        CambioProducto.objects.create(version=version, producto_id=producto_id)
+    return version
+
+
+def cambios_desde(since: int) -> dict:
+    """
+    Productos que cambiaron después de `since`.
+    {version, completo, productos (activos, queryset), bajas (ids desactivados o borrados)}
+    completo=True => el delta no alcanza (log compactado o demasiados cambios): recargar todo.
+    """
+    estado = CatalogoVersion.objects.filter(pk=1).values("version", "version_compactada").first()
+    version = estado["version"] if estado else 0
+    if estado and since < estado["version_compactada"]:
+        return {"version": version, "completo": True, "productos": Producto.objects.none(), "bajas": []}
+
+    cambios = list(
+        CambioProducto.objects.filter(version__gt=since)
+        .values("producto_id")
+        .annotate(v=Max("version"))
+        .order_by()[: MAX_CAMBIOS_DELTA + 1]
+    )
+    if len(cambios) > MAX_CAMBIOS_DELTA:
+        return {"version": version, "completo": True, "productos": Producto.objects.none(), "bajas": []}
+
+    version = max([version] + [c["v"] for c in cambios])
+    ids = {c["producto_id"] for c in cambios}
+    productos = Producto.objects.select_related("editorial").filter(id__in=ids, estado=True).order_by("id")
+    activos = set(productos.values_list("id", flat=True))
+
+    return {
+        "version": version,
+        "completo": False,
+        "productos": productos,
+        "bajas": sorted(ids - activos),
+    }
+
+
+def compactar_cambios(dias_bajas=180) -> dict:
+    """
+    1) Deja una sola entrada por producto (la más reciente): el delta solo necesita saber
+       que cambió, el estado se lee de Producto.
+    2) Purga las entradas de productos dados de baja/borrados hace más de `dias_bajas`;
+       sube version_compactada para que los clientes más viejos recarguen completo.
+    """
+    ultimas = CambioProducto.objects.values("producto_id").annotate(v=Max("version")).values("v")
+    superadas, _ = CambioProducto.objects.exclude(version__in=Subquery(ultimas)).delete()
+
+    limite = timezone.now() - timedelta(days=dias_bajas)
+    bajas = CambioProducto.objects.filter(fecha__lt=limite).exclude(
+        producto_id__in=Producto.objects.filter(estado=True).values("id")
+    )
+    with transaction.atomic():
+        hasta = bajas.aggregate(m=Max("version"))["m"]
+        purgadas = 0
+        if hasta:
+            purgadas, _ = bajas.delete()
+            CatalogoVersion.objects.filter(pk=1, version_compactada__lt=hasta).update(version_compactada=hasta)
+
+    return {"superadas": superadas, "bajas_purgadas": purgadas, "version_compactada": hasta}
+
+
+# ============================
+# ✅ GET condicional (ETag / 304)
+# ============================
+def etag_catalogo(request, *args, **kwargs) -> str:
+    """
+    ETag fuerte para respuestas del catálogo: versión + URL completa (+ Accept, por el
+    renderer de DRF). Misma versión y misma URL => mismos bytes.
+    """
+    clave = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+    return f'"catalogo-{version_catalogo()}-{hashlib.sha1(clave.encode()).hexdigest()[:16]}"'
+
+
+def etag_snapshot(request, *args, **kwargs) -> str:
+    # el snapshot depende solo de la versión (mismos bytes gzip para cualquier URL)
+    return f'"catalogo-snapshot-{version_catalogo()}"'
+
+
+def catalogo_condicional(view):
+    """
+    Decorador para vistas de catálogo: ETag + 304 con If-None-Match.
+    Usar con method_decorator en APIView/ViewSet.
+    """
+    view = condition(etag_func=etag_catalogo)(view)
+
+    def inner(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        # el navegador puede guardar la respuesta pero debe revalidar siempre (304 es barato)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wraps(view)(inner)
+
+
+# ============================
+# ✅ Snapshot de precios en memoria (por proceso)
+# ============================
+# producto_id -> PrecioProducto (descuento normalizado + precio proveedor ya calculados).
+# Se descarta entero cuando cambia la versión del catálogo (p.ej. importación desde
+# otro proceso) y por producto desde las señales de este proceso.
+_lock = threading.Lock()
+_snapshot = {"version": None, "productos": {}}
+
+
+def invalidar_producto(producto_id):
+    with _lock:
+        _snapshot["productos"].pop(producto_id, None)
+
+
+def invalidar_snapshot():
+    with _lock:
+        _snapshot["version"] = None
+        _snapshot["productos"] = {}
+
+
+def precios_productos(ids) -> dict:
+    """
+    Devuelve {producto_id: PrecioProducto} para los ids que existen.
+    Solo consulta la BD por los productos que no están en el snapshot.
+    """
+    version = version_catalogo()
+
+    with _lock:
+        if _snapshot["version"] != version:
+            _snapshot["version"] = version
+            _snapshot["productos"] = {}
+        cache = _snapshot["productos"]
+        out = {pid: cache[pid] for pid in ids if pid in cache}
+
+    faltantes = {pid for pid in ids if pid not in out}
+    if faltantes:
+        nuevos = {
+            p.id: precompilar_producto(p)
+            for p in Producto.objects.filter(id__in=faltantes).only("id", "pvp_2026", "descuento_proveedor")
+        }
+        with _lock:
+            if _snapshot["version"] == version:
+                _snapshot["productos"].update(nuevos)
+        out.update(nuevos)
+
+    return out
+
+
+# ============================
+# ✅ Facetas de filtros (una sola consulta)
+# ============================
+# Cada faceta se cuenta con todos los filtros aplicados salvo el suyo, así el front
+# puede cambiar de editorial/nivel/... sin perder las demás opciones.
+FACETAS = ("editorial", "nivel", "area", "grado")
+FACETAS_CACHE_TIMEOUT = 60 * 60
+
+
+def _condiciones_facetas(filtros):
+    """{faceta: (sql, params)} con la condición de cada filtro aplicado ("TRUE" si no hay)."""
+    conds = {f: ("TRUE", []) for f in FACETAS}
+
+    editorial = filtros.get("editorial")
+    if editorial:
+        try:
+            conds["editorial"] = ("p.editorial_id = %s", [int(editorial)])
+        except (TypeError, ValueError):
+            conds["editorial"] = ("UPPER(e.nombre) = UPPER(%s)", [editorial])
+
+    for campo in ("nivel", "area", "grado"):
+        valor = filtros.get(campo)
+        if valor:
+            conds[campo] = (f"UPPER(p.{campo}) = UPPER(%s)", [valor])
+
+    return conds
+
+
+def _sql_facetas(filtros, base_sql="", base_params=()):
+    conds = _condiciones_facetas(filtros)
+
+    columnas, params = [], []
+    for faceta in FACETAS:
+        otras = [conds[f] for f in FACETAS if f != faceta]
+        columnas.append(
+            f"COUNT(*) FILTER (WHERE {' AND '.join(sql for sql, _ in otras)}) AS c_{faceta}"
+        )
+        for _, p in otras:
+            params.extend(p)
+
+    where = "p.estado"
+    if base_sql:
+        where += f" AND p.id IN ({base_sql})"
+        params.extend(base_params)
+
+    sql = f"""
+        SELECT p.editorial_id, e.nombre, p.nivel, p.area, p.grado,
+               GROUPING(p.editorial_id, e.nombre), GROUPING(p.nivel),
+               GROUPING(p.area), GROUPING(p.grado),
+               {", ".join(columnas)}
+        FROM {Producto._meta.db_table} p
+        JOIN {Editorial._meta.db_table} e ON e.id = p.editorial_id
+        WHERE {where}
+        GROUP BY GROUPING SETS ((p.editorial_id, e.nombre), (p.nivel), (p.area), (p.grado))
+    """
+    return sql, params
+
+
+def _facetas_grouping_sets(filtros, base_qs=None):
+    base_sql, base_params = "", ()
+    if base_qs is not None:
+        base_sql, base_params = base_qs.values("id").query.sql_with_params()
+
+    sql, params = _sql_facetas(filtros, base_sql, base_params)
+    out = {f: [] for f in FACETAS}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for eid, enombre, nivel, area, grado, g_ed, g_niv, g_area, g_gr, *conteos in cursor.fetchall():
+            c_ed, c_niv, c_area, c_gr = conteos
+            if g_ed == 0:
+                out["editorial"].append(((eid, enombre), c_ed))
+            elif g_niv == 0:
+                out["nivel"].append((nivel, c_niv))
+            elif g_area == 0:
+                out["area"].append((area, c_area))
+            elif g_gr == 0:
+                out["grado"].append((grado, c_gr))
+    return out
+
+
+def _facetas_orm(filtros, base_qs=None):
+    """Fallback sin GROUPING SETS (sqlite en desarrollo): una consulta por faceta."""
+    qs = base_qs if base_qs is not None else Producto.objects.filter(estado=True)
+
+    def aplicar(qs, excepto):
+        for f in FACETAS:
+            valor = filtros.get(f)
+            if f == excepto or not valor:
+                continue
+            if f == "editorial":
+                try:
+                    qs = qs.filter(editorial_id=int(valor))
+                except (TypeError, ValueError):
+                    qs = qs.filter(editorial__nombre__iexact=valor)
+            else:
+                qs = qs.filter(**{f"{f}__iexact": valor})
+        return qs
+
+    out = {}
+    rows = aplicar(qs, "editorial").values("editorial_id", "editorial__nombre").annotate(n=Count("id"))
+    out["editorial"] = [((r["editorial_id"], r["editorial__nombre"]), r["n"]) for r in rows]
+    for campo in ("nivel", "area", "grado"):
+        rows = aplicar(qs, campo).values(campo).annotate(n=Count("id"))
+        out[campo] = [(r[campo], r["n"]) for r in rows]
+    return out
+
+
+def facetas_productos(filtros, search=None, search_mode=None) -> dict:
+    """
+    Opciones de filtro del catálogo con su conteo de productos activos.
+    Cacheado por versión del catálogo + filtros: cualquier cambio en Producto/Editorial
+    sube la versión y deja obsoletas las entradas anteriores.
+    """
+    from .busqueda import buscar_productos
+
+    filtros = {f: (filtros.get(f) or "").strip() for f in FACETAS}
+    search = (search or "").strip()
+    clave = json.dumps(
+        {"v": version_catalogo(), "f": filtros, "s": search, "m": search_mode or ""},
+        sort_keys=True,
+    )
+    cache_key = "facetas:" + hashlib.sha1(clave.encode()).hexdigest()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    base_qs = None
+    if search:
+        base_qs = buscar_productos(Producto.objects.filter(estado=True), search, search_mode)
+
+    if connection.vendor == "postgresql":
+        crudo = _facetas_grouping_sets(filtros, base_qs)
+    else:
+        crudo = _facetas_orm(filtros, base_qs)
+
+    data = {
+        "editoriales": sorted(
+            ({"id": eid, "nombre": nombre, "count": n} for (eid, nombre), n in crudo["editorial"] if n),
+            key=lambda x: (x["nombre"], x["id"]),
+        ),
+    }
+    for campo, clave_resp in (("nivel", "niveles"), ("area", "areas"), ("grado", "grados")):
+        data[clave_resp] = sorted(
+            ({"valor": v, "count": n} for v, n in crudo[campo] if v and n),
+            key=lambda x: x["valor"],
+        )
+
+    cache.set(cache_key, data, FACETAS_CACHE_TIMEOUT)
+    return data
+
+
+# ============================
+# ✅ Snapshot completo del catálogo (gzip, columnar)
+# ============================
+# Un solo archivo por versión: catalogo-v<version>.json.gz en CATALOGO_SNAPSHOT_DIR.
+# Columnas alineadas por posición; nivel/grado/area/serie/editorial van como índices
+# a su diccionario. Precios y descuento en centésimas (enteros) para no repetir decimales.
+SNAPSHOT_FORMATO = 1
+_snapshot_lock = threading.Lock()
+
+
+def _dir_snapshot() -> Path:
+    return Path(getattr(settings, "CATALOGO_SNAPSHOT_DIR", Path(settings.BASE_DIR) / "cache" / "catalogo"))
+
+
+def _diccionario(valores):
+    """(lista de valores únicos, lista de índices) en orden de aparición."""
+    indice = {}
+    codigos = []
+    for v in valores:
+        if v not in indice:
+            indice[v] = len(indice)
+        codigos.append(indice[v])
+    return list(indice), codigos
+
+
+def construir_snapshot(version) -> dict:
+    filas = list(
+        Producto.objects.filter(estado=True)
+        .order_by("id")
+        .values_list(
+            "id", "codigo", "nombre", "editorial_id", "nivel", "grado", "area", "serie",
+            "pvp_2026", "descuento_proveedor", "precio_proveedor",
+        )
+    )
+    cols = list(zip(*filas)) if filas else [()] * 11
+    (ids, codigos, nombres, editorial_ids, niveles, grados, areas, series,
+     pvps, descuentos, precios_proveedor) = cols
+
+    editoriales = dict(Editorial.objects.values_list("id", "nombre"))
+    dic_editorial, idx_editorial = _diccionario(editorial_ids)
+    diccionarios = {"editorial": [{"id": eid, "nombre": editoriales.get(eid, "")} for eid in dic_editorial]}
+    columnas = {
+        "id": list(ids),
+        "codigo": list(codigos),
+        "nombre": list(nombres),
+        "editorial": idx_editorial,
+    }
+    for campo, valores in (("nivel", niveles), ("grado", grados), ("area", areas), ("serie", series)):
+        diccionarios[campo], columnas[campo] = _diccionario(valores)
+
+    columnas["pvp_2026_c"] = [_centavos(v) for v in pvps]
+    columnas["descuento_proveedor_c"] = [_centavos(v) for v in descuentos]
+    columnas["precio_proveedor_c"] = [_centavos(v) for v in precios_proveedor]
+
+    return {
+        "formato": SNAPSHOT_FORMATO,
+        "version": version,
+        "count": len(filas),
+        "diccionarios": diccionarios,
+        "columnas": columnas,
+    }
+
+
+def ruta_snapshot() -> tuple:
+    """
+    (version, Path al .json.gz vigente). Si no existe el archivo de la versión actual
+    lo genera (escritura atómica) y borra los de versiones anteriores.
+    """
+    # la versión se lee antes que los productos: el contenido nunca es más viejo que su etiqueta
+    version = version_catalogo()
+    directorio = _dir_snapshot()
+    ruta = directorio / f"catalogo-v{version}.json.gz"
+    if ruta.exists():
+        return version, ruta
+
+    with _snapshot_lock:
+        if ruta.exists():
+            return version, ruta
+
+        directorio.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(construir_snapshot(version), ensure_ascii=False, separators=(",", ":"))
+        fd, tmp = tempfile.mkstemp(dir=directorio, prefix=".catalogo-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(gzip.compress(data.encode("utf-8"), compresslevel=9))
+            os.replace(tmp, ruta)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        for viejo in directorio.glob("catalogo-v*.json.gz"):
+            if viejo != ruta:
+                viejo.unlink(missing_ok=True)
+
+    return version, ruta
+
+
+def abrir_snapshot(intentos=3) -> tuple:
+    """
+    (version, archivo .json.gz vigente abierto en "rb"). Se abre aquí y no en la vista:
+    un descriptor abierto sigue siendo válido aunque otro proceso genere una versión nueva
+    y borre este archivo; si lo borra antes del open se reintenta con la versión actual.
+    """
+    for intento in range(intentos):
+        version, ruta = ruta_snapshot()
+        try:
+            return version, open(ruta, "rb")
+        except FileNotFoundError:
+            if intento == intentos - 1:
+                raise
@@ -0,0 +1,117 @@
+# cotizador_colegio/consolidacion.py
+"""
+Consolidación de pedidos en órdenes de compra por editorial.
+
+Todos los pedidos EMITIDO se suman por (editorial, producto) en una sola consulta
+agrupada; cada editorial da una OrdenCompra con sus líneas valoradas al precio_proveedor
+guardado en cada DetallePedido (el de cuando se generó el pedido, no el del catálogo
+actual) y la referencia a los pedidos de origen. Los pedidos consolidados pasan a
+ENVIADO en el mismo commit, así no entran en la siguiente consolidación.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum
+
+from .models import DetalleOrdenCompra, DetallePedido, Editorial, EstadoPedido, OrdenCompra, Pedido
+
+
+def _pedidos_emitidos(hasta=None, bloquear=True) -> list:
+    qs = Pedido.objects.filter(estado=EstadoPedido.EMITIDO)
+    if hasta:
+        qs = qs.filter(fecha_pedido__lte=hasta)
+    if bloquear:
+        # otra consolidación en curso se salta los pedidos que ya tomó esta
+        qs = qs.select_for_update(skip_locked=True)
+    return list(qs.order_by("id").values_list("id", flat=True))
+
+
+def lineas_consolidadas(pedido_ids) -> dict:
+    """
+    editorial_id -> {"lineas": [...], "pedidos": set(ids)} con una sola consulta
+    GROUP BY editorial, producto sobre detalles_pedido. subtotal = SUM(precio_proveedor *
+    cantidad) de los detalles, así el total de la orden cuadra con el total_costo de los
+    pedidos aunque el catálogo haya cambiado; precio_proveedor = subtotal / cantidad.
+    """
+    dec = DecimalField(max_digits=14, decimal_places=2)
+    filas = (
+        DetallePedido.objects.filter(pedido_id__in=pedido_ids)
+        .values("producto__editorial_id", "producto_id")
+        .annotate(
+            # antes que la anotación `cantidad`, que si no taparía a la columna en el F()
+            subtotal=Sum(F("precio_proveedor") * F("cantidad"), output_field=dec),
+            cantidad=Sum("cantidad"),
+            pedidos=ArrayAgg("pedido_id", distinct=True),
+        )
+        .order_by("producto__editorial_id", "producto_id")
+    )
+
+    por_editorial = {}
+    for f in filas:
+        grupo = por_editorial.setdefault(f["producto__editorial_id"], {"lineas": [], "pedidos": set()})
+        subtotal = f["subtotal"] or Decimal("0.00")
+        precio = Decimal("0.00")
+        if f["cantidad"]:
+            precio = (subtotal / f["cantidad"]).quantize(Decimal("0.01"), ROUND_HALF_UP)
+        grupo["lineas"].append({
+            "producto_id": f["producto_id"],
+            "cantidad": f["cantidad"],
+            "precio_proveedor": precio,
+            "subtotal": subtotal,
+        })
+        grupo["pedidos"].update(f["pedidos"])
+    return por_editorial
+
+
+@transaction.atomic
+def consolidar_pedidos(hasta=None, guardar=True) -> list:
+    """
+    Genera una OrdenCompra por editorial con los pedidos EMITIDO (fecha_pedido <= hasta).
+    guardar=False: solo calcula (vista previa), sin escribir ni cambiar estados.
+    Devuelve un resumen por orden: editorial, lineas, cantidad_total, total_costo, pedidos.
+    """
+    pedido_ids = _pedidos_emitidos(hasta, bloquear=guardar)
+    if not pedido_ids:
+        return []
+
+    por_editorial = lineas_consolidadas(pedido_ids)
+
+    ordenes = [
+        OrdenCompra(
+            editorial_id=editorial_id,
+            lineas=len(g["lineas"]),
+            cantidad_total=sum(linea["cantidad"] for linea in g["lineas"]),
+            total_costo=sum((linea["subtotal"] for linea in g["lineas"]), Decimal("0.00")),
+        )
+        for editorial_id, g in por_editorial.items()
+    ]
+
+    if guardar:
+        OrdenCompra.objects.bulk_create(ordenes)
+
+        detalles, refs = [], []
+        Ref = OrdenCompra.pedidos.through
+        for orden, g in zip(ordenes, por_editorial.values()):
+            detalles += [DetalleOrdenCompra(orden=orden, **linea) for linea in g["lineas"]]
+            refs += [Ref(ordencompra_id=orden.id, pedido_id=pid) for pid in sorted(g["pedidos"])]
+        DetalleOrdenCompra.objects.bulk_create(detalles, batch_size=1000)
+        Ref.objects.bulk_create(refs, batch_size=1000)
+
+        # los EMITIDO sin detalles no entran en ninguna orden: se quedan como están
+        consolidados = set().union(*(g["pedidos"] for g in por_editorial.values()))
+        Pedido.objects.filter(id__in=consolidados).update(estado=EstadoPedido.ENVIADO)
+
+    nombres = dict(Editorial.objects.filter(id__in=por_editorial).values_list("id", "nombre"))
+    return [
+        {
+            "id": orden.id,
+            "editorial": orden.editorial_id,
+            "editorial_nombre": nombres.get(orden.editorial_id),
+            "lineas": orden.lineas,
+            "cantidad_total": orden.cantidad_total,
+            "total_costo": orden.total_costo,
+            "pedidos": sorted(g["pedidos"]),
+        }
+        for orden, g in zip(ordenes, por_editorial.values())
+    ]
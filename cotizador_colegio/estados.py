@@ -0,0 +1,136 @@
+# cotizador_colegio/estados.py
+"""
+Transiciones de estado de cotizaciones en lote.
+
+Las transiciones permitidas se validan en el propio UPDATE (WHERE estado IN origenes):
+un solo UPDATE ... RETURNING por estado destino, sin traer ni guardar modelo por modelo.
+ADOPTADA no es destino válido aquí: la pone CrearAdopcionView al registrar la adopción.
+"""
+from django.db import connection, transaction
+
+from .models import Cotizacion, EstadoCotizacion
+
+# destino => estados de origen permitidos (nunca RECHAZADA -> APROBADA ni salir de ADOPTADA)
+TRANSICIONES = {
+    EstadoCotizacion.APROBADA: (EstadoCotizacion.PENDIENTE,),
+    EstadoCotizacion.RECHAZADA: (EstadoCotizacion.PENDIENTE, EstadoCotizacion.APROBADA),
+    EstadoCotizacion.PENDIENTE: (EstadoCotizacion.APROBADA, EstadoCotizacion.RECHAZADA),
+}
+
+MAX_LOTE = 1000
+
+ACTUALIZADA = "actualizada"
+SIN_CAMBIO = "sin_cambio"
+NO_PERMITIDA = "transicion_invalida"
+NO_EXISTE = "no_existe"
+INVALIDO = "invalido"
+
+
+def normalizar_cambios(data) -> list:
+    """
+    Acepta {"ids": [...], "estado": "...", "motivo": "..."} (mismo cambio para todas)
+    o {"cambios": [{"id": .., "estado": "..", "motivo": ".."}]}.
+    Devuelve [{"id", "estado", "motivo"}] en el orden recibido (ValueError si la forma es inválida).
+    """
+    if data.get("cambios") is not None:
+        cambios = data.get("cambios")
+        if not isinstance(cambios, list):
+            raise ValueError("cambios debe ser una lista")
+        out = [
+            {"id": c.get("id"), "estado": c.get("estado"), "motivo": c.get("motivo")}
+            if isinstance(c, dict) else {"id": None, "estado": None, "motivo": None}
+            for c in cambios
+        ]
+    else:
+        ids = data.get("ids")
+        if not isinstance(ids, list):
+            raise ValueError("Debe enviar ids (lista) + estado, o cambios")
+        out = [{"id": i, "estado": data.get("estado"), "motivo": data.get("motivo")} for i in ids]
+
+    if not out:
+        raise ValueError("No hay cambios que aplicar")
+    if len(out) > MAX_LOTE:
+        raise ValueError(f"Máximo {MAX_LOTE} cotizaciones por lote")
+    return out
+
+
+def _update_condicional(destino: str, filas: list) -> set:
+    """filas = [(id, motivo)] -> ids actualizados (los que estaban en un estado de origen permitido)."""
+    valores = ", ".join(["(%s::bigint, %s::text)"] * len(filas))
+    origenes = TRANSICIONES[destino]
+    sql = (
+        f"UPDATE {Cotizacion._meta.db_table} AS c "
+        f"SET estado = %s, motivo_rechazo = v.motivo "
+        f"FROM (VALUES {valores}) AS v(id, motivo) "
+        f"WHERE c.id = v.id AND c.estado IN ({', '.join(['%s'] * len(origenes))}) "
+        f"RETURNING c.id"
+    )
+    params = [destino]
+    for pid, motivo in filas:
+        params += [pid, motivo]
+    params += list(origenes)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0] for row in cursor.fetchall()}
+
+
+@transaction.atomic
+def transicionar_cotizaciones(cambios: list) -> dict:
+    """
+    Aplica los cambios (ver normalizar_cambios) y devuelve el reporte por id:
+    actualizada / sin_cambio / transicion_invalida / no_existe / invalido.
+    motivo_rechazo se guarda al rechazar y se limpia al aprobar o reabrir.
+    """
+    resultados = []
+    por_destino = {}   # destino -> {id: motivo}
+    vistos = set()
+
+    for c in cambios:
+        estado = (c["estado"] or "").upper().strip()
+        res = {"id": c["id"], "estado_solicitado": estado or None}
+        resultados.append(res)
+        try:
+            pid = int(c["id"])
+        except (TypeError, ValueError):
+            res.update(resultado=INVALIDO, detail="id inválido")
+            continue
+        res["id"] = pid
+        if pid in vistos:
+            res.update(resultado=INVALIDO, detail="id repetido en el lote")
+            continue
+        vistos.add(pid)
+        if estado not in TRANSICIONES:
+            res.update(resultado=INVALIDO, detail="Estado inválido")
+            continue
+        motivo = (c["motivo"] or "") if estado == EstadoCotizacion.RECHAZADA else None
+        por_destino.setdefault(estado, {})[pid] = motivo
+
+    actualizadas = set()
+    for destino, filas in por_destino.items():
+        actualizadas |= _update_condicional(destino, list(filas.items()))
+
+    # estado final de las que no se tocaron, para explicar por qué
+    pendientes = [r["id"] for r in resultados if "resultado" not in r and r["id"] not in actualizadas]
+    actuales = dict(Cotizacion.objects.filter(id__in=pendientes).values_list("id", "estado"))
+
+    for res in resultados:
+        if "resultado" in res:
+            continue
+        pid = res["id"]
+        if pid in actualizadas:
+            res.update(resultado=ACTUALIZADA, estado=res["estado_solicitado"])
+        elif pid not in actuales:
+            res.update(resultado=NO_EXISTE, detail="Cotización no existe")
+        elif actuales[pid] == res["estado_solicitado"]:
+            res.update(resultado=SIN_CAMBIO, estado=actuales[pid])
+        else:
+            res.update(
+                resultado=NO_PERMITIDA,
+                estado=actuales[pid],
+                detail=f"No se puede pasar de {actuales[pid]} a {res['estado_solicitado']}",
+            )
+
+    resumen = {}
+    for res in resultados:
+        resumen[res["resultado"]] = resumen.get(res["resultado"], 0) + 1
+    return {"resumen": resumen, "resultados": resultados}
@@ -0,0 +1,107 @@
+# cotizador_colegio/filters.py
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Cotizacion, Adopcion, DetalleAdopcion, Pedido, AsesorComercial, InstitucionEducativa
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """?estado=PENDIENTE  o  ?estado=PENDIENTE,APROBADA"""
+
+
+def _inicio_dia(fecha):
+    dt = datetime.combine(fecha, time.min)
+    return timezone.make_aware(dt) if settings.USE_TZ else dt
+
+
+class RangoFechaHoraMixin:
+    """
+    fecha_desde / fecha_hasta (YYYY-MM-DD) sobre un DateTimeField como rango [desde, hasta+1d):
+    sin __date, así el filtro puede usar el índice de la columna.
+    """
+    campo_fecha_hora = "fecha"
+
+    def filtrar_desde(self, queryset, name, value):
+        return queryset.filter(**{f"{self.campo_fecha_hora}__gte": _inicio_dia(value)})
+
+    def filtrar_hasta(self, queryset, name, value):
+        return queryset.filter(**{f"{self.campo_fecha_hora}__lt": _inicio_dia(value + timedelta(days=1))})
+
+
+# ============================
+# ✅ Panel (cotizaciones / adopciones / pedidos)
+# ============================
+class CotizacionFilter(RangoFechaHoraMixin, django_filters.FilterSet):
+    estado = CharInFilter(field_name="estado")
+    asesor = django_filters.NumberFilter(field_name="asesor_id")
+    institucion = django_filters.NumberFilter(field_name="institucion_id")
+    tipo_venta = CharInFilter(field_name="tipo_venta")
+    fecha_desde = django_filters.DateFilter(method="filtrar_desde")
+    fecha_hasta = django_filters.DateFilter(method="filtrar_hasta")
+
+    class Meta:
+        model = Cotizacion
+        fields = ["estado", "asesor", "institucion", "tipo_venta"]
+
+
+class AdopcionFilter(django_filters.FilterSet):
+    estado = CharInFilter(field_name="cotizacion__estado")
+    asesor = django_filters.NumberFilter(field_name="cotizacion__asesor_id")
+    institucion = django_filters.NumberFilter(field_name="cotizacion__institucion_id")
+    tipo_venta = CharInFilter(field_name="cotizacion__tipo_venta")
+    fecha_desde = django_filters.DateFilter(field_name="fecha_adopcion", lookup_expr="gte")
+    fecha_hasta = django_filters.DateFilter(field_name="fecha_adopcion", lookup_expr="lte")
+    editorial = django_filters.NumberFilter(method="filtrar_editorial")
+
+    class Meta:
+        model = Adopcion
+        fields = ["estado", "asesor", "institucion", "tipo_venta"]
+
+    def filtrar_editorial(self, queryset, name, value):
+        # adopciones con al menos un libro de la editorial (EXISTS: sin filas duplicadas)
+        return queryset.filter(
+            Exists(DetalleAdopcion.objects.filter(adopcion=OuterRef("pk"), producto__editorial_id=value))
+        )
+
+
+class PedidoFilter(django_filters.FilterSet):
+    estado = CharInFilter(field_name="estado")
+    asesor = django_filters.NumberFilter(field_name="adopcion__cotizacion__asesor_id")
+    institucion = django_filters.NumberFilter(field_name="adopcion__cotizacion__institucion_id")
+    tipo_venta = CharInFilter(field_name="adopcion__cotizacion__tipo_venta")
+    fecha_desde = django_filters.DateFilter(field_name="fecha_pedido", lookup_expr="gte")
+    fecha_hasta = django_filters.DateFilter(field_name="fecha_pedido", lookup_expr="lte")
+
+    class Meta:
+        model = Pedido
+        fields = ["estado", "asesor", "institucion", "tipo_venta"]
+
+
+# ============================
+# ✅ Maestros
+# ============================
+class AsesorFilter(django_filters.FilterSet):
+    estado = CharInFilter(field_name="estado")
+    search = django_filters.CharFilter(field_name="nombre", lookup_expr="icontains")
+
+    class Meta:
+        model = AsesorComercial
+        fields = ["estado"]
+
+
+class ColegioFilter(django_filters.FilterSet):
+    search = django_filters.CharFilter(method="filtrar_search")
+    distrito = django_filters.CharFilter(field_name="distrito", lookup_expr="iexact")
+    provincia = django_filters.CharFilter(field_name="provincia", lookup_expr="iexact")
+    departamento = django_filters.CharFilter(field_name="departamento", lookup_expr="iexact")
+
+    class Meta:
+        model = InstitucionEducativa
+        fields = ["distrito", "provincia", "departamento"]
+
+    def filtrar_search(self, queryset, name, value):
+        return queryset.filter(Q(nombre__icontains=value) | Q(codigo_modular__istartswith=value))
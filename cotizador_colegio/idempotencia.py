@@ -0,0 +1,107 @@
+# cotizador_colegio/idempotencia.py
+"""
+Idempotency-Key para los POST de creación (cotizaciones / adopciones / pedidos).
+
+Con la cabecera, la primera respuesta exitosa (2xx) queda guardada ya renderizada (bytes,
+content type y status) junto con la huella del cuerpo; un reintento con la misma clave
+devuelve esos mismos bytes (Idempotent-Replayed: true) sin volver a calcular ni insertar nada.
+
+La fila de la clave se inserta en la misma transacción que la vista: un reintento
+concurrente queda esperando en el índice único hasta el commit y luego lee la respuesta
+guardada. Si la vista falla (4xx/5xx) se hace rollback de todo y la clave queda libre.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import SolicitudIdempotente
+
+CABECERA = "Idempotency-Key"
+MAX_CLAVE = 255
+
+
+def ttl_idempotencia() -> timedelta:
+    return timedelta(hours=getattr(settings, "IDEMPOTENCIA_TTL_HORAS", 24))
+
+
+def huella_solicitud(request) -> str:
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    cuerpo = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{request.method}|{request.path}|{cuerpo}".encode()).hexdigest()
+
+
+def _reservar(endpoint: str, clave: str, huella: str):
+    """Inserta la fila de la clave; None si ya existe (vigente)."""
+    ahora = timezone.now()
+    SolicitudIdempotente.objects.filter(endpoint=endpoint, clave=clave, expira__lte=ahora).delete()
+    try:
+        with transaction.atomic():
+            return SolicitudIdempotente.objects.create(
+                endpoint=endpoint, clave=clave, huella=huella, expira=ahora + ttl_idempotencia(),
+            )
+    except IntegrityError:
+        return None
+
+
+def _repetir(previa, huella: str):
+    if previa is None or previa.status_code is None:
+        return Response({"detail": "La solicitud con esta Idempotency-Key sigue en proceso."}, status=409)
+    if previa.huella != huella:
+        return Response(
+            {"detail": "Idempotency-Key ya usada con un cuerpo distinto."},
+            status=422,
+        )
+    resp = HttpResponse(bytes(previa.respuesta or b""), content_type=previa.content_type, status=previa.status_code)
+    resp["Idempotent-Replayed"] = "true"
+    return resp
+
+
+def idempotente(post):
+    """Decorador para APIView.post (va por fuera de @transaction.atomic)."""
+
+    @wraps(post)
+    def envoltura(self, request, *args, **kwargs):
+        clave = (request.headers.get(CABECERA) or "").strip()
+        if not clave:
+            return post(self, request, *args, **kwargs)
+        if len(clave) > MAX_CLAVE:
+            return Response({"detail": f"{CABECERA} demasiado larga (máx {MAX_CLAVE})."}, status=400)
+
+        endpoint = request.path
+        huella = huella_solicitud(request)
+
+        with transaction.atomic():
+            registro = _reservar(endpoint, clave, huella)
+            if registro is not None:
+                response = post(self, request, *args, **kwargs)
+                if 200 <= response.status_code < 300:
+                    if isinstance(response, Response):
+                        # mismo renderer que usará dispatch: se guardan los bytes que salen
+                        response = self.finalize_response(request, response, *args, **kwargs)
+                        response.render()
+                    registro.status_code = response.status_code
+                    registro.respuesta = response.content
+                    registro.content_type = response.get("Content-Type", "")
+                    registro.save(update_fields=["status_code", "respuesta", "content_type"])
+                else:
+                    transaction.set_rollback(True)
+                return response
+
+        previa = SolicitudIdempotente.objects.filter(endpoint=endpoint, clave=clave).first()
+        return _repetir(previa, huella)
+
+    return envoltura
+
+
+def purgar_vencidas() -> int:
+    borradas, _ = SolicitudIdempotente.objects.filter(expira__lte=timezone.now()).delete()
+    return borradas
@@ -0,0 +1,129 @@
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from cotizador_colegio.models import Editorial, Producto
+
+
+NIVELES = ["Inicial", "Primaria", "Secundaria"]
+GRADOS = ["1", "2", "3", "4", "5", "6", "3 años", "4 años", "5 años"]
+AREAS = ["Matemática", "Comunicación", "Ciencia y Tecnología", "Personal Social", "Inglés", "Religión", "Arte"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de filtros del catálogo sobre un catálogo sintético "
+        "(se crea dentro de una transacción y se descarta al final)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--productos", type=int, default=100_000, help="Productos sintéticos. Default: 100000")
+        parser.add_argument("--editoriales", type=int, default=40)
+        parser.add_argument("--repeticiones", type=int, default=30)
+        parser.add_argument("--explain", action="store_true", help="Muestra el plan de cada consulta")
+        parser.add_argument(
+            "--sin-indices",
+            action="store_true",
+            help="Mide sin los índices de filtros (DROP INDEX dentro de la transacción, PostgreSQL)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options["sin_indices"]:
+                    self._quitar_indices()
+                self._poblar(options["productos"], options["editoriales"])
+                self._medir(options["repeticiones"], options["explain"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("Benchmark completado ✔ (datos sintéticos descartados)"))
+
+    # -----------------------------------------------------
+    def _quitar_indices(self):
+        nombres = [
+            idx.name for idx in Producto._meta.indexes
+            if idx.name in ("productos_filtro_ci_idx", "productos_nivel_ci_idx", "productos_filtro_idx")
+        ]
+        with connection.cursor() as cursor:
+            for nombre in nombres:
+                cursor.execute(f"DROP INDEX IF EXISTS {nombre}")
+        self.stdout.write(f"Sin índices: {', '.join(nombres)}")
+
+    # -----------------------------------------------------
+    def _poblar(self, n, n_editoriales):
+        rnd = random.Random(2026)
+        editoriales = Editorial.objects.bulk_create(
+            [Editorial(nombre=f"BENCH Editorial {i:03d}") for i in range(n_editoriales)]
+        )
+
+        t0 = time.perf_counter()
+        lote = []
+        for i in range(n):
+            nivel = rnd.choice(NIVELES)
+            lote.append(Producto(
+                editorial=rnd.choice(editoriales),
+                codigo=f"BENCH-{i:07d}",
+                nombre=f"{rnd.choice(AREAS)} {nivel} {i}",
+                # mayúsculas/minúsculas mezcladas como llegan del Excel
+                nivel=nivel if i % 3 else nivel.upper(),
+                grado=rnd.choice(GRADOS),
+                area=rnd.choice(AREAS),
+                pvp_2026=Decimal(rnd.randint(3000, 15000)) / 100,
+                descuento_proveedor=Decimal("30.00"),
+                precio_proveedor=Decimal("0.00"),
+                estado=rnd.random() > 0.05,
+            ))
+            if len(lote) == 5000:
+                Producto.objects.bulk_create(lote)
+                lote = []
+        if lote:
+            Producto.objects.bulk_create(lote)
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Producto._meta.db_table}")
+
+        self.stdout.write(f"{n} productos sintéticos en {time.perf_counter() - t0:.1f}s")
+        self._editorial = editoriales[n_editoriales // 2]
+
+    # -----------------------------------------------------
+    def _casos(self):
+        base = Producto.objects.filter(estado=True)
+        ed = self._editorial.id
+        # combinaciones reales: ListarProductosView (iexact) y ProductoViewSet.filterset_fields (exact)
+        return [
+            ("v1 editorial", base.filter(editorial_id=ed)),
+            ("v1 editorial+nivel", base.filter(editorial_id=ed, nivel__iexact="primaria")),
+            ("v1 editorial+nivel+grado", base.filter(editorial_id=ed, nivel__iexact="primaria", grado__iexact="3")),
+            ("v1 nivel+grado+area", base.filter(nivel__iexact="secundaria", grado__iexact="2", area__iexact="inglés")),
+            ("v1 nivel+grado", base.filter(nivel__iexact="inicial", grado__iexact="4 años")),
+            ("v2 editorial+nivel+grado+area", base.filter(editorial_id=ed, nivel="Primaria", grado="1", area="Arte")),
+        ]
+
+    def _medir(self, repeticiones, explain):
+        self.stdout.write(f"{'caso':34} {'filas':>7} {'p50 ms':>8} {'p95 ms':>8}")
+        for nombre, qs in self._casos():
+            # misma forma que el listado: página de 30 por (nombre, id)
+            pagina = qs.order_by("nombre", "id")[:30]
+            filas = qs.count()
+            tiempos = []
+            for _ in range(repeticiones):
+                t0 = time.perf_counter()
+                list(pagina.values_list("id", flat=True))
+                tiempos.append((time.perf_counter() - t0) * 1000)
+            tiempos.sort()
+            p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+            self.stdout.write(f"{nombre:34} {filas:>7} {statistics.median(tiempos):>8.2f} {p95:>8.2f}")
+
+            if explain:
+                self.stdout.write(qs.explain())
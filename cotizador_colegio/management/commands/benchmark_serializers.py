@@ -0,0 +1,188 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from cotizador_colegio.models import (
+    Editorial,
+    Producto,
+    InstitucionEducativa,
+    AsesorComercial,
+    Cotizacion,
+    DetalleCotizacion,
+    Adopcion,
+    DetalleAdopcion,
+    TipoVenta,
+)
+from cotizador_colegio.signals import recalcular_resumen_cotizacion
+from cotizador_colegio.serializers import ProductoSerializer, CotizacionListSerializer, AdopcionSerializer
+from cotizador_colegio.serializers_rapidos import (
+    ProductoRapidoSerializer,
+    CotizacionListRapidoSerializer,
+    AdopcionRapidoSerializer,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark filas/seg: ModelSerializer vs serializers_rapidos (datos sintéticos "
+        "dentro de una transacción que se descarta). Verifica que el JSON sea idéntico."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--productos", type=int, default=5000)
+        parser.add_argument("--cotizaciones", type=int, default=2000)
+        parser.add_argument("--detalles", type=int, default=8, help="Detalles por cotización/adopción")
+        parser.add_argument("--repeticiones", type=int, default=3)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._poblar(options["productos"], options["cotizaciones"], options["detalles"])
+                self._medir(options["repeticiones"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("Benchmark completado ✔ (datos sintéticos descartados)"))
+
+    # -----------------------------------------------------
+    def _poblar(self, n_productos, n_cotizaciones, n_detalles):
+        rnd = random.Random(2026)
+        editoriales = Editorial.objects.bulk_create([Editorial(nombre=f"BENCH Editorial {i}") for i in range(10)])
+        productos = Producto.objects.bulk_create([
+            Producto(
+                editorial=rnd.choice(editoriales),
+                codigo=f"BENCH-{i:06d}",
+                nombre=f"Libro {i}",
+                nivel=rnd.choice(["Inicial", "Primaria", "Secundaria"]),
+                grado=str(rnd.randint(1, 6)),
+                area=rnd.choice(["Matemática", "Comunicación", "Inglés"]),
+                pvp_2026=Decimal(rnd.randint(3000, 15000)) / 100,
+                descuento_proveedor=Decimal("30.00"),
+                precio_proveedor=Decimal(rnd.randint(2000, 9000)) / 100,
+            )
+            for i in range(n_productos)
+        ])
+        ies = InstitucionEducativa.objects.bulk_create([InstitucionEducativa(nombre=f"BENCH IE {i}") for i in range(50)])
+        asesores = AsesorComercial.objects.bulk_create([AsesorComercial(nombre=f"BENCH Asesor {i}") for i in range(10)])
+
+        cotizaciones = Cotizacion.objects.bulk_create([
+            Cotizacion(
+                numero_cotizacion=f"BENCH-{i:06d}",
+                institucion=rnd.choice(ies),
+                # algunas sin asesor (la clave se omite en la salida DRF)
+                asesor=rnd.choice(asesores) if i % 7 else None,
+            )
+            for i in range(n_cotizaciones)
+        ])
+        DetalleCotizacion.objects.bulk_create([
+            DetalleCotizacion(
+                cotizacion=cot,
+                producto=rnd.choice(productos),
+                cantidad=rnd.randint(1, 40),
+                precio_be=Decimal("50.00"),
+                desc_proveedor=Decimal("30.00"),
+                precio_proveedor=Decimal("35.00"),
+                precio_ie=Decimal("40.00"),
+                precio_ppff=Decimal("50.00"),
+                utilidad_ie=Decimal("10.00"),
+                roi_ie=Decimal("5.00"),
+                tipo_venta=rnd.choice(TipoVenta.values),
+            )
+            for cot in cotizaciones
+            for _ in range(n_detalles)
+        ])
+
+        # bulk_create no dispara señales: resumen denormalizado en un UPDATE
+        recalcular_resumen_cotizacion(*[c.id for c in cotizaciones])
+
+        adopciones = Adopcion.objects.bulk_create([Adopcion(cotizacion=cot) for cot in cotizaciones[::2]])
+        DetalleAdopcion.objects.bulk_create([
+            DetalleAdopcion(
+                adopcion=adop,
+                producto=rnd.choice(productos),
+                cantidad_adoptada=rnd.randint(1, 40),
+                mes_lectura=rnd.choice([None, "MARZO", "ABRIL"]),
+            )
+            for adop in adopciones
+            for _ in range(n_detalles)
+        ])
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for model in (Producto, Cotizacion, DetalleCotizacion, Adopcion, DetalleAdopcion):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        self.ids_productos = [p.id for p in productos]
+        self.ids_cotizaciones = [c.id for c in cotizaciones]
+        self.ids_adopciones = [a.id for a in adopciones]
+
+    # -----------------------------------------------------
+    def _casos(self):
+        return [
+            (
+                "ProductoSerializer",
+                lambda: ProductoSerializer(
+                    Producto.objects.select_related("editorial").filter(id__in=self.ids_productos).order_by("id"),
+                    many=True,
+                ).data,
+                lambda: ProductoRapidoSerializer(
+                    Producto.objects.filter(id__in=self.ids_productos).order_by("id")
+                ).data,
+            ),
+            (
+                "CotizacionListSerializer",
+                lambda: CotizacionListSerializer(
+                    Cotizacion.objects.select_related("institucion", "asesor")
+                    .prefetch_related("detalles")
+                    .filter(id__in=self.ids_cotizaciones)
+                    .order_by("-id"),
+                    many=True,
+                ).data,
+                lambda: CotizacionListRapidoSerializer(
+                    Cotizacion.objects.filter(id__in=self.ids_cotizaciones).order_by("-id")
+                ).data,
+            ),
+            (
+                "AdopcionSerializer",
+                lambda: AdopcionSerializer(
+                    Adopcion.objects.select_related("cotizacion__institucion", "cotizacion__asesor")
+                    .prefetch_related("detalles__producto__editorial", "cotizacion__detalles")
+                    .filter(id__in=self.ids_adopciones)
+                    .order_by("-id"),
+                    many=True,
+                ).data,
+                lambda: AdopcionRapidoSerializer(
+                    Adopcion.objects.filter(id__in=self.ids_adopciones).order_by("-id")
+                ).data,
+            ),
+        ]
+
+    def _tiempo(self, fn, repeticiones):
+        mejor, data = None, None
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            data = fn()
+            t = time.perf_counter() - t0
+            mejor = t if mejor is None else min(mejor, t)
+        return mejor, data
+
+    def _medir(self, repeticiones):
+        renderer = JSONRenderer()
+        self.stdout.write(f"{'serializer':26} {'filas':>6} {'DRF filas/s':>12} {'rápido filas/s':>15} {'x':>6}  idéntico")
+        for nombre, drf, rapido in self._casos():
+            t_drf, data_drf = self._tiempo(drf, repeticiones)
+            t_rapido, data_rapido = self._tiempo(rapido, repeticiones)
+            n = len(data_drf)
+            identico = renderer.render(data_drf) == renderer.render(data_rapido)
+            self.stdout.write(
+                f"{nombre:26} {n:>6} {n / t_drf:>12,.0f} {n / t_rapido:>15,.0f} "
+                f"{t_drf / t_rapido:>6.1f}  {'sí' if identico else 'NO'}"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from cotizador_colegio.catalogo import compactar_cambios
+
+
+class Command(BaseCommand):
+    help = "Compacta el log de cambios del catálogo (una entrada por producto, purga bajas antiguas)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias-bajas",
+            type=int,
+            default=180,
+            help="Antigüedad mínima (días) de las bajas/borrados a purgar. Default: 180",
+        )
+
+    def handle(self, *args, **options):
+        res = compactar_cambios(dias_bajas=options["dias_bajas"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Log compactado ✔ | "
+            f"Superadas: {res['superadas']} | Bajas purgadas: {res['bajas_purgadas']} | "
+            f"Versión compactada: {res['version_compactada'] or '-'}"
+        ))
@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from cotizador_colegio.consolidacion import consolidar_pedidos
+
+
+class Command(BaseCommand):
+    help = "Consolida los pedidos EMITIDO en órdenes de compra por editorial"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasta",
+            type=date.fromisoformat,
+            default=None,
+            help="Solo pedidos con fecha_pedido <= YYYY-MM-DD",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Muestra las órdenes que se generarían sin guardar nada",
+        )
+
+    def handle(self, *args, **options):
+        ordenes = consolidar_pedidos(hasta=options["hasta"], guardar=not options["dry_run"])
+
+        for o in ordenes:
+            self.stdout.write(
+                f"{o['editorial_nombre']}: {o['lineas']} líneas | {o['cantidad_total']} und | "
+                f"S/ {o['total_costo']} | {len(o['pedidos'])} pedidos"
+            )
+
+        prefijo = "Vista previa" if options["dry_run"] else "Consolidación OK ✔"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefijo} | Órdenes: {len(ordenes)} | "
+            f"Pedidos: {len({p for o in ordenes for p in o['pedidos']})}"
+        ))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cotizador_colegio.filters import AdopcionFilter
+from cotizador_colegio.models import Adopcion
+from cotizador_colegio.pedidos_lote import generar_pedidos
+
+
+class Command(BaseCommand):
+    help = "Genera / regenera los pedidos (BORRADOR / EMITIDO) de las adopciones que cumplen los filtros"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--asesor", type=int, help="ID del asesor de la cotización")
+        parser.add_argument("--desde", help="fecha_adopcion >= YYYY-MM-DD")
+        parser.add_argument("--hasta", help="fecha_adopcion <= YYYY-MM-DD")
+        parser.add_argument("--editorial", type=int, help="Adopciones con libros de esta editorial (ID)")
+        parser.add_argument(
+            "--todas",
+            action="store_true",
+            help="Sin filtros: todas las adopciones",
+        )
+
+    def handle(self, *args, **options):
+        data = {
+            "asesor": options["asesor"],
+            "fecha_desde": options["desde"],
+            "fecha_hasta": options["hasta"],
+            "editorial": options["editorial"],
+        }
+        data = {k: v for k, v in data.items() if v is not None}
+        if not data and not options["todas"]:
+            raise CommandError("Indique al menos un filtro (o --todas).")
+
+        filtros = AdopcionFilter(data, queryset=Adopcion.objects.all())
+        if not filtros.is_valid():
+            raise CommandError(f"Filtros inválidos: {dict(filtros.errors)}")
+
+        res = generar_pedidos(filtros.qs)
+
+        for o in res["omitidos"]:
+            self.stdout.write(f"Omitida adopción {o['adopcion']}: pedido {o['pedido']} en {o['estado']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Pedidos generados ✔ | Nuevos: {res['creados']} | Regenerados: {res['regenerados']} | "
+            f"Omitidos: {len(res['omitidos'])}"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cotizador_colegio.idempotencia import purgar_vencidas
+
+
+class Command(BaseCommand):
+    help = "Borra las Idempotency-Key vencidas (programar en cron, p.ej. cada hora)"
+
+    def handle(self, *args, **options):
+        borradas = purgar_vencidas()
+        self.stdout.write(self.style.SUCCESS(f"Idempotency-Key vencidas borradas ✔ | {borradas}"))
@@ -0,0 +1,49 @@
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0005_catalogo_version'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+
+        # unaccent() no es IMMUTABLE y no se puede indexar: wrapper inmutable
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+                AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS f_unaccent(text);",
+        ),
+
+        # búsqueda por nombre: trigramas (parcial / errores de tipeo) y full-text
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS productos_nombre_trgm_idx
+                ON productos USING gin (f_unaccent(lower(nombre)) gin_trgm_ops);
+            """,
+            reverse_sql="DROP INDEX IF EXISTS productos_nombre_trgm_idx;",
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS productos_nombre_fts_idx
+                ON productos USING gin (to_tsvector('spanish'::regconfig, f_unaccent(lower(nombre))));
+            """,
+            reverse_sql="DROP INDEX IF EXISTS productos_nombre_fts_idx;",
+        ),
+
+        # prefijo exacto de código: UPPER(codigo::text) LIKE 'ABC%' (codigo__istartswith)
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS productos_codigo_prefix_idx
+                ON productos (upper(codigo::text) text_pattern_ops);
+            """,
+            reverse_sql="DROP INDEX IF EXISTS productos_codigo_prefix_idx;",
+        ),
+    ]
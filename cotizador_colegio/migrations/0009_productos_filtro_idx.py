@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:20
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0008_cambio_producto'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(models.F('editorial'), django.db.models.functions.text.Upper('nivel'), django.db.models.functions.text.Upper('grado'), django.db.models.functions.text.Upper('area'), condition=models.Q(('estado', True)), name='productos_filtro_ci_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(django.db.models.functions.text.Upper('nivel'), django.db.models.functions.text.Upper('grado'), django.db.models.functions.text.Upper('area'), condition=models.Q(('estado', True)), name='productos_nivel_ci_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['editorial', 'nivel', 'grado', 'area'], name='productos_filtro_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_resumen(apps, schema_editor):
+    """Un solo UPDATE (mismas expresiones que signals.resumen_cotizacion_expr)."""
+    Cotizacion = apps.get_model('cotizador_colegio', 'Cotizacion')
+    DetalleCotizacion = apps.get_model('cotizador_colegio', 'DetalleCotizacion')
+
+    detalles = DetalleCotizacion.objects.filter(cotizacion=OuterRef('pk')).order_by()
+    por_cot = detalles.values('cotizacion')
+    dec = DecimalField(max_digits=14, decimal_places=2)
+
+    def agregado(expr, output_field, cero):
+        sub = Subquery(por_cot.annotate(v=expr).values('v')[:1], output_field=output_field)
+        return Coalesce(sub, Value(cero), output_field=output_field)
+
+    Cotizacion.objects.update(
+        tipo_venta=Coalesce(Subquery(detalles.order_by('pk').values('tipo_venta')[:1]), Value('')),
+        lineas=agregado(Count('pk'), IntegerField(), 0),
+        cantidad_total=agregado(Sum('cantidad'), IntegerField(), 0),
+        total_precio_ie=agregado(Sum(F('precio_ie') * F('cantidad'), output_field=dec), dec, 0),
+        total_roi_ie=agregado(Sum(F('roi_ie') * F('cantidad'), output_field=dec), dec, 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0009_productos_filtro_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cotizacion',
+            name='cantidad_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cotizacion',
+            name='lineas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cotizacion',
+            name='tipo_venta',
+            field=models.CharField(blank=True, choices=[('FERIA', 'Feria'), ('CONSIGNA', 'Consignación'), ('PUNTO_DE_VENTA', 'Punto de Venta')], default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='cotizacion',
+            name='total_precio_ie',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='cotizacion',
+            name='total_roi_ie',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.RunPython(backfill_resumen, migrations.RunPython.noop),
+    ]
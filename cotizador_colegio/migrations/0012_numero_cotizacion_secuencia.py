@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:30
+
+from django.db import migrations, models
+
+
+# Una secuencia por temporada (cotizacion_numero_<año>), creada a demanda.
+# nextval() no es transaccional ni bloquea: seguro con inserts concurrentes y bulk_create.
+# El advisory lock solo se toma la primera vez de cada temporada, para que dos sesiones
+# no intenten crear la misma secuencia a la vez.
+CREAR_FUNCION = """
+CREATE OR REPLACE FUNCTION siguiente_numero_cotizacion(temporada integer DEFAULT NULL)
+RETURNS varchar
+LANGUAGE plpgsql
+VOLATILE
+AS $$
+DECLARE
+    t integer := coalesce(temporada, extract(year FROM now())::integer);
+    seq text := 'cotizacion_numero_' || t;
+    n bigint;
+BEGIN
+    IF to_regclass(seq) IS NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext(seq));
+        EXECUTE format('CREATE SEQUENCE IF NOT EXISTS %I', seq);
+    END IF;
+    n := nextval(seq::regclass);
+    RETURN 'COT-' || t || '-' || lpad(n::text, greatest(5, length(n::text)), '0');
+END
+$$;
+"""
+
+BORRAR_FUNCION = "DROP FUNCTION IF EXISTS siguiente_numero_cotizacion(integer);"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0011_cotizaciones_fecha_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREAR_FUNCION, BORRAR_FUNCION),
+        migrations.AlterField(
+            model_name='cotizacion',
+            name='numero_cotizacion',
+            field=models.CharField(blank=True, db_default=models.Func(function='siguiente_numero_cotizacion', output_field=models.CharField()), max_length=20, null=True, unique=True),
+        ),
+    ]
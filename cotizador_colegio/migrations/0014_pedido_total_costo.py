@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:20
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_total_costo(apps, schema_editor):
+    """Un solo UPDATE (misma expresión que signals.recalcular_total_costo)."""
+    Pedido = apps.get_model('cotizador_colegio', 'Pedido')
+    DetallePedido = apps.get_model('cotizador_colegio', 'DetallePedido')
+
+    dec = DecimalField(max_digits=14, decimal_places=2)
+    suma = (
+        DetallePedido.objects.filter(pedido=OuterRef('pk')).order_by()
+        .values('pedido').annotate(s=Sum(F('precio_proveedor') * F('cantidad'), output_field=dec)).values('s')[:1]
+    )
+    Pedido.objects.update(total_costo=Coalesce(Subquery(suma, output_field=dec), Value(0), output_field=dec))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0013_solicitud_idempotente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedido',
+            name='total_costo',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.RunPython(backfill_total_costo, migrations.RunPython.noop),
+    ]
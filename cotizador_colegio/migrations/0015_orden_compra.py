@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:45
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0014_pedido_total_costo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrdenCompra',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateTimeField(auto_now_add=True)),
+                ('lineas', models.PositiveIntegerField(default=0)),
+                ('cantidad_total', models.PositiveIntegerField(default=0)),
+                ('total_costo', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('editorial', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ordenes_compra', to='cotizador_colegio.editorial')),
+                ('pedidos', models.ManyToManyField(db_table='ordenes_compra_pedidos', related_name='ordenes_compra', to='cotizador_colegio.pedido')),
+            ],
+            options={
+                'db_table': 'ordenes_compra',
+            },
+        ),
+        migrations.CreateModel(
+            name='DetalleOrdenCompra',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad', models.PositiveIntegerField()),
+                ('precio_proveedor', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('subtotal', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='cotizador_colegio.producto')),
+                ('orden', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detalles', to='cotizador_colegio.ordencompra')),
+            ],
+            options={
+                'db_table': 'detalles_orden_compra',
+            },
+        ),
+    ]
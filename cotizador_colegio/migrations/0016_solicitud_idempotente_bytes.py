@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cotizador_colegio', '0015_orden_compra'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitudidempotente',
+            name='content_type',
+            field=models.CharField(blank=True, default='application/json', max_length=100),
+            preserve_default=False,
+        ),
+        # jsonb -> bytea conservando las respuestas ya guardadas (no hay cast directo)
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "ALTER TABLE solicitudes_idempotentes ALTER COLUMN respuesta TYPE bytea "
+                    "USING convert_to(respuesta::text, 'UTF8')",
+                    "ALTER TABLE solicitudes_idempotentes ALTER COLUMN respuesta TYPE jsonb "
+                    "USING convert_from(respuesta, 'UTF8')::jsonb",
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='solicitudidempotente',
+                    name='respuesta',
+                    field=models.BinaryField(blank=True, null=True),
+                ),
+            ],
+        ),
+    ]
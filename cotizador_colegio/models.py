@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from decimal import Decimal, ROUND_HALF_UP
 
 # ==========================
@@ -65,11 +67,67 @@ class Producto(models.Model):
     class Meta:
         db_table = "productos"
         unique_together = ("editorial", "codigo")
+        indexes = [
+            # paginación por cursor del catálogo (nombre, id)
+            models.Index(fields=["nombre", "id"], name="productos_nombre_id_idx"),
+            # filtros v1 / facetas: __iexact => UPPER(col) = UPPER(%s), solo activos
+            models.Index(
+                "editorial", Upper("nivel"), Upper("grado"), Upper("area"),
+                name="productos_filtro_ci_idx",
+                condition=Q(estado=True),
+            ),
+            models.Index(
+                Upper("nivel"), Upper("grado"), Upper("area"),
+                name="productos_nivel_ci_idx",
+                condition=Q(estado=True),
+            ),
+            # filtros v2 (filterset_fields, igualdad exacta)
+            models.Index(
+                fields=["editorial", "nivel", "grado", "area"],
+                name="productos_filtro_idx",
+                condition=Q(estado=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.editorial.nombre} - {self.nombre}"
 
 
+class CatalogoVersion(models.Model):
+    """
+    Contador global del catálogo (fila única, pk=1).
+    Se incrementa en cada escritura de Producto / Editorial (ver signals.py).
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    # hasta esta versión el log de cambios fue compactado (bajas purgadas):
+    # un cliente con since < version_compactada debe recargar el catálogo completo
+    version_compactada = models.PositiveBigIntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "catalogo_version"
+
+    def __str__(self):
+        return f"Catálogo v{self.version}"
+
+
+class CambioProducto(models.Model):
+    """
+    Log de cambios de Producto (alta / modificación / baja / borrado) para sincronizar
+    por delta. version = versión del catálogo asignada al cambio (monótona).
+    Sin FK: la entrada sobrevive al borrado del producto.
+    """
+    version = models.PositiveBigIntegerField(unique=True)
+    producto_id = models.BigIntegerField(db_index=True)
+    fecha = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "catalogo_cambios"
+
+    def __str__(self):
+        return f"v{self.version} producto {self.producto_id}"
+
+
 # ==========================
 # INSTITUCIÓN EDUCATIVA
 # ==========================
@@ -115,7 +173,16 @@ class AsesorComercial(models.Model):
 # ==========================
 
 class Cotizacion(models.Model):
-    numero_cotizacion = models.CharField(max_length=20, unique=True, blank=True, null=True)
+    # COT-<temporada>-00001: lo asigna PostgreSQL en el mismo INSERT (secuencia por temporada,
+    # siguiente_numero_cotizacion() de la migración 0012); llega de vuelta con RETURNING, sin
+    # consulta previa ni carreras entre requests concurrentes (los huecos por rollback son normales).
+    numero_cotizacion = models.CharField(
+        max_length=20,
+        unique=True,
+        blank=True,
+        null=True,
+        db_default=models.Func(function="siguiente_numero_cotizacion", output_field=models.CharField()),
+    )
     institucion = models.ForeignKey(InstitucionEducativa, on_delete=models.PROTECT, related_name="cotizaciones")
     asesor = models.ForeignKey(AsesorComercial, on_delete=models.SET_NULL, null=True, blank=True)
     fecha = models.DateTimeField(auto_now_add=True)
@@ -127,15 +194,19 @@ class Cotizacion(models.Model):
         default=EstadoCotizacion.PENDIENTE
     )
 
+    # ✅ Resumen denormalizado de los detalles (lo recalcula signals.py al hacer commit)
+    tipo_venta = models.CharField(max_length=20, choices=TipoVenta.choices, blank=True, default="")
+    lineas = models.PositiveIntegerField(default=0)
+    cantidad_total = models.PositiveIntegerField(default=0)
+    total_precio_ie = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Σ precio_ie × cantidad
+    total_roi_ie = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Σ roi_ie × cantidad
+
     class Meta:
         db_table = "cotizaciones"
-
-    def save(self, *args, **kwargs):
-        if not self.numero_cotizacion:
-            last = Cotizacion.objects.order_by("id").last()
-            num = (last.id + 1) if last else 1
-            self.numero_cotizacion = f"COT-{str(num).zfill(5)}"
-        super().save(*args, **kwargs)
+        indexes = [
+            # filtro por rango de fechas del panel (fecha_desde / fecha_hasta)
+            models.Index(fields=["fecha"], name="cotizaciones_fecha_idx"),
+        ]
 
     def __str__(self):
         return self.numero_cotizacion
@@ -239,6 +310,8 @@ class Pedido(models.Model):
     adopcion = models.OneToOneField(Adopcion, on_delete=models.PROTECT, related_name="pedido")
     fecha_pedido = models.DateField(auto_now_add=True)
     estado = models.CharField(max_length=20, choices=EstadoPedido.choices, default=EstadoPedido.BORRADOR)
+    # SUM(precio_proveedor * cantidad) de los detalles (signals.recalcular_total_costo)
+    total_costo = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
 
     class Meta:
         db_table = "pedidos"
@@ -258,3 +331,70 @@ class DetallePedido(models.Model):
 
     def __str__(self):
         return f"{self.producto.nombre} ({self.cantidad})"
+
+
+# ==========================
+# IDEMPOTENCIA (reintentos de creación)
+# ==========================
+
+class SolicitudIdempotente(models.Model):
+    """
+    Respuesta guardada de un POST de creación con cabecera Idempotency-Key.
+    respuesta = bytes ya renderizados (el replay es idéntico byte a byte).
+    huella = sha256 del cuerpo: la misma clave con otro cuerpo se rechaza.
+    Las vencidas se purgan con `manage.py purgar_idempotencia`.
+    """
+    endpoint = models.CharField(max_length=200)
+    clave = models.CharField(max_length=255)
+    huella = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    respuesta = models.BinaryField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    fecha = models.DateTimeField(auto_now_add=True)
+    expira = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "solicitudes_idempotentes"
+        constraints = [
+            models.UniqueConstraint(fields=["endpoint", "clave"], name="idempotencia_endpoint_clave_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint} {self.clave}"
+
+
+# ==========================
+# ÓRDENES DE COMPRA A EDITORIAL
+# ==========================
+
+class OrdenCompra(models.Model):
+    """
+    Orden de compra consolidada a una editorial: suma por producto de los pedidos
+    EMITIDO (ver consolidacion.consolidar_pedidos). pedidos = pedidos de origen.
+    """
+    editorial = models.ForeignKey(Editorial, on_delete=models.PROTECT, related_name="ordenes_compra")
+    fecha = models.DateTimeField(auto_now_add=True)
+    lineas = models.PositiveIntegerField(default=0)
+    cantidad_total = models.PositiveIntegerField(default=0)
+    total_costo = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    pedidos = models.ManyToManyField(Pedido, related_name="ordenes_compra", db_table="ordenes_compra_pedidos")
+
+    class Meta:
+        db_table = "ordenes_compra"
+
+    def __str__(self):
+        return f"OC {self.id} - {self.editorial}"
+
+
+class DetalleOrdenCompra(models.Model):
+    orden = models.ForeignKey(OrdenCompra, related_name="detalles", on_delete=models.CASCADE)
+    producto = models.ForeignKey(Producto, on_delete=models.PROTECT)
+    cantidad = models.PositiveIntegerField()
+    precio_proveedor = models.DecimalField(max_digits=10, decimal_places=2)
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        db_table = "detalles_orden_compra"
+
+    def __str__(self):
+        return f"{self.producto.nombre} ({self.cantidad})"
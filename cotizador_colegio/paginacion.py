@@ -0,0 +1,264 @@
+# cotizador_colegio/paginacion.py
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# =========================================================
+# PAGINACION
+# =========================================================
+class StandardPagination(PageNumberPagination):
+    page_size = 30
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+def conteo_estimado(queryset) -> int:
+    """Filas estimadas por el planner de PostgreSQL (sin COUNT(*)); exacto en otros motores."""
+    qs = queryset.order_by()
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql":
+        return qs.count()
+
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre `ordering`, p.ej. ("nombre", "id") o ("-id",).
+    Cada página es un WHERE (nombre, id) > (último) ... LIMIT n: sin OFFSET ni COUNT(*).
+    El último campo de `ordering` tiene que ser único (id). Los campos nullable siguen el
+    orden de PostgreSQL (NULLS LAST en ASC, NULLS FIRST en DESC).
+
+    ?cursor=<opaco>  ?page_size=n  ?count=exacto|estimado (por defecto no se cuenta)
+    """
+    page_size = 30
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    ordering = ("-id",)
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = tuple(ordering)
+
+    # ---------- cursor ----------
+    # datetimes con microsegundos completos ({"dt": isoformat}); DjangoJSONEncoder los corta a
+    # milisegundos y el cursor quedaría antes de la última fila (se repetiría / saltaría filas)
+    @staticmethod
+    def _valor_cursor(valor):
+        if isinstance(valor, datetime.datetime):
+            return {"dt": valor.isoformat()}
+        return valor
+
+    @staticmethod
+    def _valor_filtro(valor):
+        if isinstance(valor, dict):
+            if set(valor) != {"dt"}:
+                raise ValueError("valor de cursor desconocido")
+            return datetime.datetime.fromisoformat(valor["dt"])
+        return valor
+
+    def _codificar(self, valores, reverso):
+        raw = json.dumps({"v": [self._valor_cursor(v) for v in valores], "r": int(reverso)}, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def _decodificar(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(raw.encode("ascii")).decode("utf-8"))
+            valores, reverso = data["v"], bool(data["r"])
+            if not isinstance(valores, list) or len(valores) != len(self.ordering):
+                raise ValueError("cursor incompleto")
+            valores = [self._valor_filtro(v) for v in valores]
+        except Exception:
+            raise NotFound("Cursor inválido.")
+        return valores, reverso
+
+    def _campos(self):
+        return [(o.lstrip("-"), o.startswith("-")) for o in self.ordering]
+
+    def _valores(self, obj):
+        # instancias de modelo o filas de .values()
+        if isinstance(obj, dict):
+            return [obj[campo] for campo, _ in self._campos()]
+        return [getattr(obj, campo) for campo, _ in self._campos()]
+
+    def _nullables(self, queryset):
+        nullables = set()
+        for campo, _ in self._campos():
+            try:
+                if queryset.model._meta.get_field(campo).null:
+                    nullables.add(campo)
+            except FieldDoesNotExist:
+                pass
+        return nullables
+
+    def _despues_de(self, valores, reverso, nullables=()):
+        """
+        (a, b) > (va, vb)  =>  a >= va AND (a > va OR (a = va AND b > vb)), respetando -campo.
+        El a >= va redundante le da a PostgreSQL el límite del índice (sin él el OR se
+        aplica como Filter y recorre todas las filas anteriores, igual que un OFFSET).
+        """
+        condicion = Q()
+        iguales = {}
+        for (campo, desc), valor in zip(self._campos(), valores):
+            mayor = desc == reverso   # True => ASC efectivo (NULLs al final)
+            if valor is None:
+                # desde NULL: en ASC solo quedan NULLs (los decide el siguiente campo);
+                # en DESC los NULLs van primero, así que todo lo no NULL viene después
+                if not mayor:
+                    condicion |= Q(**iguales, **{f"{campo}__isnull": False})
+                iguales[f"{campo}__isnull"] = True
+                continue
+            condicion |= Q(**iguales, **{f"{campo}__{'gt' if mayor else 'lt'}": valor})
+            if mayor and campo in nullables:
+                condicion |= Q(**iguales, **{f"{campo}__isnull": True})
+            iguales[campo] = valor
+
+        (primero, desc), valor = self._campos()[0], valores[0]
+        if len(valores) > 1 and valor is not None and primero not in nullables:
+            condicion &= Q(**{f"{primero}__{'gte' if desc == reverso else 'lte'}": valor})
+        return condicion
+
+    # ---------- DRF ----------
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        cursor = self._decodificar(request)
+        reverso = bool(cursor and cursor[1])
+
+        modo_conteo = (request.query_params.get(self.count_query_param) or "").lower()
+        self.count = None
+        if modo_conteo == "exacto":
+            self.count = queryset.order_by().count()
+        elif modo_conteo == "estimado":
+            self.count = conteo_estimado(queryset)
+
+        orden = self.ordering
+        if reverso:
+            orden = tuple(o[1:] if o.startswith("-") else f"-{o}" for o in orden)
+
+        qs = queryset.order_by(*orden)
+        if cursor:
+            qs = qs.filter(self._despues_de(cursor[0], reverso, self._nullables(queryset)))
+
+        rows = list(qs[: size + 1])
+        hay_mas = len(rows) > size
+        rows = rows[:size]
+        if reverso:
+            rows.reverse()
+
+        self.has_next = True if reverso else hay_mas
+        self.has_previous = hay_mas if reverso else cursor is not None
+        self.rows = rows
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.rows:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self._codificar(self._valores(self.rows[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.rows:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self._codificar(self._valores(self.rows[0]), True))
+
+    def get_paginated_response(self, data):
+        out = OrderedDict()
+        if self.count is not None:
+            out["count"] = self.count
+        out["next"] = self.get_next_link()
+        out["previous"] = self.get_previous_link()
+        out["results"] = data
+        return Response(out)
+
+
+class HybridPagination(BasePagination):
+    """
+    Compatibilidad: número de página (StandardPagination) salvo que se pida cursor
+    con ?cursor=... o ?paginacion=cursor. Con paginar_por_defecto=False y sin
+    parámetros de paginación devuelve la lista completa (como antes en la API v2).
+    """
+    ordering = ("-id",)
+    paginar_por_defecto = True
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        cursor = KeysetPagination.cursor_query_param in params or params.get("paginacion") == "cursor"
+        # ordenado por relevancia (buscar_productos, modo ranked): el cursor sobre `ordering`
+        # perdería ese orden, así que la búsqueda se pagina por número de página
+        por_relevancia = "rank" in queryset.query.annotations
+        if cursor and not por_relevancia:
+            self.paginador = KeysetPagination(ordering=self.ordering)
+        elif cursor or self.paginar_por_defecto or "page" in params or "page_size" in params:
+            self.paginador = StandardPagination()
+        else:
+            self.paginador = None
+            return None
+        return self.paginador.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginador.get_paginated_response(data)
+
+
+def orden_solicitado(request, permitidos, defecto=("-id",)):
+    """
+    ?ordering=campo | -campo (lista blanca `permitidos`) => tupla para order_by y para el
+    cursor. Siempre termina en id (mismo sentido) para que el orden sea total.
+    """
+    valor = (request.query_params.get("ordering") or "").strip()
+    campo = valor.lstrip("-")
+    if not campo or campo not in permitidos:
+        return tuple(defecto)
+    desc = valor.startswith("-")
+    if campo == "id":
+        return ("-id",) if desc else ("id",)
+    return (valor, "-id" if desc else "id")
+
+
+class CatalogoPagination(HybridPagination):
+    ordering = ("nombre", "id")
+
+
+class CatalogoOpcionalPagination(CatalogoPagination):
+    paginar_por_defecto = False
+
+
+class PanelPagination(HybridPagination):
+    ordering = ("-id",)
+    paginar_por_defecto = False
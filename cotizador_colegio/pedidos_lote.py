@@ -0,0 +1,78 @@
+# cotizador_colegio/pedidos_lote.py
+"""
+Generación de pedidos desde adopciones, en lote.
+
+Las cabeceras nuevas salen de un bulk_create y los detalles de un solo
+INSERT ... SELECT desde detalles_adopcion (precio_proveedor tomado de productos en
+la misma sentencia). total_costo se calcula una vez por pedido al final.
+"""
+from django.db import connection, transaction
+
+from .models import DetalleAdopcion, DetallePedido, EstadoPedido, Pedido, Producto
+from .signals import recalcular_total_costo
+
+# BORRADOR / EMITIDO aún no están en ninguna orden de compra (consolidar los pasa a ENVIADO);
+# de ENVIADO en adelante el pedido ya se consolidó o se cerró y no se toca
+REGENERABLES = (EstadoPedido.BORRADOR, EstadoPedido.EMITIDO)
+
+
+def _copiar_detalles(pedido_ids: list):
+    """Borra y vuelve a insertar los detalles de los pedidos desde su adopción (2 sentencias)."""
+    dp = DetallePedido._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {dp} WHERE pedido_id = ANY(%s)", [pedido_ids])
+        cursor.execute(
+            f"""
+            INSERT INTO {dp} (pedido_id, producto_id, cantidad, precio_proveedor)
+            SELECT p.id, da.producto_id, da.cantidad_adoptada, pr.precio_proveedor
+            FROM {DetalleAdopcion._meta.db_table} da
+            JOIN {Pedido._meta.db_table} p ON p.adopcion_id = da.adopcion_id
+            JOIN {Producto._meta.db_table} pr ON pr.id = da.producto_id
+            WHERE p.id = ANY(%s)
+            ORDER BY p.id, da.id
+            """,
+            [pedido_ids],
+        )
+
+
+@transaction.atomic
+def generar_pedidos(adopciones, regenerables=REGENERABLES) -> dict:
+    """
+    adopciones: QuerySet de Adopcion (p.ej. filtrado con AdopcionFilter).
+    - sin pedido => se crea (BORRADOR)
+    - con pedido en `regenerables` => se reemplazan sus detalles y vuelve a BORRADOR
+    - resto => omitido (se informa su estado)
+    """
+    filas = list(
+        adopciones.order_by("id")
+        .select_for_update(of=("self",))
+        .values_list("id", "pedido__id", "pedido__estado")
+    )
+
+    nuevas, regenerar, omitidos = [], [], []
+    for adopcion_id, pedido_id, estado in filas:
+        if pedido_id is None:
+            nuevas.append(adopcion_id)
+        elif estado in regenerables:
+            regenerar.append(pedido_id)
+        else:
+            omitidos.append({"adopcion": adopcion_id, "pedido": pedido_id, "estado": estado})
+
+    creados = Pedido.objects.bulk_create([Pedido(adopcion_id=a) for a in nuevas], batch_size=1000)
+    pedido_ids = [p.id for p in creados] + regenerar
+
+    if pedido_ids:
+        # SQL directo: no pasa por las señales de DetallePedido, el total va aparte
+        _copiar_detalles(pedido_ids)
+        if regenerar:
+            Pedido.objects.filter(id__in=regenerar).exclude(estado=EstadoPedido.BORRADOR).update(
+                estado=EstadoPedido.BORRADOR
+            )
+        recalcular_total_costo(*pedido_ids)
+
+    return {
+        "creados": len(creados),
+        "regenerados": len(regenerar),
+        "omitidos": omitidos,
+        "pedidos": pedido_ids,
+    }
@@ -1,9 +1,17 @@
+import itertools
+import re
 from decimal import Decimal, ROUND_HALF_UP
+from typing import NamedTuple
 from .utils import nz_decimal, clamp_non_negative
 
 TWO = Decimal("0.01")
 HUNDRED = Decimal("100")
 
+# Backends de cálculo (seleccionables por llamada)
+BACKEND_DECIMAL = "decimal"      # Decimal + quantize (implementación original)
+BACKEND_CENTAVOS = "centavos"    # punto fijo: enteros en centavos / centésimas de punto
+BACKENDS = [BACKEND_DECIMAL, BACKEND_CENTAVOS]
+
 
 def q2(x: Decimal) -> Decimal:
     return Decimal(x).quantize(TWO, rounding=ROUND_HALF_UP)
@@ -42,17 +50,33 @@ def normalize_percent(value) -> Decimal:
     return val
 
 
-def calcular_item(tipo_venta: str, producto, data: dict) -> dict:
+def normalizar_tipo_venta(tipo_venta: str) -> str:
+    tipo_venta = (tipo_venta or "").upper().strip()
+    if tipo_venta == "PV":
+        tipo_venta = "PUNTO_DE_VENTA"
+    return tipo_venta
+
+
+def validar_backend(backend, default: str = BACKEND_CENTAVOS) -> str:
+    backend = str(backend or default).lower().strip()
+    if backend not in BACKENDS:
+        raise ValueError("backend inválido")
+    return backend
+
+
+def calcular_item(tipo_venta: str, producto, data: dict, backend: str = BACKEND_DECIMAL) -> dict:
     """
     Fuente única de verdad para cálculos.
     Replica lógica Excel:
     precio_proveedor = pvp - (pvp * descuento_proveedor)
     donde descuento_proveedor es porcentaje (36% / 40%) pero en excel se ve como 0.36/0.40.
+
+    backend="centavos" usa la aritmética de punto fijo (mismo resultado al centavo).
     """
+    if validar_backend(backend, BACKEND_DECIMAL) == BACKEND_CENTAVOS:
+        return calcular_batch(tipo_venta, [data], [producto], backend=BACKEND_CENTAVOS)[0]
 
-    tipo_venta = (tipo_venta or "").upper().strip()
-    if tipo_venta == "PV":
-        tipo_venta = "PUNTO_DE_VENTA"
+    tipo_venta = normalizar_tipo_venta(tipo_venta)
 
     precio_be = nz_decimal(data.get("precio_be", getattr(producto, "pvp_2026", 0)))
     descuento_ie = nz_decimal(data.get("descuento_ie", 20))  # tu sistema hoy lo usa como %
@@ -142,3 +166,622 @@ def calcular_item(tipo_venta: str, producto, data: dict) -> dict:
         return out
 
     raise ValueError("tipo_venta inválido")
+
+
+# ==========================
+# PUNTO FIJO (centavos)
+# ==========================
+# Mismas fórmulas que calcular_item, pero con enteros:
+# - montos en centavos (12.35 -> 1235)
+# - porcentajes en centésimas de punto (20% -> 2000, 36.55% -> 3655)
+#
+# Reglas de redondeo (igual que la hoja Excel mostrada a 2 decimales):
+# - cada entrada se lleva a 2 decimales con HALF_UP (nz_decimal)
+# - cada monto intermedio que el cálculo Decimal pasa por q2() se redondea
+#   HALF_UP, con empates alejándose de cero (ROUND de Excel)
+# - restas entre montos ya redondeados son exactas y no se redondean
+# Así el resultado es idéntico al centavo al backend Decimal.
+
+_NUMERO_RE = re.compile(r"([0-9]+)(?:\.([0-9]*))?")
+
+
+def _div_half_up(num: int, den: int) -> int:
+    """División entera redondeando HALF_UP (empates se alejan de cero). den > 0."""
+    if num >= 0:
+        return (2 * num + den) // (2 * den)
+    return -((2 * -num + den) // (2 * den))
+
+
+def _centavos(value) -> int:
+    """Equivalente entero de nz_decimal(value): centavos, nunca negativo."""
+    tipo = type(value)
+    if tipo is int:
+        return value * 100 if value > 0 else 0
+
+    if tipo is float:
+        # Decimal(str(value)) => usamos el mismo texto
+        value = repr(value)
+        tipo = str
+
+    if tipo is str:
+        m = _NUMERO_RE.fullmatch(value)
+        if m:
+            frac = (m.group(2) or "") + "000"
+            c = int(m.group(1)) * 100 + int(frac[:2])
+            return c + 1 if frac[2] >= "5" else c
+
+    # casos raros (Decimal, negativos, notación científica, basura): misma regla que nz_decimal
+    return int(nz_decimal(value).scaleb(2))
+
+
+def _desc_proveedor_bp(value) -> int:
+    """Equivalente entero de normalize_percent(value), en centésimas de punto (0..10000)."""
+    if value is None:
+        return 0
+
+    if isinstance(value, str):
+        value = value.strip().replace("%", "")
+
+    c = _centavos(value)
+    # 36 => 0.36 (3600) ; 0.36 => 0.36 (3600)
+    bp = c if c > 100 else c * 100
+    return min(bp, 10000)
+
+
+class PrecioProducto(NamedTuple):
+    """
+    Datos de precio de un Producto ya normalizados (ver precompilar_producto).
+    Expone id / pvp_2026 / descuento_proveedor, así que también sirve para calcular_item.
+    """
+    id: int
+    pvp_2026: Decimal
+    descuento_proveedor: Decimal
+    pvp_c: int
+    desc_bp: int
+    precio_proveedor_c: int
+
+
+def precompilar_producto(producto) -> PrecioProducto:
+    pvp = getattr(producto, "pvp_2026", 0)
+    desc_raw = getattr(producto, "descuento_proveedor", 0)
+    pvp_c = _centavos(pvp)
+    desc_bp = _desc_proveedor_bp(desc_raw)
+    return PrecioProducto(
+        id=producto.id,
+        pvp_2026=pvp,
+        descuento_proveedor=desc_raw,
+        pvp_c=pvp_c,
+        desc_bp=desc_bp,
+        precio_proveedor_c=_div_half_up(pvp_c * (10000 - desc_bp), 10000),
+    )
+
+
+def _dec(c: int) -> Decimal:
+    return Decimal(c).scaleb(-2)
+
+
+def _roi_percent(utilidad: list, precio_proveedor: list) -> list:
+    return [
+        max(_div_half_up(u * 10000, ppr), 0) if ppr > 0 else 0
+        for u, ppr in zip(utilidad, precio_proveedor)
+    ]
+
+
+# ==========================
+# BATCH (columnas)
+# ==========================
+
+# parámetros por item que entran a cada fórmula (con su default de calcular_item)
+PARAMETROS_PV = {"descuento_ie": 20, "precio_ppff": 0, "comi_coo": 0}
+PARAMETROS_CONSIGNA = {"desc_consigna": 0, "comision": 0}
+
+
+def validar_tipo_venta(tipo_venta: str) -> str:
+    tipo_venta = normalizar_tipo_venta(tipo_venta)
+    if tipo_venta not in ["PUNTO_DE_VENTA", "FERIA", "CONSIGNA"]:
+        raise ValueError("tipo_venta inválido")
+    return tipo_venta
+
+
+def validar_item(it: dict, tipo_venta: str) -> tuple:
+    """(producto_id, tipo_venta, cantidad) de un item de batch o ValueError con el motivo."""
+    if not it.get("producto_id"):
+        raise ValueError("Cada item requiere producto_id.")
+    try:
+        pid = int(it.get("producto_id"))
+    except (TypeError, ValueError):
+        raise ValueError("producto_id inválido.")
+    try:
+        cantidad = int(it.get("cantidad") or 1)
+    except (TypeError, ValueError):
+        raise ValueError("cantidad inválida.")
+    return pid, validar_tipo_venta(it.get("tipo_venta") or tipo_venta), cantidad
+
+
+def _columnas_base(items: list, productos: list) -> dict:
+    productos = [p if isinstance(p, PrecioProducto) else precompilar_producto(p) for p in productos]
+
+    precio_be = [
+        _centavos(x["precio_be"]) if "precio_be" in x else p.pvp_c
+        for x, p in zip(items, productos)
+    ]
+    desc_bp = [p.desc_bp for p in productos]
+
+    # Excel: PPR = PVP - (PVP * DSCT_PROVE) ; sin precio_be propio se reutiliza el precompilado
+    precio_proveedor = [
+        _div_half_up(be * (10000 - p.desc_bp), 10000) if "precio_be" in x else p.precio_proveedor_c
+        for x, p, be in zip(items, productos, precio_be)
+    ]
+
+    return {
+        "producto_id": [p.id for p in productos],
+        "precio_be": precio_be,
+        "desc_proveedor": [_div_half_up(d, 100) for d in desc_bp],
+        "precio_proveedor": precio_proveedor,
+    }
+
+
+def _columnas_parametros(parametros: dict, items: list) -> dict:
+    return {
+        nombre: [_centavos(x.get(nombre, default)) for x in items]
+        for nombre, default in parametros.items()
+    }
+
+
+def _columnas_pv(precio_be, precio_proveedor, descuento_ie, precio_ppff, comi_coo) -> dict:
+    descuento_ie_monto = [_div_half_up(be * d, 10000) for be, d in zip(precio_be, descuento_ie)]
+    precio_ie = [be - m for be, m in zip(precio_be, descuento_ie_monto)]
+    utilidad_ie = [pf - pie for pf, pie in zip(precio_ppff, precio_ie)]
+    precio_coo = [pie - c for pie, c in zip(precio_ie, comi_coo)]
+    utilidad_be = [pc - ppr for pc, ppr in zip(precio_coo, precio_proveedor)]
+
+    return {
+        "descuento_ie": descuento_ie,
+        "descuento_ie_monto": descuento_ie_monto,
+        "precio_ie": precio_ie,
+        "precio_ppff": precio_ppff,
+        "comi_coo": comi_coo,
+        "precio_coordinado": precio_coo,
+        "utilidad_ie": utilidad_ie,
+        "utilidad_be_x_un": utilidad_be,
+        "roi_ie": utilidad_be,
+        "roi_percent": _roi_percent(utilidad_be, precio_proveedor),
+    }
+
+
+def _columnas_consigna(precio_be, precio_proveedor, desc_consigna, comision) -> dict:
+    # Precio consigna: BE - (BE * desc_consigna%)
+    precio_consigna = [_div_half_up(be * (10000 - d), 10000) for be, d in zip(precio_be, desc_consigna)]
+    precio_coordinado = [pc - c for pc, c in zip(precio_consigna, comision)]
+    utilidad_be = [pc - ppr for pc, ppr in zip(precio_coordinado, precio_proveedor)]
+
+    return {
+        "desc_consigna": desc_consigna,
+        "precio_consigna": precio_consigna,
+        "comision": comision,
+        "precio_coordinado": precio_coordinado,
+        "utilidad_be_x_un": utilidad_be,
+        "roi_percent": _roi_percent(utilidad_be, precio_proveedor),
+    }
+
+
+def calcular_columnas(tipo_venta: str, items: list, productos: list) -> dict:
+    """
+    Calcula todos los campos de calcular_item como columnas de enteros (centavos).
+    `items` y `productos` van alineados: productos[i] es el Producto (o PrecioProducto) de items[i].
+    """
+    tipo_venta = validar_tipo_venta(tipo_venta)
+    cols = _columnas_base(items, productos)
+
+    if tipo_venta in ["PUNTO_DE_VENTA", "FERIA"]:
+        cols.update(_columnas_pv(
+            cols["precio_be"], cols["precio_proveedor"],
+            **_columnas_parametros(PARAMETROS_PV, items),
+        ))
+    else:
+        cols.update(_columnas_consigna(
+            cols["precio_be"], cols["precio_proveedor"],
+            **_columnas_parametros(PARAMETROS_CONSIGNA, items),
+        ))
+
+    cols["tipo_venta"] = tipo_venta
+    return cols
+
+
+# orden de salida = orden de calcular_item
+_CAMPOS_BASE = ["precio_be", "desc_proveedor", "precio_proveedor"]
+_CAMPOS_PV = [
+    "descuento_ie", "descuento_ie_monto", "precio_ie", "precio_ppff", "comi_coo",
+    "precio_coordinado", "utilidad_ie", "utilidad_be_x_un", "roi_ie", "roi_percent",
+]
+_CAMPOS_CONSIGNA = [
+    "desc_consigna", "precio_consigna", "comision", "precio_coordinado",
+    "utilidad_be_x_un", "roi_percent",
+]
+
+
+def calcular_batch(tipo_venta: str, items: list, productos: list, backend: str = BACKEND_CENTAVOS) -> list:
+    """
+    Versión batch de calcular_item: devuelve la misma lista de dicts (Decimal a 2 decimales)
+    que [calcular_item(tipo_venta, p, x) for x, p in zip(items, productos)].
+    """
+    if validar_backend(backend, BACKEND_CENTAVOS) == BACKEND_DECIMAL:
+        return [calcular_item(tipo_venta, p, x) for x, p in zip(items, productos)]
+
+    return _filas(calcular_columnas(tipo_venta, items, productos))
+
+
+def _filas(cols: dict) -> list:
+    tipo_venta = cols["tipo_venta"]
+    campos = _CAMPOS_BASE + (_CAMPOS_CONSIGNA if tipo_venta == "CONSIGNA" else _CAMPOS_PV)
+
+    out = []
+    for i, pid in enumerate(cols["producto_id"]):
+        row = {"producto_id": pid, "tipo_venta": tipo_venta}
+        for campo in campos:
+            row[campo] = _dec(cols[campo][i])
+        out.append(row)
+    return out
+
+
+# ==========================
+# ESCENARIOS (what-if)
+# ==========================
+MAX_ESCENARIOS = 1000
+MAX_CELDAS_ESCENARIOS = 200_000   # items x escenarios por llamada
+
+PARAMETROS_BARRIDO = {
+    "PUNTO_DE_VENTA": ["descuento_ie", "comi_coo"],
+    "FERIA": ["descuento_ie", "comi_coo"],
+    "CONSIGNA": ["desc_consigna", "comision"],
+}
+
+
+def _valores_rango(nombre: str, rango) -> list:
+    """
+    Acepta lista de valores [10, 15, 20] o {"desde": 10, "hasta": 20, "paso": 5}.
+    Devuelve los valores en centavos.
+    """
+    if isinstance(rango, (list, tuple)):
+        valores = [_centavos(v) for v in rango]
+    elif isinstance(rango, dict):
+        desde = _centavos(rango.get("desde", 0))
+        hasta = _centavos(rango.get("hasta", rango.get("desde", 0)))
+        paso = _centavos(rango.get("paso", 1))
+        if paso <= 0:
+            raise ValueError(f"{nombre}: paso debe ser mayor que 0")
+        if hasta < desde:
+            raise ValueError(f"{nombre}: hasta debe ser mayor o igual que desde")
+        if (hasta - desde) // paso + 1 > MAX_ESCENARIOS:
+            raise ValueError(f"{nombre}: demasiados valores")
+        valores = list(range(desde, hasta + 1, paso))
+    else:
+        raise ValueError(f"{nombre}: rango inválido")
+
+    if not valores:
+        raise ValueError(f"{nombre}: rango vacío")
+    return list(dict.fromkeys(valores))
+
+
+def simular_escenarios(tipo_venta: str, items: list, productos: list, rangos: dict) -> dict:
+    """
+    Barrido what-if sobre una cotización: para cada combinación de los parámetros en
+    `rangos` (producto cartesiano) calcula los totales ponderados por cantidad.
+
+    Todas las combinaciones se calculan en una sola pasada de las mismas fórmulas de
+    calcular_item (columnas de items x escenarios). Los parámetros no barridos usan
+    el valor de cada item.
+
+    roi_percent del escenario = total_utilidad / total_costo * 100 (sin recortar a 0,
+    para que se vean los escenarios con pérdida).
+    """
+    tipo_venta = validar_tipo_venta(tipo_venta)
+    permitidos = PARAMETROS_BARRIDO[tipo_venta]
+
+    rangos = rangos or {}
+    invalidos = [k for k in rangos if k not in permitidos]
+    if invalidos:
+        raise ValueError(f"Parámetros no válidos para {tipo_venta}: {', '.join(invalidos)}")
+    if not rangos:
+        raise ValueError(f"Debe enviar rangos para al menos uno de: {', '.join(permitidos)}")
+
+    nombres = [k for k in permitidos if k in rangos]
+    valores = [_valores_rango(k, rangos[k]) for k in nombres]
+    combinaciones = list(itertools.product(*valores))
+
+    n = len(items)
+    if len(combinaciones) > MAX_ESCENARIOS:
+        raise ValueError(f"Demasiados escenarios (máx. {MAX_ESCENARIOS})")
+    if n * len(combinaciones) > MAX_CELDAS_ESCENARIOS:
+        raise ValueError("La cotización es demasiado grande para esa cantidad de escenarios")
+
+    base = _columnas_base(items, productos)
+    parametros = PARAMETROS_PV if tipo_venta != "CONSIGNA" else PARAMETROS_CONSIGNA
+    cols_item = _columnas_parametros(parametros, items)
+    cantidad = [max(int(x.get("cantidad") or 1), 0) for x in items]
+
+    # columnas expandidas: escenario k ocupa las filas [k*n, (k+1)*n)
+    s = len(combinaciones)
+    entrada = {nombre: col * s for nombre, col in cols_item.items()}
+    for j, nombre in enumerate(nombres):
+        entrada[nombre] = [v for combo in combinaciones for v in itertools.repeat(combo[j], n)]
+
+    precio_be = base["precio_be"] * s
+    precio_proveedor = base["precio_proveedor"] * s
+    if tipo_venta == "CONSIGNA":
+        cols = _columnas_consigna(precio_be, precio_proveedor, **entrada)
+        precio_venta = cols["precio_consigna"]
+    else:
+        cols = _columnas_pv(precio_be, precio_proveedor, **entrada)
+        precio_venta = cols["precio_ie"]
+    utilidad = cols["utilidad_be_x_un"]
+
+    total_costo = sum(c * q for c, q in zip(base["precio_proveedor"], cantidad))
+
+    escenarios = []
+    for k, combo in enumerate(combinaciones):
+        fila = slice(k * n, (k + 1) * n)
+        total_bruto = sum(v * q for v, q in zip(precio_venta[fila], cantidad))
+        total_utilidad = sum(u * q for u, q in zip(utilidad[fila], cantidad))
+        roi = _div_half_up(total_utilidad * 10000, total_costo) if total_costo > 0 else 0
+
+        esc = {nombre: _dec(v) for nombre, v in zip(nombres, combo)}
+        esc.update({
+            "total_bruto": _dec(total_bruto),
+            "total_utilidad": _dec(total_utilidad),
+            "total_costo": _dec(total_costo),
+            "roi_percent": _dec(roi),
+        })
+        escenarios.append(esc)
+
+    return {
+        "tipo_venta": tipo_venta,
+        "parametros": nombres,
+        "escenarios": escenarios,
+    }
+
+
+# ==========================
+# OBJETIVOS (goal-seek)
+# ==========================
+# Invierte las fórmulas de calcular_item para encontrar el descuento / comisión
+# que cumple un objetivo:
+# - "roi":    roi_percent >= valor   -> el MAYOR descuento/comisión que lo cumple
+# - "precio": precio_ie (o precio_consigna) <= valor -> el MENOR descuento que lo cumple
+# - "total":  total_bruto de la cotización <= valor  -> el MENOR descuento uniforme
+# Por línea se resuelve en forma cerrada (con el mismo HALF_UP del punto fijo);
+# solo el descuento uniforme con objetivo roi/total, que mezcla el redondeo de
+# todas las líneas, se resuelve con bisección sobre enteros (≈14 pasadas).
+
+OBJETIVOS = ["roi", "precio", "total"]
+MODOS_OBJETIVO = ["linea", "uniforme"]
+
+VARIABLES_OBJETIVO = {
+    "PUNTO_DE_VENTA": {"descuento": "descuento_ie", "comision": "comi_coo"},
+    "FERIA": {"descuento": "descuento_ie", "comision": "comi_coo"},
+    "CONSIGNA": {"descuento": "desc_consigna", "comision": "comision"},
+}
+
+_MAX_DESCUENTO = 10000   # 100.00 %
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _utilidad_minima(roi: int, costo: int) -> int:
+    """Menor utilidad (centavos) con round_half_up(utilidad / costo * 100) >= roi."""
+    return max(_ceil_div((2 * roi - 1) * costo, 20000), 0)
+
+
+def _precio_venta(tipo_venta: str, be: int, descuento: int) -> int:
+    if tipo_venta == "CONSIGNA":
+        return _div_half_up(be * (10000 - descuento), 10000)
+    return be - _div_half_up(be * descuento, 10000)
+
+
+def _descuento_max_para_precio_min(tipo_venta: str, be: int, minimo: int) -> int:
+    """Mayor descuento con precio de venta >= minimo (-1 si ni con 0% se llega)."""
+    if minimo <= 0:
+        return _MAX_DESCUENTO
+    if be < minimo:
+        return -1
+    if tipo_venta == "CONSIGNA":
+        # round(be * (10000 - d) / 10000) >= minimo
+        d = 10000 - _ceil_div(5000 * (2 * minimo - 1), be)
+    else:
+        # be - round(be * d / 10000) >= minimo
+        d = _ceil_div(5000 * (2 * (be - minimo) + 1), be) - 1
+    return min(d, _MAX_DESCUENTO)
+
+
+def _descuento_min_para_precio_max(tipo_venta: str, be: int, maximo: int) -> int:
+    """Menor descuento con precio de venta <= maximo."""
+    if be <= maximo:
+        return 0
+    if tipo_venta == "CONSIGNA":
+        # round(be * (10000 - d) / 10000) <= maximo
+        d = 10000 - _ceil_div(5000 * (2 * maximo + 1), be) + 1
+    else:
+        # be - round(be * d / 10000) <= maximo
+        d = _ceil_div(5000 * (2 * (be - maximo) - 1), be)
+    return min(max(d, 0), _MAX_DESCUENTO)
+
+
+def _bisectar(ok, lo: int, hi: int, mayor: bool) -> int:
+    """
+    ok() monótona en [lo, hi]. mayor=True: último v con ok(v) (ok de True a False);
+    mayor=False: primer v con ok(v) (ok de False a True).
+    """
+    while lo < hi:
+        if mayor:
+            mid = (lo + hi + 1) // 2
+            if ok(mid):
+                lo = mid
+            else:
+                hi = mid - 1
+        else:
+            mid = (lo + hi) // 2
+            if ok(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+    return lo
+
+
+def resolver_objetivo(
+    tipo_venta: str,
+    items: list,
+    productos: list,
+    objetivo: str,
+    valor,
+    variable: str = "descuento",
+    modo: str = "linea",
+) -> dict:
+    """
+    Goal-seek sobre una cotización.
+
+    objetivo: "roi" (valor en %), "precio" o "total" (valor en soles).
+    variable: "descuento" (descuento_ie / desc_consigna) o "comision" (comi_coo / comision).
+    modo: "linea" (un valor por item) o "uniforme" (el mismo valor para todos).
+    En modo "linea" un item puede traer su propio "valor_objetivo".
+
+    Devuelve los valores encontrados, si el objetivo es alcanzable y los items
+    recalculados con calcular_batch.
+    """
+    tipo_venta = validar_tipo_venta(tipo_venta)
+    objetivo = (objetivo or "").lower().strip()
+    variable = (variable or "descuento").lower().strip()
+    modo = (modo or "linea").lower().strip()
+
+    if objetivo not in OBJETIVOS:
+        raise ValueError("objetivo inválido")
+    if modo not in MODOS_OBJETIVO:
+        raise ValueError("modo inválido")
+    if variable not in VARIABLES_OBJETIVO[tipo_venta]:
+        raise ValueError("variable inválida")
+    if objetivo in ["precio", "total"] and variable != "descuento":
+        raise ValueError("El precio solo depende del descuento")
+    if objetivo == "total" and modo != "uniforme":
+        raise ValueError("El objetivo total requiere modo uniforme")
+
+    campo = VARIABLES_OBJETIVO[tipo_venta][variable]
+    meta = _centavos(valor)
+    n = len(items)
+
+    base = _columnas_base(items, productos)
+    parametros = PARAMETROS_PV if tipo_venta != "CONSIGNA" else PARAMETROS_CONSIGNA
+    cols = _columnas_parametros(parametros, items)
+    be_col = base["precio_be"]
+    ppr_col = base["precio_proveedor"]
+    cantidad = [max(int(x.get("cantidad") or 1), 0) for x in items]
+
+    if tipo_venta == "CONSIGNA":
+        desc_col, com_col = cols["desc_consigna"], cols["comision"]
+    else:
+        desc_col, com_col = cols["descuento_ie"], cols["comi_coo"]
+
+    def utilidad_linea(i, descuento, comision):
+        return _precio_venta(tipo_venta, be_col[i], descuento) - comision - ppr_col[i]
+
+    def total_utilidad(descuento_uniforme):
+        return sum(
+            q * utilidad_linea(i, descuento_uniforme, com_col[i]) for i, q in enumerate(cantidad)
+        )
+
+    def total_bruto(descuento_uniforme):
+        return sum(q * _precio_venta(tipo_venta, be_col[i], descuento_uniforme) for i, q in enumerate(cantidad))
+
+    if modo == "linea":
+        metas = [
+            _centavos(x["valor_objetivo"]) if "valor_objetivo" in x else meta
+            for x in items
+        ]
+        valores = []
+        for i in range(n):
+            be, ppr = be_col[i], ppr_col[i]
+
+            if objetivo == "precio":
+                valores.append(_descuento_min_para_precio_max(tipo_venta, be, metas[i]))
+            elif ppr <= 0:
+                # sin costo el roi_percent es 0: se deja el valor actual
+                valores.append(desc_col[i] if variable == "descuento" else com_col[i])
+            elif variable == "comision":
+                u_min = _utilidad_minima(metas[i], ppr)
+                valores.append(max(_precio_venta(tipo_venta, be, desc_col[i]) - ppr - u_min, 0))
+            else:
+                u_min = _utilidad_minima(metas[i], ppr)
+                d = _descuento_max_para_precio_min(tipo_venta, be, com_col[i] + ppr + u_min)
+                valores.append(max(d, 0))
+    else:
+        costo = sum(q * ppr for q, ppr in zip(cantidad, ppr_col))
+
+        if objetivo == "precio":
+            v = max(
+                (_descuento_min_para_precio_max(tipo_venta, be, meta) for be in be_col),
+                default=0,
+            )
+        elif objetivo == "total":
+            v = _bisectar(lambda d: total_bruto(d) <= meta, 0, _MAX_DESCUENTO, mayor=False)
+        elif costo <= 0:
+            # sin costo el roi_percent es 0: nada que ajustar
+            v = 0
+        elif variable == "comision":
+            # sum(q * (precio - c - ppr)) >= u_min  =>  c <= (A - u_min) / Q
+            u_min = _utilidad_minima(meta, costo)
+            a = sum(
+                q * (_precio_venta(tipo_venta, be_col[i], desc_col[i]) - ppr_col[i])
+                for i, q in enumerate(cantidad)
+            )
+            q_total = sum(cantidad)
+            v = max((a - u_min) // q_total, 0) if q_total else 0
+        else:
+            u_min = _utilidad_minima(meta, costo)
+            v = _bisectar(lambda d: total_utilidad(d) >= u_min, 0, _MAX_DESCUENTO, mayor=True)
+
+        valores = [v] * n
+
+    # recalcular con los valores encontrados y verificar el objetivo
+    nuevos = [dict(x, **{campo: _dec(v)}) for x, v in zip(items, valores)]
+    out = calcular_columnas(tipo_venta, nuevos, productos)
+    precio_out = out["precio_consigna"] if tipo_venta == "CONSIGNA" else out["precio_ie"]
+    util_out = out["utilidad_be_x_un"]
+
+    bruto = sum(q * v for q, v in zip(cantidad, precio_out))
+    utilidad = sum(q * u for q, u in zip(cantidad, util_out))
+    costo = sum(q * ppr for q, ppr in zip(cantidad, out["precio_proveedor"]))
+    roi_total = _div_half_up(utilidad * 10000, costo) if costo > 0 else 0
+
+    if modo == "linea":
+        if objetivo == "precio":
+            alcanzable = [p <= m for p, m in zip(precio_out, metas)]
+        else:
+            alcanzable = [r >= m for r, m in zip(out["roi_percent"], metas)]
+    else:
+        if objetivo == "precio":
+            ok = all(p <= meta for p in precio_out)
+        elif objetivo == "total":
+            ok = bruto <= meta
+        else:
+            ok = max(roi_total, 0) >= meta
+        alcanzable = [ok] * n
+
+    out_items = _filas(out)
+    for row, ok in zip(out_items, alcanzable):
+        row["alcanzable"] = ok
+
+    return {
+        "tipo_venta": tipo_venta,
+        "objetivo": objetivo,
+        "valor": _dec(meta),
+        "variable": campo,
+        "modo": modo,
+        "alcanzable": all(alcanzable),
+        "items": out_items,
+        "totales": {
+            "total_bruto": _dec(bruto),
+            "total_utilidad": _dec(utilidad),
+            "total_costo": _dec(costo),
+            "roi_percent": _dec(roi_total),
+        },
+    }
@@ -10,6 +10,8 @@ from .models import (
     DetalleAdopcion,
     Pedido,
     DetallePedido,
+    OrdenCompra,
+    DetalleOrdenCompra,
 )
 
 
@@ -130,12 +132,11 @@ class CotizacionSerializer(serializers.ModelSerializer):
     asesor_nombre = serializers.CharField(source="asesor.nombre", read_only=True)
     detalles = DetalleCotizacionSerializer(many=True, read_only=True)
 
-    # ✅ Para mostrar tipo de venta también en detalle
+    # ✅ Para mostrar tipo de venta también en detalle (denormalizado en Cotizacion)
     tipo_venta = serializers.SerializerMethodField()
 
     def get_tipo_venta(self, obj):
-        det = obj.detalles.first()
-        return det.tipo_venta if det else ""
+        return obj.tipo_venta or ""
 
     class Meta:
         model = Cotizacion
@@ -158,12 +159,11 @@ class CotizacionListSerializer(serializers.ModelSerializer):
     institucion = serializers.CharField(source="institucion.nombre", read_only=True)
     asesor = serializers.CharField(source="asesor.nombre", read_only=True)
 
-    # ✅ Panel pide tipo_venta pero no existe en Cotizacion: lo calculamos
+    # ✅ Panel pide tipo_venta: denormalizado en Cotizacion (sin consultar detalles)
     tipo_venta = serializers.SerializerMethodField()
 
     def get_tipo_venta(self, obj):
-        det = obj.detalles.first()
-        return det.tipo_venta if det else ""
+        return obj.tipo_venta or ""
 
     class Meta:
         model = Cotizacion
@@ -175,6 +175,10 @@ class CotizacionListSerializer(serializers.ModelSerializer):
             "fecha",
             "estado",
             "tipo_venta",
+            "lineas",
+            "cantidad_total",
+            "total_precio_ie",
+            "total_roi_ie",
         ]
 
 
@@ -217,8 +221,7 @@ class AdopcionSerializer(serializers.ModelSerializer):
     tipo_venta = serializers.SerializerMethodField()
 
     def get_tipo_venta(self, obj):
-        det = obj.cotizacion.detalles.first()
-        return det.tipo_venta if det else ""
+        return obj.cotizacion.tipo_venta or ""
 
     class Meta:
         model = Adopcion
@@ -253,7 +256,32 @@ class PedidoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Pedido
-        fields = ["id", "adopcion", "numero_cotizacion", "fecha_pedido", "estado", "detalles"]
+        fields = ["id", "adopcion", "numero_cotizacion", "fecha_pedido", "estado", "total_costo", "detalles"]
+
+
+# ==========================
+# ÓRDENES DE COMPRA
+# ==========================
+class DetalleOrdenCompraSerializer(serializers.ModelSerializer):
+    producto_nombre = serializers.CharField(source="producto.nombre", read_only=True)
+    codigo = serializers.CharField(source="producto.codigo", read_only=True)
+
+    class Meta:
+        model = DetalleOrdenCompra
+        fields = ["id", "producto", "codigo", "producto_nombre", "cantidad", "precio_proveedor", "subtotal"]
+
+
+class OrdenCompraSerializer(serializers.ModelSerializer):
+    editorial_nombre = serializers.CharField(source="editorial.nombre", read_only=True)
+    pedidos = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    detalles = DetalleOrdenCompraSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = OrdenCompra
+        fields = [
+            "id", "editorial", "editorial_nombre", "fecha",
+            "lineas", "cantidad_total", "total_costo", "pedidos", "detalles",
+        ]
 
 
 # =========================================================
@@ -0,0 +1,247 @@
+# cotizador_colegio/serializers_rapidos.py
+"""
+Serialización rápida para listados calientes.
+
+Arma las filas directo desde .values() con un mapeo de campos precompilado (sin instanciar
+modelos ni resolver source= campo por campo). La salida es la misma que la de los
+ModelSerializer equivalentes (mismas claves, mismo orden, mismos formatos), así el JSON
+renderizado es idéntico byte a byte. Ver `manage.py benchmark_serializers`.
+"""
+from decimal import Decimal
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from .models import DetalleAdopcion, DetallePedido
+
+
+# ============================
+# ✅ Conversores (mismo formato que los campos DRF)
+# ============================
+_Q2 = Decimal("0.01")
+_datetime_drf = serializers.DateTimeField()
+_date_drf = serializers.DateField()
+
+
+def decimal_2(value):
+    # DecimalField(decimal_places=2) con COERCE_DECIMAL_TO_STRING
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value).strip())
+    return f"{value.quantize(_Q2):f}"
+
+
+def fecha_hora(value):
+    return _datetime_drf.to_representation(value)
+
+
+def fecha(value):
+    return _date_drf.to_representation(value)
+
+
+# ============================
+# ✅ Base
+# ============================
+class ValuesSerializer:
+    """
+    campos = [(clave_salida, lookup, conversor | None, opcional)]
+    opcional=True: el lookup cruza una FK nullable; si es None la clave se omite
+    (igual que DRF cuando source="fk.campo" y fk es None).
+    Un mismo lookup puede alimentar varias claves (alias).
+    """
+    campos = ()
+    modelo = None
+
+    def __init__(self, instance, many=True):
+        self.instance = instance
+
+    @classmethod
+    def lookups(cls):
+        vistos = []
+        for _, lookup, _, _ in cls.campos:
+            if lookup not in vistos:
+                vistos.append(lookup)
+        return vistos
+
+    @classmethod
+    def anotaciones(cls):
+        return {}
+
+    @classmethod
+    def preparar(cls, queryset, extra=()):
+        """
+        QuerySet de dicts listo para paginar/serializar (select_related/prefetch no hacen falta).
+        extra: lookups adicionales que necesita el paginador por cursor (campos de orden).
+        """
+        anot = cls.anotaciones()
+        if anot:
+            queryset = queryset.annotate(**anot)
+        lookups = cls.lookups()
+        return queryset.values(*lookups, *[e for e in extra if e not in lookups])
+
+    @classmethod
+    def filas(cls, rows):
+        campos = cls.campos
+        out = []
+        append = out.append
+        for row in rows:
+            fila = {}
+            for clave, lookup, conv, opcional in campos:
+                v = row[lookup]
+                if v is None:
+                    if not opcional:
+                        fila[clave] = None
+                elif conv is None:
+                    fila[clave] = v
+                else:
+                    fila[clave] = conv(v)
+            append(fila)
+        return out
+
+    @property
+    def data(self):
+        # QuerySet de modelos => se prepara aquí; filas ya preparadas (p.ej. una página) => tal cual
+        rows = self.instance
+        if isinstance(rows, QuerySet):
+            rows = self.preparar(rows)
+        return self.filas(rows)
+
+
+# ============================
+# ✅ Productos (== ProductoSerializer)
+# ============================
+class ProductoRapidoSerializer(ValuesSerializer):
+    campos = (
+        ("id", "id", None, False),
+        ("editorial", "editorial_id", None, False),
+        ("editorial_nombre", "editorial__nombre", None, False),
+        ("codigo", "codigo", None, False),
+        ("nombre", "nombre", None, False),
+        ("nivel", "nivel", None, False),
+        ("grado", "grado", None, False),
+        ("area", "area", None, False),
+        ("serie", "serie", None, False),
+        ("pvp_2026", "pvp_2026", decimal_2, False),
+        ("pvp_2026_con_igv", "pvp_2026", decimal_2, False),
+        ("descuento_proveedor", "descuento_proveedor", decimal_2, False),
+        ("precio_proveedor", "precio_proveedor", decimal_2, False),
+        ("estado", "estado", None, False),
+    )
+
+
+# ============================
+# ✅ Cotizaciones (== CotizacionListSerializer)
+# ============================
+class CotizacionListRapidoSerializer(ValuesSerializer):
+    campos = (
+        ("id", "id", None, False),
+        ("numero_cotizacion", "numero_cotizacion", None, False),
+        ("institucion", "institucion__nombre", None, False),
+        ("asesor", "asesor__nombre", None, True),
+        ("fecha", "fecha", fecha_hora, False),
+        ("estado", "estado", None, False),
+        ("tipo_venta", "tipo_venta", None, False),
+        ("lineas", "lineas", None, False),
+        ("cantidad_total", "cantidad_total", None, False),
+        ("total_precio_ie", "total_precio_ie", decimal_2, False),
+        ("total_roi_ie", "total_roi_ie", decimal_2, False),
+    )
+
+
+# ============================
+# ✅ Adopciones (== AdopcionSerializer, con detalles)
+# ============================
+class ConDetallesSerializer(ValuesSerializer):
+    """
+    Cabecera + lista "detalles" anidada. Los detalles de todas las filas salen de una
+    sola consulta (detalle_serializer.modelo filtrado por detalle_fk__in).
+    con_detalles=False => modo resumen, sin la clave "detalles".
+    """
+    detalle_serializer = None
+    detalle_fk = None
+    con_detalles = True
+
+    @classmethod
+    def filas(cls, rows):
+        out = super().filas(rows)
+        if not cls.con_detalles:
+            return out
+
+        det_cls = cls.detalle_serializer
+        ids = [fila["id"] for fila in out]
+        detalles = {}
+        rows_det = list(
+            det_cls.preparar(det_cls.modelo.objects.filter(**{f"{cls.detalle_fk}__in": ids}).order_by("id"))
+        )
+        for row, det in zip(rows_det, det_cls.filas(rows_det)):
+            detalles.setdefault(row[cls.detalle_fk], []).append(det)
+
+        for fila in out:
+            fila["detalles"] = detalles.get(fila["id"], [])
+        return out
+
+
+class DetalleAdopcionRapidoSerializer(ValuesSerializer):
+    modelo = DetalleAdopcion
+    campos = (
+        ("id", "id", None, False),
+        ("adopcion", "adopcion_id", None, False),
+        ("producto", "producto_id", None, False),
+        ("producto_nombre", "producto__nombre", None, False),
+        ("area", "producto__area", None, False),
+        ("grado", "producto__grado", None, False),
+        ("pvp_2026", "producto__pvp_2026", decimal_2, False),
+        ("cantidad_adoptada", "cantidad_adoptada", None, False),
+        ("mes_lectura", "mes_lectura", None, False),
+    )
+
+
+class AdopcionRapidoSerializer(ConDetallesSerializer):
+    detalle_serializer = DetalleAdopcionRapidoSerializer
+    detalle_fk = "adopcion_id"
+    campos = (
+        ("id", "id", None, False),
+        ("cotizacion", "cotizacion_id", None, False),
+        ("numero_cotizacion", "cotizacion__numero_cotizacion", None, False),
+        ("institucion", "cotizacion__institucion__nombre", None, False),
+        ("asesor", "cotizacion__asesor__nombre", None, True),
+        ("fecha_adopcion", "fecha_adopcion", fecha, False),
+        ("fecha", "fecha_adopcion", fecha, False),
+        ("cantidad_total", "cantidad_total", None, False),
+        ("tipo_venta", "cotizacion__tipo_venta", None, False),
+    )
+
+
+class AdopcionResumenRapidoSerializer(AdopcionRapidoSerializer):
+    con_detalles = False
+
+
+# ============================
+# ✅ Pedidos (== PedidoSerializer, con detalles)
+# ============================
+class DetallePedidoRapidoSerializer(ValuesSerializer):
+    modelo = DetallePedido
+    campos = (
+        ("id", "id", None, False),
+        ("pedido", "pedido_id", None, False),
+        ("producto", "producto_id", None, False),
+        ("producto_nombre", "producto__nombre", None, False),
+        ("cantidad", "cantidad", None, False),
+        ("precio_proveedor", "precio_proveedor", decimal_2, False),
+    )
+
+
+class PedidoRapidoSerializer(ConDetallesSerializer):
+    detalle_serializer = DetallePedidoRapidoSerializer
+    detalle_fk = "pedido_id"
+    campos = (
+        ("id", "id", None, False),
+        ("adopcion", "adopcion_id", None, False),
+        ("numero_cotizacion", "adopcion__cotizacion__numero_cotizacion", None, False),
+        ("fecha_pedido", "fecha_pedido", fecha, False),
+        ("estado", "estado", None, False),
+        ("total_costo", "total_costo", decimal_2, False),
+    )
+
+
+class PedidoResumenRapidoSerializer(PedidoRapidoSerializer):
+    con_detalles = False
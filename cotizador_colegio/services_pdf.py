@@ -287,9 +287,8 @@ def generar_pdf_cotizacion(cotizacion) -> bytes:
 
     inst = getattr(cotizacion, "institucion", None)
     asesor = getattr(cotizacion, "asesor", None)
-    primer_det = cotizacion.detalles.first() if hasattr(cotizacion, "detalles") else None
-
-    raw_tv = (getattr(primer_det, "tipo_venta", "") or "").upper().strip()
+    # tipo_venta denormalizado en Cotizacion (= el del primer detalle)
+    raw_tv = (getattr(cotizacion, "tipo_venta", "") or "").upper().strip()
     es_pv = raw_tv in ("PV", "PUNTO_DE_VENTA", "PUNTO DE VENTA", "FERIA")
     tipo_legible = _tipo_venta_legible(raw_tv)
 
@@ -443,9 +442,7 @@ def generar_pdf_adopcion(adopcion) -> bytes:
     cot = getattr(adopcion, "cotizacion", None)
     inst = getattr(cot, "institucion", None) if cot else None
     asesor = getattr(cot, "asesor", None) if cot else None
-    primer_det = cot.detalles.first() if cot and hasattr(cot, "detalles") else None
-
-    raw_tv = (getattr(primer_det, "tipo_venta", "") or "").upper().strip()
+    raw_tv = (getattr(cot, "tipo_venta", "") or "").upper().strip()
     tipo_legible = _tipo_venta_legible(raw_tv)
 
     adop_num = getattr(adopcion, "id", "")
@@ -1,44 +1,211 @@
 # cotizador_colegio/signals.py
-from decimal import Decimal, ROUND_HALF_UP
-from django.db.models.signals import post_save, post_delete
+import threading
+import weakref
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 
-from .models import DetallePedido, Pedido, DetalleAdopcion, Adopcion
+from .models import (
+    DetallePedido,
+    Pedido,
+    DetalleAdopcion,
+    Adopcion,
+    Producto,
+    Editorial,
+    Cotizacion,
+    DetalleCotizacion,
+)
+from .catalogo import (
+    incrementar_version_catalogo,
+    registrar_cambio_producto,
+    invalidar_producto,
+    invalidar_snapshot,
+)
 
 
 # ============================
-# ✅ Recalcular total_costo del Pedido
+# ✅ Resumen denormalizado de la Cotización
 # ============================
-def _recalcular_total_costo(ped: Pedido):
-    total = Decimal("0.00")
-    for d in ped.detalles.all():
-        total += (d.precio_proveedor or Decimal("0.00")) * (d.cantidad or 0)
+def resumen_cotizacion_expr() -> dict:
+    """
+    Expresiones para Cotizacion.objects.filter(...).update(**resumen_cotizacion_expr()):
+    un solo UPDATE con subconsultas agregadas sobre detalle_cotizacion.
+    tipo_venta = el del primer detalle (menor pk), igual que detalles.first().
+    """
+    detalles = DetalleCotizacion.objects.filter(cotizacion=OuterRef("pk")).order_by()
+    por_cot = detalles.values("cotizacion")
+    dec = DecimalField(max_digits=14, decimal_places=2)
 
-    total = total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    def agregado(expr, output_field, cero):
+        sub = Subquery(por_cot.annotate(v=expr).values("v")[:1], output_field=output_field)
+        return Coalesce(sub, Value(cero), output_field=output_field)
 
-    # Solo guarda si cambió
-    if ped.total_costo != total:
-        ped.total_costo = total
-        ped.save(update_fields=["total_costo"])
+    return {
+        "tipo_venta": Coalesce(Subquery(detalles.order_by("pk").values("tipo_venta")[:1]), Value("")),
+        "lineas": agregado(Count("pk"), IntegerField(), 0),
+        "cantidad_total": agregado(Sum("cantidad"), IntegerField(), 0),
+        "total_precio_ie": agregado(Sum(F("precio_ie") * F("cantidad"), output_field=dec), dec, 0),
+        "total_roi_ie": agregado(Sum(F("roi_ie") * F("cantidad"), output_field=dec), dec, 0),
+    }
 
 
-@receiver([post_save, post_delete], sender=DetallePedido)
-def detalle_pedido_changed(sender, instance, **kwargs):
-    _recalcular_total_costo(instance.pedido)
+def recalcular_resumen_cotizacion(*cotizacion_ids):
+    Cotizacion.objects.filter(pk__in=cotizacion_ids).update(**resumen_cotizacion_expr())
 
 
 # ============================
-# ✅ Mantener cantidad_total de adopción
+# ✅ Totales de pedido / adopción
 # ============================
-@receiver([post_save, post_delete], sender=DetalleAdopcion)
-def detalle_adopcion_changed(sender, instance, **kwargs):
+def recalcular_total_costo(*pedido_ids):
+    """Pedido.total_costo = SUM(precio_proveedor * cantidad) de sus detalles, en un solo UPDATE."""
+    dec = DecimalField(max_digits=14, decimal_places=2)
+    suma = (
+        DetallePedido.objects.filter(pedido=OuterRef("pk")).order_by()
+        .values("pedido").annotate(s=Sum(F("precio_proveedor") * F("cantidad"), output_field=dec)).values("s")[:1]
+    )
+    Pedido.objects.filter(pk__in=pedido_ids).update(
+        total_costo=Coalesce(Subquery(suma, output_field=dec), Value(0), output_field=dec)
+    )
+
+
+def recalcular_cantidad_adopcion(*adopcion_ids):
+    """Adopcion.cantidad_total = SUM(cantidad_adoptada) de sus detalles, en un solo UPDATE."""
+    suma = (
+        DetalleAdopcion.objects.filter(adopcion=OuterRef("pk")).order_by()
+        .values("adopcion").annotate(s=Sum("cantidad_adoptada")).values("s")[:1]
+    )
+    Adopcion.objects.filter(pk__in=adopcion_ids).update(
+        cantidad_total=Coalesce(Subquery(suma, output_field=IntegerField()), Value(0))
+    )
+
+
+# ============================
+# ✅ Recálculo diferido de agregados (al commit, una vez por padre)
+# ============================
+# Los receivers de detalles solo anotan el id del padre; al hacer commit cada padre
+# tocado se recalcula una vez con un UPDATE agregado (200 líneas => 1 recálculo).
+# Fuera de transacción on_commit corre al instante, igual que antes.
+RECALCULOS = {
+    "cotizacion": recalcular_resumen_cotizacion,
+    "adopcion": recalcular_cantidad_adopcion,
+    "pedido": recalcular_total_costo,
+}
+
+_local = threading.local()
+
+
+class _LotePendiente:
+    """Ids tocados en un nivel de transacción (atomic / savepoint); un solo on_commit por lote."""
+
+    def __init__(self):
+        self.ids = {tipo: set() for tipo in RECALCULOS}
+        self.aplicado = False
+
+    def aplicar(self):
+        self.aplicado = True
+        for tipo, recalcular in RECALCULOS.items():
+            if self.ids[tipo]:
+                recalcular(*self.ids[tipo])
+
+
+def _lotes(alias) -> weakref.WeakValueDictionary:
     """
-    Mantiene cantidad_total en Adopcion actualizado según DetalleAdopcion.cantidad_adoptada
+    Mapa propio por conexión (las conexiones ya son por hilo): savepoint id -> lote.
+    La única referencia fuerte al lote es su callback on_commit: si el atomic / savepoint
+    hace rollback Django descarta el callback y la entrada desaparece del mapa con él.
     """
-    adop = instance.adopcion
-    total = adop.detalles.aggregate(s=Sum("cantidad_adoptada"))["s"] or 0
+    if not hasattr(_local, "lotes"):
+        _local.lotes = {}
+    return _local.lotes.setdefault(alias, weakref.WeakValueDictionary())
+
+
+def marcar_para_recalculo(tipo: str, pk):
+    if pk is None or getattr(_local, "suspendido", 0):
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        # fuera de transacción: al instante, como haría on_commit
+        RECALCULOS[tipo](pk)
+        return
+
+    # savepoint más interno (None = nivel exterior de la transacción)
+    sid = next((s for s in reversed(connection.savepoint_ids) if s), None)
+    lotes = _lotes(connection.alias)
+    lote = lotes.get(sid)
+    if lote is None or lote.aplicado:
+        lote = lotes[sid] = _LotePendiente()
+        transaction.on_commit(lote.aplicar, using=connection.alias)
+    lote.ids[tipo].add(pk)
+
+
+@contextmanager
+def recalculo_suspendido():
+    """
+    Apaga el recálculo automático (cargas masivas, borrados en lote). Lo que se escriba
+    dentro no queda marcado: quien lo usa llama a recalcular_*() una vez al terminar.
+    """
+    _local.suspendido = getattr(_local, "suspendido", 0) + 1
+    try:
+        yield
+    finally:
+        _local.suspendido -= 1
+
+
+@receiver([post_save, post_delete], sender=DetalleCotizacion)
+def detalle_cotizacion_changed(sender, instance, **kwargs):
+    marcar_para_recalculo("cotizacion", instance.cotizacion_id)
+
+
+@receiver([post_save, post_delete], sender=DetalleAdopcion)
+def detalle_adopcion_changed(sender, instance, **kwargs):
+    marcar_para_recalculo("adopcion", instance.adopcion_id)
+
+
+@receiver([post_save, post_delete], sender=DetallePedido)
+def detalle_pedido_changed(sender, instance, **kwargs):
+    marcar_para_recalculo("pedido", instance.pedido_id)
+
+
+# ============================
+# ✅ Invalidar snapshot de precios / versión de catálogo
+# ============================
+def _valores_producto(instance) -> dict:
+    # solo lo ya cargado (__dict__): un campo diferido no dispara una consulta
+    return {
+        f.attname: f.to_python(instance.__dict__[f.attname])
+        for f in Producto._meta.concrete_fields
+        if not f.primary_key and f.attname in instance.__dict__
+    }
+
+
+@receiver(post_init, sender=Producto)
+def producto_cargado(sender, instance, **kwargs):
+    instance._valores_catalogo = _valores_producto(instance)
+
+
+@receiver(post_save, sender=Producto)
+def producto_changed(sender, instance, created=False, **kwargs):
+    valores = _valores_producto(instance)
+    # guardado sin cambios (p.ej. reimportar el Excel con update_or_create): no toca la
+    # versión ni el log, así el delta / ETags / snapshot solo ven lo que cambió de verdad
+    if not created and valores == getattr(instance, "_valores_catalogo", None):
+        return
+    instance._valores_catalogo = valores
+    invalidar_producto(instance.pk)
+    # sube la versión del catálogo y deja la entrada en el log de cambios
+    registrar_cambio_producto(instance.pk)
+
+
+@receiver(post_delete, sender=Producto)
+def producto_borrado(sender, instance, **kwargs):
+    invalidar_producto(instance.pk)
+    registrar_cambio_producto(instance.pk)
+
 
-    if adop.cantidad_total != total:
-        adop.cantidad_total = total
-        adop.save(update_fields=["cantidad_total"])
+@receiver([post_save, post_delete], sender=Editorial)
+def editorial_changed(sender, instance, **kwargs):
+    invalidar_snapshot()
+    incrementar_version_catalogo()
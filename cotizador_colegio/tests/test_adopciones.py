@@ -0,0 +1,60 @@
+# cotizador_colegio/tests/test_adopciones.py
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from cotizador_colegio.models import Adopcion, Cotizacion, EstadoCotizacion, InstitucionEducativa
+from cotizador_colegio.tests.test_api_v2 import crear_productos
+from cotizador_colegio.tests.test_signals import detalle
+
+
+# ============================
+# ✅ CrearAdopcionView: items inválidos => 400 con el item
+# ============================
+class CrearAdopcionTests(TestCase):
+    url = "/api/adopciones/crear/"
+
+    @classmethod
+    def setUpTestData(cls):
+        productos = crear_productos(2)
+        cls.cot = Cotizacion.objects.create(institucion=InstitucionEducativa.objects.create(nombre="IE Test"))
+        cls.detalles = [detalle(cls.cot, p) for p in productos]
+        for d in cls.detalles:
+            d.save()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def adoptar(self, items):
+        return self.client.post(self.url, {"cotizacion_id": self.cot.id, "items": items}, format="json")
+
+    def test_detalle_id_faltante_o_mal_formado(self):
+        r = self.adoptar([
+            {"detalle_id": self.detalles[0].id, "cantidad": 5},
+            {"cantidad": 3},
+            {"detalle_id": "abc", "cantidad": 2},
+            {"detalle_id": [1], "cantidad": 1},
+            "basura",
+            {"detalle_id": self.detalles[1].id, "cantidad": "x"},
+        ])
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(
+            [(e["index"], e["detail"]) for e in r.data["errores"]],
+            [
+                (1, "detalle_id inválido."),
+                (2, "detalle_id inválido."),
+                (3, "detalle_id inválido."),
+                (4, "Item inválido."),
+                (5, "cantidad inválida."),
+            ],
+        )
+        self.assertFalse(Adopcion.objects.filter(cotizacion=self.cot).exists())
+
+    def test_items_no_lista(self):
+        self.assertEqual(self.adoptar({"detalle_id": 1}).status_code, 400)
+
+    def test_cantidad_cero_sin_detalle_se_ignora(self):
+        r = self.adoptar([{"detalle_id": self.detalles[0].id, "cantidad": 4}, {"cantidad": 0}])
+        self.assertEqual(r.status_code, 201, r.data)
+        self.assertEqual(Adopcion.objects.get(cotizacion=self.cot).cantidad_total, 4)
+        self.cot.refresh_from_db()
+        self.assertEqual(self.cot.estado, EstadoCotizacion.ADOPTADA)
@@ -0,0 +1,149 @@
+# cotizador_colegio/tests/test_api_v2.py
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from cotizador_colegio.catalogo import invalidar_snapshot
+from cotizador_colegio.models import Editorial, Producto
+
+
+def crear_productos(n, editorial=None):
+    editorial = editorial or Editorial.objects.create(nombre="Editorial Test")
+    return Producto.objects.bulk_create([
+        Producto(
+            editorial=editorial,
+            codigo=f"COD{i:04d}",
+            nombre=f"Libro {i}",
+            nivel="PRIMARIA",
+            grado="1",
+            area="MATEMÁTICA",
+            pvp_2026=Decimal("100.00") + i,
+            descuento_proveedor=Decimal("0.36"),
+            precio_proveedor=Decimal("64.00"),
+        )
+        for i in range(n)
+    ])
+
+
+# ============================
+# ✅ Calcular batch: consultas constantes
+# ============================
+class CalcularBatchConsultasTests(TestCase):
+    url = "/api/v2/cotizaciones/calcular-batch/"
+    # versión del catálogo + carga de precios de los productos que no están en el snapshot
+    CONSULTAS = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.productos = crear_productos(300)
+
+    def setUp(self):
+        self.client = APIClient()
+        invalidar_snapshot()
+
+    def post(self, items):
+        return self.client.post(self.url, {"tipo_venta": "FERIA", "items": items}, format="json")
+
+    def items(self, n):
+        return [{"producto_id": p.id, "cantidad": 2} for p in self.productos[:n]]
+
+    def test_mismas_consultas_con_10_y_300_items(self):
+        for n in (10, 300):
+            invalidar_snapshot()
+            with self.assertNumQueries(self.CONSULTAS):
+                r = self.post(self.items(n))
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(len(r.json()["items"]), n)
+            self.assertEqual(r.json()["errores"], [])
+
+    def test_snapshot_caliente_solo_consulta_la_version(self):
+        self.post(self.items(300))
+        with self.assertNumQueries(1):
+            r = self.post(self.items(300))
+        self.assertEqual(len(r.json()["items"]), 300)
+
+    def test_productos_inexistentes_van_a_errores_sin_consultas_extra(self):
+        ultimo = self.productos[-1].id
+        items = self.items(10) + [
+            {"producto_id": ultimo + 1000, "cantidad": 1},
+            {"producto_id": ultimo + 2000, "cantidad": 1},
+            {"producto_id": "abc"},
+            "basura",
+        ]
+        with self.assertNumQueries(self.CONSULTAS):
+            r = self.post(items)
+        self.assertEqual(r.status_code, 200)
+        data = r.json()
+        self.assertEqual(len(data["items"]), 10)
+        self.assertEqual(
+            [(e["index"], e["detail"]) for e in data["errores"]],
+            [
+                (10, "Producto no existe."),
+                (11, "Producto no existe."),
+                (12, "producto_id inválido."),
+                (13, "Item inválido."),
+            ],
+        )
+
+
+# ============================
+# ✅ Escenarios (what-if)
+# ============================
+class EscenariosTests(TestCase):
+    url = "/api/v2/cotizaciones/escenarios/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.productos = crear_productos(2)
+
+    def test_items_que_no_son_objetos_devuelven_400(self):
+        for items in ([1], ["x"], [{"producto_id": self.productos[0].id}, None]):
+            r = self.client.post(self.url, {"tipo_venta": "FERIA", "items": items}, format="json")
+            self.assertEqual(r.status_code, 400, items)
+            self.assertEqual(r.json()["detail"], "Cada item debe ser un objeto.")
+
+    def test_barrido_valido(self):
+        items = [{"producto_id": p.id, "cantidad": 2} for p in self.productos]
+        r = self.client.post(
+            self.url,
+            {"tipo_venta": "FERIA", "items": items, "rangos": {"descuento_ie": [10, 20]}},
+            format="json",
+        )
+        self.assertEqual(r.status_code, 200)
+
+
+# ============================
+# ✅ Objetivo (goal-seek)
+# ============================
+class ObjetivoTests(TestCase):
+    url = "/api/v2/cotizaciones/objetivo/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.productos = crear_productos(2)
+        self.items = [{"producto_id": p.id, "cantidad": 1} for p in self.productos]
+
+    def post(self, **data):
+        return self.client.post(self.url, {"tipo_venta": "FERIA", "objetivo": "roi", **data}, format="json")
+
+    def test_items_que_no_son_objetos_devuelven_400(self):
+        for items in ([1], ["x"]):
+            r = self.post(items=items, valor=20)
+            self.assertEqual(r.status_code, 400, items)
+            self.assertEqual(r.json()["detail"], "Cada item debe ser un objeto.")
+
+    def test_valor_faltante_o_no_numerico_devuelve_400(self):
+        for valor in (None, "", "abc", "NaN", "Infinity", True, [1], {"a": 1}):
+            r = self.post(items=self.items, valor=valor)
+            self.assertEqual(r.status_code, 400, valor)
+
+    def test_valor_objetivo_por_item_no_numerico_devuelve_400(self):
+        items = [dict(self.items[0], valor_objetivo="x"), self.items[1]]
+        r = self.post(items=items, valor=20, modo="linea")
+        self.assertEqual(r.status_code, 400)
+
+    def test_objetivo_valido(self):
+        for valor in (20, "25.5", "30"):
+            r = self.post(items=self.items, valor=valor)
+            self.assertEqual(r.status_code, 200, valor)
@@ -0,0 +1,124 @@
+# cotizador_colegio/tests/test_catalogo.py
+import gzip
+import json
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from cotizador_colegio import catalogo
+from cotizador_colegio.catalogo import abrir_snapshot, cambios_desde, ruta_snapshot, version_catalogo
+from cotizador_colegio.models import CambioProducto, Editorial, Producto
+
+
+# ============================
+# ✅ Log de cambios: guardados sin cambios no suben la versión
+# ============================
+class CambiosProductoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.editorial = Editorial.objects.create(nombre="Editorial Test")
+        cls.producto = Producto.objects.create(
+            editorial=cls.editorial, codigo="COD1", nombre="Libro 1", nivel="PRIMARIA",
+            pvp_2026=Decimal("45.99"), descuento_proveedor=Decimal("0.36"), precio_proveedor=Decimal("29.43"),
+        )
+
+    def defaults(self, **extra):
+        # como los manda importar_productos_excel (pandas => float)
+        valores = dict(
+            nombre="Libro 1", nivel="PRIMARIA", grado="", area="",
+            pvp_2026=45.99, descuento_proveedor=0.36, precio_proveedor=29.43, estado=True,
+        )
+        return {**valores, **extra}
+
+    def test_guardado_sin_cambios_no_registra(self):
+        version = version_catalogo()
+        Producto.objects.get(pk=self.producto.pk).save()
+        Producto.objects.update_or_create(editorial=self.editorial, codigo="COD1", defaults=self.defaults())
+        self.assertEqual(version_catalogo(), version)
+        self.assertEqual(cambios_desde(version)["productos"].count(), 0)
+
+    def test_cambio_real_registra_una_vez(self):
+        version = version_catalogo()
+        p, _ = Producto.objects.update_or_create(
+            editorial=self.editorial, codigo="COD1", defaults=self.defaults(pvp_2026=49.90)
+        )
+        self.assertEqual(version_catalogo(), version + 1)
+        self.assertTrue(CambioProducto.objects.filter(version=version + 1, producto_id=p.pk).exists())
+        # la misma instancia guardada otra vez sin tocar nada
+        p.save()
+        self.assertEqual(version_catalogo(), version + 1)
+
+    def test_alta_baja_y_campos_diferidos(self):
+        version = version_catalogo()
+        nuevo = Producto.objects.create(
+            editorial=self.editorial, codigo="COD2", nombre="Libro 2",
+            pvp_2026=10, descuento_proveedor=0, precio_proveedor=10,
+        )
+        self.assertEqual(version_catalogo(), version + 1)
+
+        parcial = Producto.objects.only("id", "estado").get(pk=nuevo.pk)
+        parcial.save(update_fields=["estado"])
+        self.assertEqual(version_catalogo(), version + 1)
+        parcial.estado = False
+        parcial.save(update_fields=["estado"])
+        self.assertEqual(version_catalogo(), version + 2)
+
+        parcial.delete()
+        self.assertEqual(version_catalogo(), version + 3)
+
+
+# ============================
+# ✅ Snapshot en disco: el archivo se abre antes de que otro proceso lo borre
+# ============================
+class SnapshotArchivoTests(TestCase):
+    url = "/api/productos/snapshot/"
+
+    @classmethod
+    def setUpTestData(cls):
+        editorial = Editorial.objects.create(nombre="Editorial Test")
+        Producto.objects.create(
+            editorial=editorial, codigo="COD1", nombre="Libro 1",
+            pvp_2026=Decimal("10.00"), descuento_proveedor=Decimal("0.36"), precio_proveedor=Decimal("6.40"),
+        )
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        ajuste = override_settings(CATALOGO_SNAPSHOT_DIR=Path(tmp.name))
+        ajuste.enable()
+        self.addCleanup(ajuste.disable)
+
+    def test_descriptor_sobrevive_al_borrado(self):
+        version, archivo = abrir_snapshot()
+        with archivo:
+            for viejo in Path(archivo.name).parent.glob("catalogo-v*.json.gz"):
+                viejo.unlink()
+            data = json.loads(gzip.decompress(archivo.read()))
+        self.assertEqual(data["version"], version)
+
+    def reintento(self):
+        real = ruta_snapshot()
+        borrado = (real[0], real[1].with_name("catalogo-v0-borrado.json.gz"))
+        return mock.patch.object(catalogo, "ruta_snapshot", side_effect=[borrado, real])
+
+    def test_reintenta_si_el_archivo_desaparece(self):
+        with self.reintento() as ruta:
+            version, archivo = abrir_snapshot()
+            archivo.close()
+        self.assertEqual(ruta.call_count, 2)
+        self.assertEqual(version, version_catalogo())
+
+    def test_vista_sin_500_cuando_el_archivo_desaparece(self):
+        client = APIClient()
+        for encoding in ("gzip", ""):
+            with self.reintento():
+                r = client.get(self.url, HTTP_ACCEPT_ENCODING=encoding)
+            self.assertEqual(r.status_code, 200, encoding)
+            cuerpo = b"".join(r.streaming_content) if r.streaming else r.content
+            if encoding:
+                cuerpo = gzip.decompress(cuerpo)
+            self.assertEqual(json.loads(cuerpo)["version"], version_catalogo())
@@ -0,0 +1,49 @@
+# cotizador_colegio/tests/test_idempotencia.py
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from cotizador_colegio.models import Cotizacion, InstitucionEducativa, SolicitudIdempotente
+from cotizador_colegio.tests.test_api_v2 import crear_productos
+
+
+# ============================
+# ✅ Idempotency-Key: replay byte a byte
+# ============================
+class ReplayIdempotenteTests(TestCase):
+    url = "/api/cotizaciones/guardar/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.productos = crear_productos(3)
+        cls.ie = InstitucionEducativa.objects.create(nombre="IE Test")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.cuerpo = {
+            "institucion_id": self.ie.id,
+            "tipo_venta": "FERIA",
+            "items": [{"producto_id": p.id, "cantidad": 2, "descuento_ie": "12.5"} for p in self.productos],
+        }
+
+    def post(self, clave, cuerpo=None):
+        return self.client.post(self.url, cuerpo or self.cuerpo, format="json", HTTP_IDEMPOTENCY_KEY=clave)
+
+    def test_replay_identico_byte_a_byte(self):
+        r1 = self.post("clave-1")
+        self.assertEqual(r1.status_code, 201, r1.content)
+        r2 = self.post("clave-1")
+        self.assertEqual(r2.status_code, 201)
+        self.assertEqual(r2["Idempotent-Replayed"], "true")
+        self.assertEqual(r2["Content-Type"], r1["Content-Type"])
+        self.assertEqual(r1.content, r2.content)
+        self.assertEqual(Cotizacion.objects.count(), 1)
+
+    def test_misma_clave_otro_cuerpo(self):
+        self.assertEqual(self.post("clave-2").status_code, 201)
+        r = self.post("clave-2", dict(self.cuerpo, tipo_venta="PV"))
+        self.assertEqual(r.status_code, 422)
+
+    def test_error_libera_la_clave(self):
+        r = self.post("clave-3", dict(self.cuerpo, items=[]))
+        self.assertEqual(r.status_code, 400)
+        self.assertFalse(SolicitudIdempotente.objects.filter(clave="clave-3").exists())
@@ -0,0 +1,148 @@
+# cotizador_colegio/tests/test_paginacion.py
+import base64
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import FloatField, Value
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from cotizador_colegio.models import Cotizacion, InstitucionEducativa, Producto
+from cotizador_colegio.paginacion import CatalogoOpcionalPagination, KeysetPagination, StandardPagination
+from cotizador_colegio.tests.test_api_v2 import crear_productos
+
+
+# ============================
+# ✅ Cursor por fecha: microsegundos
+# ============================
+class CursorFechaTests(TestCase):
+    url = "/api/cotizaciones/listar/"
+    FILAS = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        ie = InstitucionEducativa.objects.create(nombre="IE Test")
+        base = timezone.now().replace(microsecond=123000)
+        cls.ids = []
+        # todas dentro del mismo milisegundo, separadas por pocos microsegundos
+        for i in range(cls.FILAS):
+            cot = Cotizacion.objects.create(institucion=ie)
+            Cotizacion.objects.filter(pk=cot.pk).update(fecha=base + timedelta(microseconds=3 * i))
+            cls.ids.append(cot.pk)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def recorrer(self, ordering):
+        vistos = []
+        url = f"{self.url}?paginacion=cursor&page_size=1&ordering={ordering}"
+        while url:
+            r = self.client.get(url)
+            self.assertEqual(r.status_code, 200, r.data)
+            vistos += [fila["id"] for fila in r.data["results"]]
+            self.assertLessEqual(len(vistos), self.FILAS, f"el cursor se repite: {vistos}")
+            url = r.data["next"]
+        return vistos
+
+    def test_ascendente_recorre_todas_una_vez(self):
+        self.assertEqual(self.recorrer("fecha"), self.ids)
+
+    def test_descendente_no_salta_filas(self):
+        self.assertEqual(self.recorrer("-fecha"), self.ids[::-1])
+
+    def test_cursor_con_valor_desconocido(self):
+        raw = json.dumps({"v": [{"x": 1}, 1], "r": 0}).encode("utf-8")
+        cursor = base64.urlsafe_b64encode(raw).decode("ascii")
+        r = self.client.get(f"{self.url}?cursor={cursor}&ordering=fecha")
+        self.assertEqual(r.status_code, 404)
+
+
+# ============================
+# ✅ Cursor sobre campos nullable (NULLS LAST en ASC, NULLS FIRST en DESC)
+# ============================
+class CursorNullableTests(TestCase):
+    url = "/api/colegios/listar/"
+
+    @classmethod
+    def setUpTestData(cls):
+        distritos = ["Lince", None, "Breña", None, "Surco"]
+        cls.colegios = [
+            InstitucionEducativa.objects.create(nombre=f"IE {i}", distrito=d) for i, d in enumerate(distritos)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def recorrer(self, ordering, page_size):
+        vistos = []
+        url = f"{self.url}?paginacion=cursor&page_size={page_size}&ordering={ordering}"
+        while url:
+            r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            vistos += [fila["id"] for fila in r.data["results"]]
+            self.assertLessEqual(len(vistos), len(self.colegios))
+            url = r.data["next"]
+        return vistos
+
+    def esperado(self, desc):
+        con = sorted((c for c in self.colegios if c.distrito), key=lambda c: (c.distrito, c.id), reverse=desc)
+        nulos = sorted((c for c in self.colegios if not c.distrito), key=lambda c: c.id, reverse=desc)
+        return [c.id for c in (nulos + con if desc else con + nulos)]
+
+    def test_ascendente_incluye_nulls_al_final(self):
+        for page_size in (1, 2):
+            self.assertEqual(self.recorrer("distrito", page_size), self.esperado(False))
+
+    def test_descendente_pasa_de_nulls_a_valores(self):
+        for page_size in (1, 2):
+            self.assertEqual(self.recorrer("-distrito", page_size), self.esperado(True))
+
+    def test_pagina_anterior_desde_nulls(self):
+        r = self.client.get(f"{self.url}?paginacion=cursor&page_size=4&ordering=distrito")
+        r = self.client.get(r.data["next"])
+        r = self.client.get(r.data["previous"])
+        self.assertEqual([f["id"] for f in r.data["results"]], self.esperado(False)[:4])
+
+
+# ============================
+# ✅ Cursor de catálogo: límite de índice en la primera columna
+# ============================
+class CursorCatalogoTests(TestCase):
+    url = "/api/productos/listar/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.productos = crear_productos(7)
+
+    def test_seek_con_limite_en_nombre(self):
+        client = APIClient()
+        r = client.get(f"{self.url}?paginacion=cursor&page_size=3")
+        vistos = [f["id"] for f in r.data["results"]]
+        with CaptureQueriesContext(connection) as ctx:
+            r = client.get(r.data["next"])
+        vistos += [f["id"] for f in r.data["results"]]
+        sql = next(q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "productos"'))
+        self.assertIn('"productos"."nombre" >=', sql)
+        r = client.get(r.data["next"])
+        vistos += [f["id"] for f in r.data["results"]]
+        self.assertEqual(vistos, [p.id for p in sorted(self.productos, key=lambda p: (p.nombre, p.id))])
+
+    def test_busqueda_por_relevancia_no_usa_cursor(self):
+        qs = Producto.objects.annotate(rank=Value(1.0, output_field=FloatField())).order_by("-rank", "-id")
+        factory = APIRequestFactory()
+
+        paginator = CatalogoOpcionalPagination()
+        page = paginator.paginate_queryset(qs, Request(factory.get("/", {"paginacion": "cursor"})))
+        self.assertIsInstance(paginator.paginador, StandardPagination)
+        self.assertEqual([p.id for p in page], sorted((p.id for p in self.productos), reverse=True))
+
+        # sin parámetros de paginación sigue devolviendo la lista completa
+        self.assertIsNone(CatalogoOpcionalPagination().paginate_queryset(qs, Request(factory.get("/"))))
+
+        paginator = CatalogoOpcionalPagination()
+        paginator.paginate_queryset(Producto.objects.all(), Request(factory.get("/", {"paginacion": "cursor"})))
+        self.assertIsInstance(paginator.paginador, KeysetPagination)
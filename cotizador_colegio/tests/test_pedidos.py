@@ -0,0 +1,104 @@
+# cotizador_colegio/tests/test_pedidos.py
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from cotizador_colegio.consolidacion import consolidar_pedidos
+from cotizador_colegio.models import (
+    Adopcion,
+    Cotizacion,
+    DetalleAdopcion,
+    EstadoPedido,
+    InstitucionEducativa,
+    OrdenCompra,
+    Pedido,
+    Producto,
+)
+from cotizador_colegio.pedidos_lote import generar_pedidos
+from cotizador_colegio.tests.test_api_v2 import crear_productos
+
+
+# ============================
+# ✅ CrearPedidoView: solo regenera BORRADOR / EMITIDO
+# ============================
+class CrearPedidoTests(TestCase):
+    url = "/api/pedidos/crear/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.productos = crear_productos(2)
+        cot = Cotizacion.objects.create(institucion=InstitucionEducativa.objects.create(nombre="IE Test"))
+        cls.adopcion = Adopcion.objects.create(cotizacion=cot)
+        DetalleAdopcion.objects.bulk_create(
+            [DetalleAdopcion(adopcion=cls.adopcion, producto=p, cantidad_adoptada=10) for p in cls.productos]
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def crear(self):
+        return self.client.post(self.url, {"adopcion_id": self.adopcion.id}, format="json")
+
+    def test_crea_pedido(self):
+        r = self.crear()
+        self.assertEqual(r.status_code, 201, r.data)
+        pedido = Pedido.objects.get(adopcion=self.adopcion)
+        self.assertEqual(pedido.estado, EstadoPedido.BORRADOR)
+        self.assertEqual(pedido.detalles.count(), 2)
+
+    def test_regenera_borrador_y_emitido(self):
+        self.assertEqual(self.crear().status_code, 201)
+        for estado in (EstadoPedido.BORRADOR, EstadoPedido.EMITIDO):
+            Pedido.objects.filter(adopcion=self.adopcion).update(estado=estado)
+            r = self.crear()
+            self.assertEqual(r.status_code, 201, (estado, r.data))
+            self.assertEqual(Pedido.objects.get(adopcion=self.adopcion).estado, EstadoPedido.BORRADOR)
+
+    def test_pedido_consolidado_o_cerrado_da_409(self):
+        self.assertEqual(self.crear().status_code, 201)
+        pedido = Pedido.objects.get(adopcion=self.adopcion)
+        detalles = list(pedido.detalles.values_list("id", flat=True))
+        for estado in (EstadoPedido.ENVIADO, EstadoPedido.CONFIRMADO, EstadoPedido.CANCELADO):
+            Pedido.objects.filter(pk=pedido.pk).update(estado=estado)
+            r = self.crear()
+            self.assertEqual(r.status_code, 409, estado)
+            self.assertEqual((r.data["pedido"], r.data["estado"]), (pedido.id, estado))
+            self.assertEqual(list(pedido.detalles.values_list("id", flat=True)), detalles)
+            self.assertEqual(Pedido.objects.get(pk=pedido.pk).estado, estado)
+
+
+# ============================
+# ✅ Consolidación: precios guardados en los pedidos, no los del catálogo actual
+# ============================
+class ConsolidacionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.productos = crear_productos(2)
+        ie = InstitucionEducativa.objects.create(nombre="IE Test")
+        adopciones = []
+        for cantidad in (10, 3):
+            adopcion = Adopcion.objects.create(cotizacion=Cotizacion.objects.create(institucion=ie))
+            DetalleAdopcion.objects.bulk_create(
+                [DetalleAdopcion(adopcion=adopcion, producto=p, cantidad_adoptada=cantidad) for p in cls.productos]
+            )
+            adopciones.append(adopcion.id)
+        generar_pedidos(Adopcion.objects.filter(id__in=adopciones))
+        Pedido.objects.update(estado=EstadoPedido.EMITIDO)
+
+    def test_total_de_la_orden_cuadra_con_los_pedidos(self):
+        # el catálogo cambia después de generar los pedidos
+        Producto.objects.filter(pk=self.productos[0].pk).update(precio_proveedor=Decimal("99.99"))
+        esperado = Pedido.objects.aggregate(t=Sum("total_costo"))["t"]
+
+        ordenes = consolidar_pedidos()
+        self.assertEqual(len(ordenes), 1)
+        self.assertEqual(ordenes[0]["total_costo"], esperado)
+        self.assertEqual(ordenes[0]["total_costo"], Decimal("64.00") * 26)
+
+        orden = OrdenCompra.objects.get(pk=ordenes[0]["id"])
+        self.assertEqual(orden.total_costo, esperado)
+        lineas = list(orden.detalles.order_by("producto_id").values_list("cantidad", "precio_proveedor", "subtotal"))
+        self.assertEqual(lineas, [(13, Decimal("64.00"), Decimal("832.00"))] * 2)
+        self.assertFalse(Pedido.objects.exclude(estado=EstadoPedido.ENVIADO).exists())
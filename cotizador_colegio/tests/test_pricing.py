@@ -0,0 +1,201 @@
+# cotizador_colegio/tests/test_pricing.py
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from cotizador_colegio.pricing import (
+    BACKEND_CENTAVOS,
+    BACKEND_DECIMAL,
+    calcular_batch,
+    calcular_columnas,
+    calcular_item,
+    normalize_percent,
+    precompilar_producto,
+    _centavos,
+    _dec,
+    _desc_proveedor_bp,
+)
+from cotizador_colegio.utils import nz_decimal
+
+
+def producto(pvp="100.00", desc="0.36", pid=1):
+    return SimpleNamespace(id=pid, pvp_2026=pvp, descuento_proveedor=desc)
+
+
+# ============================
+# ✅ calcular_batch / calcular_columnas == calcular_item
+# ============================
+class CalcularBatchParidadTests(SimpleTestCase):
+    TIPOS = ["PV", "PUNTO_DE_VENTA", "FERIA", "CONSIGNA"]
+
+    DESCUENTOS_PROVEEDOR = [
+        Decimal("36"), Decimal("0.36"), "36%", " 40 % ", 40, 0.25, "0.4",
+        None, "", "abc", Decimal("-5"), "-0.10", 150, "1", 1,
+    ]
+
+    ITEMS = [
+        {},
+        {"precio_be": "89.90"},
+        {"precio_be": 0},
+        {"precio_be": None},
+        {"precio_be": "basura"},
+        {"precio_be": "-12.50"},
+        {"precio_be": "10.005", "descuento_ie": "12.5"},
+        {"descuento_ie": 0, "precio_ppff": "120", "comi_coo": "3.335"},
+        {"descuento_ie": None, "precio_ppff": "x", "comi_coo": -1},
+        {"descuento_ie": 100, "comi_coo": "500"},
+        {"desc_consigna": "30", "comision": "2.50"},
+        {"desc_consigna": "12.345", "comision": None, "precio_be": 33.33},
+        {"desc_consigna": -3, "comision": "abc"},
+    ]
+
+    PVPS = ["100.00", Decimal("45.99"), 10.01, "0.01", 0, None]
+
+    def assertFilaIgual(self, esperado, obtenido, contexto):
+        self.assertEqual(list(esperado), list(obtenido), contexto)
+        for campo, valor in esperado.items():
+            self.assertEqual(valor, obtenido[campo], f"{campo} {contexto}")
+
+    def casos(self):
+        pid = 0
+        for pvp in self.PVPS:
+            for desc in self.DESCUENTOS_PROVEEDOR:
+                pid += 1
+                yield producto(pvp, desc, pid)
+
+    def test_batch_igual_a_calcular_item(self):
+        productos = list(self.casos())
+        for tipo in self.TIPOS:
+            for item in self.ITEMS:
+                items = [item] * len(productos)
+                batch = calcular_batch(tipo, items, productos)
+                for p, fila in zip(productos, batch):
+                    esperado = calcular_item(tipo, p, item)
+                    self.assertFilaIgual(esperado, fila, (tipo, p, item))
+
+    def test_batch_con_productos_precompilados(self):
+        productos = list(self.casos())
+        compilados = [precompilar_producto(p) for p in productos]
+        for tipo in self.TIPOS:
+            for item in self.ITEMS:
+                items = [item] * len(productos)
+                self.assertEqual(
+                    calcular_batch(tipo, items, productos),
+                    calcular_batch(tipo, items, compilados),
+                )
+
+    def test_columnas_en_centavos(self):
+        productos = list(self.casos())
+        for tipo in self.TIPOS:
+            items = [self.ITEMS[i % len(self.ITEMS)] for i in range(len(productos))]
+            cols = calcular_columnas(tipo, items, productos)
+            for i, (p, item) in enumerate(zip(productos, items)):
+                esperado = calcular_item(tipo, p, item)
+                for campo, valor in esperado.items():
+                    if campo in ("producto_id", "tipo_venta"):
+                        self.assertEqual(valor, cols[campo] if campo == "tipo_venta" else cols[campo][i])
+                        continue
+                    self.assertIsInstance(cols[campo][i], int)
+                    self.assertEqual(valor, _dec(cols[campo][i]), f"{campo} {tipo} {p} {item}")
+
+    def test_precio_be_propio_recalcula_precio_proveedor(self):
+        p = producto("100.00", "36%")
+        fila = calcular_batch("FERIA", [{"precio_be": "50.00"}], [p])[0]
+        self.assertEqual(fila["precio_be"], Decimal("50.00"))
+        self.assertEqual(fila["precio_proveedor"], Decimal("32.00"))
+
+    def test_descuento_proveedor_porcentaje_fraccion_y_texto(self):
+        for desc in (36, Decimal("0.36"), "36%"):
+            fila = calcular_batch("PV", [{}], [producto("100.00", desc)])[0]
+            self.assertEqual(fila["desc_proveedor"], Decimal("0.36"), desc)
+            self.assertEqual(fila["precio_proveedor"], Decimal("64.00"), desc)
+
+    def test_lote_vacio(self):
+        self.assertEqual(calcular_batch("FERIA", [], []), [])
+
+    def test_tipo_venta_invalido(self):
+        with self.assertRaises(ValueError):
+            calcular_batch("OTRO", [{}], [producto()])
+
+
+# ============================
+# ✅ Backend centavos == backend Decimal (propiedades, muestras aleatorias con semilla)
+# ============================
+# empates HALF_UP exactos en el tercer decimal
+EMPATES = ["0.005", "2.675", "1.115", "10.005", "99.995", "0.015", 2.675, 1.005]
+
+
+def valor_aleatorio(rnd: random.Random):
+    """Entrada "como viene del front": número, texto, porcentaje, basura, negativo..."""
+    tipo = rnd.randrange(9)
+    if tipo == 0:
+        return rnd.randint(-50, 500)
+    if tipo == 1:
+        return round(rnd.uniform(-50, 500), rnd.randint(0, 4))
+    if tipo == 2:
+        return f"{rnd.randint(0, 500)}.{rnd.randint(0, 9999):0{rnd.randint(1, 4)}d}"
+    if tipo == 3:
+        return Decimal(rnd.randint(-5000, 50000)).scaleb(-rnd.randint(0, 4))
+    if tipo == 4:
+        return f"{rnd.randint(0, 100)}%"
+    if tipo == 5:
+        return rnd.choice(EMPATES)
+    if tipo == 6:
+        return f"{rnd.randint(0, 99)}.{rnd.randint(0, 99):02d}5"
+    if tipo == 7:
+        return rnd.choice([None, "", "abc", " 12 ", "1e2", "-0.005", "NaN", "12.3.4"])
+    return f"-{rnd.randint(0, 99)}.{rnd.randint(0, 99)}"
+
+
+class BackendCentavosPropiedadesTests(SimpleTestCase):
+    SEMILLA = 20260
+    MUESTRAS = 3000
+
+    def setUp(self):
+        self.rnd = random.Random(self.SEMILLA)
+
+    def test_centavos_equivale_a_nz_decimal(self):
+        for v in EMPATES:
+            self.assertEqual(_dec(_centavos(v)), nz_decimal(v), repr(v))
+        for _ in range(self.MUESTRAS):
+            v = valor_aleatorio(self.rnd)
+            self.assertEqual(_dec(_centavos(v)), nz_decimal(v), repr(v))
+
+    def test_desc_proveedor_bp_equivale_a_normalize_percent(self):
+        for v in ["36%", "0.36", 36, 0.36, "100", 1, "1.005", "0.005%", None] + EMPATES:
+            self.assertEqual(Decimal(_desc_proveedor_bp(v)).scaleb(-4), normalize_percent(v), repr(v))
+        for _ in range(self.MUESTRAS):
+            v = valor_aleatorio(self.rnd)
+            self.assertEqual(Decimal(_desc_proveedor_bp(v)).scaleb(-4), normalize_percent(v), repr(v))
+
+    def test_calcular_item_mismo_resultado_en_ambos_backends(self):
+        campos = ["precio_be", "descuento_ie", "precio_ppff", "comi_coo", "desc_consigna", "comision"]
+        for i in range(self.MUESTRAS):
+            p = producto(valor_aleatorio(self.rnd), valor_aleatorio(self.rnd), i + 1)
+            item = {c: valor_aleatorio(self.rnd) for c in campos if self.rnd.random() < 0.7}
+            for tipo in ("PV", "FERIA", "CONSIGNA"):
+                esperado = calcular_item(tipo, p, item, backend=BACKEND_DECIMAL)
+                obtenido = calcular_item(tipo, p, item, backend=BACKEND_CENTAVOS)
+                self.assertEqual(esperado, obtenido, (tipo, p, item))
+
+    def test_empates_half_up_en_montos_intermedios(self):
+        casos = [
+            # pvp * desc_proveedor con medio centavo exacto
+            (producto("10.01", "25"), {}),
+            (producto("0.02", "25"), {}),
+            # descuento_ie que deja medio centavo
+            (producto("0.01", "0"), {"descuento_ie": 50}),
+            (producto("33.33", "0.36"), {"descuento_ie": "12.5"}),
+            # desc_consigna con medio centavo
+            (producto("0.10", "0"), {"desc_consigna": 5}),
+        ]
+        for p, item in casos:
+            for tipo in ("FERIA", "CONSIGNA"):
+                self.assertEqual(
+                    calcular_item(tipo, p, item, backend=BACKEND_DECIMAL),
+                    calcular_item(tipo, p, item, backend=BACKEND_CENTAVOS),
+                    (tipo, p, item),
+                )
+        self.assertEqual(calcular_item("FERIA", producto("10.01", "25"), {})["precio_proveedor"], Decimal("7.51"))
@@ -0,0 +1,115 @@
+# cotizador_colegio/tests/test_signals.py
+from decimal import Decimal
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from cotizador_colegio.models import Cotizacion, DetalleCotizacion, InstitucionEducativa
+from cotizador_colegio.tests.test_api_v2 import crear_productos
+
+
+def detalle(cot, producto, cantidad=1):
+    return DetalleCotizacion(
+        cotizacion=cot, producto=producto, cantidad=cantidad,
+        precio_be=Decimal("100.00"), desc_proveedor=Decimal("0.36"), precio_proveedor=Decimal("64.00"),
+        precio_ie=Decimal("80.00"), precio_ppff=Decimal("100.00"),
+        utilidad_ie=Decimal("20.00"), roi_ie=Decimal("16.00"), tipo_venta="FERIA",
+    )
+
+
+# ============================
+# ✅ Recálculo diferido: un on_commit por lote, nada sobrevive a un rollback
+# ============================
+class RecalculoDiferidoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.productos = crear_productos(3)
+        ie = InstitucionEducativa.objects.create(nombre="IE Test")
+        cls.cot_a = Cotizacion.objects.create(institucion=ie)
+        cls.cot_b = Cotizacion.objects.create(institucion=ie)
+
+    def lotes(self, callbacks):
+        return [cb.__self__.ids["cotizacion"] for cb in callbacks]
+
+    def test_un_callback_por_lote(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for p in self.productos:
+                detalle(self.cot_a, p, cantidad=2).save()
+            detalle(self.cot_b, self.productos[0]).save()
+        self.assertEqual(self.lotes(callbacks), [{self.cot_a.id, self.cot_b.id}])
+        self.cot_a.refresh_from_db()
+        self.assertEqual((self.cot_a.lineas, self.cot_a.cantidad_total), (3, 6))
+        self.assertEqual(self.cot_a.total_precio_ie, Decimal("480.00"))
+
+    def test_rollback_descarta_los_ids(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    detalle(self.cot_a, self.productos[0]).save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            detalle(self.cot_b, self.productos[1]).save()
+        self.assertEqual(self.lotes(callbacks), [{self.cot_b.id}])
+        self.cot_b.refresh_from_db()
+        self.assertEqual(self.cot_b.lineas, 1)
+
+    def test_rollback_de_savepoint_conserva_el_lote_exterior(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            detalle(self.cot_a, self.productos[0]).save()
+            try:
+                with transaction.atomic():
+                    detalle(self.cot_b, self.productos[0]).save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            detalle(self.cot_a, self.productos[1]).save()
+        self.assertEqual(self.lotes(callbacks), [{self.cot_a.id}])
+
+    def test_savepoint_confirmado_mantiene_su_lote(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            detalle(self.cot_a, self.productos[0]).save()
+            with transaction.atomic():
+                detalle(self.cot_b, self.productos[0]).save()
+                detalle(self.cot_b, self.productos[1]).save()
+            detalle(self.cot_a, self.productos[1]).save()
+        self.assertEqual(self.lotes(callbacks), [{self.cot_a.id}, {self.cot_b.id}])
+        self.assertEqual(
+            sorted(Cotizacion.objects.filter(pk__in=[self.cot_a.pk, self.cot_b.pk]).values_list("lineas", flat=True)),
+            [2, 2],
+        )
+
+    def test_lote_aplicado_no_recibe_mas_ids(self):
+        with self.captureOnCommitCallbacks(execute=True) as primero:
+            detalle(self.cot_a, self.productos[0]).save()
+        with self.captureOnCommitCallbacks() as segundo:
+            detalle(self.cot_b, self.productos[0]).save()
+        self.assertEqual(self.lotes(primero), [{self.cot_a.id}])
+        self.assertEqual(self.lotes(segundo), [{self.cot_b.id}])
+
+
+class RecalculoCommitRealTests(TransactionTestCase):
+    def setUp(self):
+        self.productos = crear_productos(2)
+        ie = InstitucionEducativa.objects.create(nombre="IE Test")
+        self.cot_a = Cotizacion.objects.create(institucion=ie)
+        self.cot_b = Cotizacion.objects.create(institucion=ie)
+
+    def test_rollback_exterior_no_afecta_la_siguiente_transaccion(self):
+        try:
+            with transaction.atomic():
+                detalle(self.cot_a, self.productos[0]).save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        with transaction.atomic():
+            for p in self.productos:
+                detalle(self.cot_b, p).save()
+        self.cot_a.refresh_from_db()
+        self.cot_b.refresh_from_db()
+        self.assertEqual((self.cot_a.lineas, self.cot_b.lineas), (0, 2))
+
+        # fuera de transacción se recalcula al instante
+        detalle(self.cot_a, self.productos[1]).save()
+        self.cot_a.refresh_from_db()
+        self.assertEqual(self.cot_a.lineas, 1)
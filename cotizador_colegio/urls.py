@@ -5,15 +5,19 @@ from .views import (
     # ✅ PRODUCTOS
     ListarProductosView,
     FiltrosProductosView,
+    SnapshotCatalogoView,
+    CambiosCatalogoView,
 
     # ✅ COTIZACIONES (V1)
     GuardarCotizacionView,
     ListarCotizacionesView,
     CambiarEstadoCotizacionView,
+    CambiarEstadoLoteView,
     CalcularDetalleView,
     DetalleCotizacionRetrieveView,
     PDFCotizacionView,
     CalcularBatchView,
+    CalcularBatchStreamView,
 
     # ✅ ADOPCIONES (V1)
     CrearAdopcionView,
@@ -23,6 +27,7 @@ from .views import (
     # ✅ PEDIDOS (V1)
     ListarPedidosView,
     CrearPedidoView,
+    GenerarPedidosView,
 
     # ✅ MAESTROS (V1)
     ListarAsesoresView,
@@ -41,6 +46,7 @@ from .api_v2 import (
     CotizacionViewSet,
     AdopcionViewSet,
     PedidoViewSet,
+    OrdenCompraViewSet,
 )
 
 router = DefaultRouter()
@@ -48,6 +54,7 @@ router.register(r"productos", ProductoViewSet, basename="v2-productos")
 router.register(r"cotizaciones", CotizacionViewSet, basename="v2-cotizaciones")
 router.register(r"adopciones", AdopcionViewSet, basename="v2-adopciones")
 router.register(r"pedidos", PedidoViewSet, basename="v2-pedidos")
+router.register(r"ordenes-compra", OrdenCompraViewSet, basename="v2-ordenes-compra")
 
 urlpatterns = [
     # =========================
@@ -55,6 +62,8 @@ urlpatterns = [
     # =========================
     path("productos/listar/", ListarProductosView.as_view(), name="listar_productos"),
     path("productos/filtros/", FiltrosProductosView.as_view(), name="productos_filtros"),
+    path("productos/snapshot/", SnapshotCatalogoView.as_view(), name="productos_snapshot"),
+    path("productos/cambios/", CambiosCatalogoView.as_view(), name="productos_cambios"),
 
     # =========================
     # COTIZACIONES (V1 - NO ROMPER)
@@ -63,9 +72,11 @@ urlpatterns = [
     path("cotizaciones/listar/", ListarCotizacionesView.as_view(), name="listar_cotizaciones"),
     path("cotizaciones/<int:pk>/", DetalleCotizacionRetrieveView.as_view(), name="detalle_cotizacion"),
     path("cotizaciones/<int:pk>/estado/", CambiarEstadoCotizacionView.as_view(), name="cambiar_estado_cotizacion"),
+    path("cotizaciones/estado/lote/", CambiarEstadoLoteView.as_view(), name="cambiar_estado_lote"),
     path("cotizaciones/calcular_detalle/", CalcularDetalleView.as_view(), name="calcular_detalle"),
     path("cotizaciones/<int:pk>/pdf/", PDFCotizacionView.as_view(), name="pdf_cotizacion"),
     path("cotizaciones/calcular_batch/", CalcularBatchView.as_view()),
+    path("cotizaciones/calcular_batch/stream/", CalcularBatchStreamView.as_view(), name="calcular_batch_stream"),
 
 
     # =========================
@@ -80,6 +91,7 @@ urlpatterns = [
     # =========================
     path("pedidos/listar/", ListarPedidosView.as_view(), name="listar_pedidos"),
     path("pedidos/crear/", CrearPedidoView.as_view(), name="crear_pedido"),
+    path("pedidos/generar/", GenerarPedidosView.as_view(), name="generar_pedidos"),
 
     # =========================
     # REPORTES EXCEL (V1)
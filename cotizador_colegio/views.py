@@ -1,10 +1,15 @@
+import gzip
+import json
 from decimal import Decimal
+from itertools import islice
 from django.db import transaction
-from django.db.models import Q
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 
 from .models import (
     Editorial,
@@ -14,40 +19,50 @@ from .models import (
     Adopcion,
     DetalleAdopcion,
     Pedido,
-    DetallePedido,
     EstadoCotizacion,
-    EstadoPedido,
     InstitucionEducativa,
     AsesorComercial,
 )
 
 from .serializers import (
-    ProductoSerializer,
     CotizacionSerializer,
-    CotizacionListSerializer,
-    AdopcionSerializer,
-    PedidoSerializer,
     InstitucionEducativaSerializer,
     AsesorComercialSerializer,
 )
 
-from .pricing import calcular_item
+from .serializers_rapidos import (
+    ProductoRapidoSerializer,
+    CotizacionListRapidoSerializer,
+    AdopcionRapidoSerializer,
+    AdopcionResumenRapidoSerializer,
+    PedidoRapidoSerializer,
+    PedidoResumenRapidoSerializer,
+)
+from .filters import CotizacionFilter, AdopcionFilter, PedidoFilter, AsesorFilter, ColegioFilter
+
+from .pricing import calcular_item, calcular_batch, validar_tipo_venta, validar_backend, validar_item
+from .signals import recalcular_resumen_cotizacion, recalcular_cantidad_adopcion, recalculo_suspendido
+from .catalogo import (
+    precios_productos,
+    facetas_productos,
+    catalogo_condicional,
+    etag_snapshot,
+    abrir_snapshot,
+    cambios_desde,
+)
+from .busqueda import buscar_productos
+from .idempotencia import idempotente
+from .estados import normalizar_cambios, transicionar_cotizaciones
+from .pedidos_lote import generar_pedidos
+from .paginacion import CatalogoPagination, PanelPagination, orden_solicitado
 from .services_pdf import generar_pdf_cotizacion, generar_pdf_adopcion
 
 
-# =========================================================
-# PAGINACION
-# =========================================================
-class StandardPagination(PageNumberPagination):
-    page_size = 30
-    page_size_query_param = "page_size"
-    max_page_size = 200
-
-
 # =========================================================
 # PRODUCTOS (V1)
 # =========================================================
 class ListarProductosView(APIView):
+    @method_decorator(catalogo_condicional)
     def get(self, request):
         qs = Producto.objects.select_related("editorial").filter(estado=True).order_by("id")
 
@@ -58,11 +73,8 @@ class ListarProductosView(APIView):
         grado = request.query_params.get("grado")
 
         if search:
-            qs = qs.filter(
-                Q(nombre__icontains=search)
-                | Q(codigo__icontains=search)
-                | Q(editorial__nombre__icontains=search)
-            )
+            # ranked (pg_trgm / full-text) por defecto; ?search_mode=contains para el modo anterior
+            qs = buscar_productos(qs, search, request.query_params.get("search_mode"))
 
         if editorial:
             # Front recomendado manda ID; mantenemos compatibilidad con nombre
@@ -81,33 +93,87 @@ class ListarProductosView(APIView):
         if grado:
             qs = qs.filter(grado__iexact=grado)
 
-        paginator = StandardPagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = ProductoSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        # ?page= (por defecto) o ?cursor= (keyset sobre nombre, id)
+        paginator = CatalogoPagination()
+        page = paginator.paginate_queryset(ProductoRapidoSerializer.preparar(qs), request)
+        return paginator.get_paginated_response(ProductoRapidoSerializer.filas(page))
 
 
 class FiltrosProductosView(APIView):
+    @method_decorator(catalogo_condicional)
     def get(self, request):
-        qs = Producto.objects.select_related("editorial").filter(estado=True)
+        # Una sola consulta (GROUPING SETS) con conteos; cada faceta respeta los demás
+        # filtros aplicados (?editorial, ?nivel, ?area, ?grado, ?search).
+        facetas = facetas_productos(
+            request.query_params,
+            search=request.query_params.get("search"),
+            search_mode=request.query_params.get("search_mode"),
+        )
 
-        editoriales = list(
-            Editorial.objects.filter(productos__estado=True)
-            .distinct()
-            .order_by("nombre")
-            .values("id", "nombre")
+        return Response(
+            {
+                # formato anterior (compatibilidad con el front)
+                "editoriales": [{"id": e["id"], "nombre": e["nombre"]} for e in facetas["editoriales"]],
+                "niveles": [x["valor"] for x in facetas["niveles"]],
+                "areas": [x["valor"] for x in facetas["areas"]],
+                "grados": [x["valor"] for x in facetas["grados"]],
+                # con conteo de productos activos por opción
+                "facetas": facetas,
+            }
         )
 
-        niveles = list(qs.values_list("nivel", flat=True).distinct().exclude(nivel="").order_by("nivel"))
-        areas = list(qs.values_list("area", flat=True).distinct().exclude(area="").order_by("area"))
-        grados = list(qs.values_list("grado", flat=True).distinct().exclude(grado="").order_by("grado"))
 
+class SnapshotCatalogoView(APIView):
+    """
+    GET /api/productos/snapshot/
+    Catálogo activo completo en un solo payload columnar comprimido (ver catalogo.construir_snapshot).
+    Se genera una vez por versión del catálogo y se sirve desde disco; 304 con If-None-Match.
+    """
+
+    @method_decorator(condition(etag_func=etag_snapshot))
+    def get(self, request):
+        version, archivo = abrir_snapshot()
+
+        if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+            response = FileResponse(archivo, content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+        else:
+            with archivo:
+                response = HttpResponse(gzip.decompress(archivo.read()), content_type="application/json")
+
+        # la versión pudo cambiar entre el ETag del decorador y la generación: manda la del archivo
+        response["ETag"] = f'"catalogo-snapshot-{version}"'
+        response["X-Catalogo-Version"] = str(version)
+        patch_vary_headers(response, ["Accept-Encoding"])
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CambiosCatalogoView(APIView):
+    """
+    GET /api/productos/cambios/?since=<version>
+    Delta del catálogo desde una versión: productos activos cambiados + ids dados de baja.
+    Si "completo" viene en true el cliente debe recargar el snapshot completo.
+    """
+
+    @method_decorator(catalogo_condicional)
+    def get(self, request):
+        try:
+            since = int(request.query_params.get("since", ""))
+            if since < 0:
+                raise ValueError
+        except ValueError:
+            return Response({"detail": "since inválido"}, status=400)
+
+        delta = cambios_desde(since)
         return Response(
             {
-                "editoriales": editoriales,
-                "niveles": niveles,
-                "areas": areas,
-                "grados": grados,
+                "since": since,
+                "version": delta["version"],
+                "completo": delta["completo"],
+                "productos": ProductoRapidoSerializer(delta["productos"]).data,
+                "bajas": delta["bajas"],
+                "editoriales": list(Editorial.objects.order_by("nombre").values("id", "nombre")),
             }
         )
 
@@ -124,8 +190,11 @@ class CalcularDetalleView(APIView):
             if not producto_id:
                 return Response({"detail": "producto_id es requerido"}, status=400)
 
-            producto = Producto.objects.select_related("editorial").get(id=producto_id)
-            out = calcular_item(tipo_venta, producto, request.data)
+            producto_id = int(producto_id)
+            producto = precios_productos([producto_id]).get(producto_id)
+            if producto is None:
+                raise Producto.DoesNotExist
+            out = calcular_item(tipo_venta, producto, request.data, backend=request.data.get("backend"))
             return Response(out, status=200)
 
         except Producto.DoesNotExist:
@@ -147,17 +216,15 @@ class CalcularBatchView(APIView):
                 return Response({"detail": "items debe ser una lista no vacía"}, status=400)
 
             productos_ids = [x.get("producto_id") for x in items if x.get("producto_id")]
-            productos = {
-                p.id: p
-                for p in Producto.objects.filter(id__in=productos_ids).select_related("editorial")
-            }
-
-            out_items = []
-            for x in items:
-                pid = x.get("producto_id")
-                if not pid or pid not in productos:
-                    continue
-                out_items.append(calcular_item(tipo_venta, productos[pid], x))
+            productos = precios_productos(productos_ids)
+
+            validos = [x for x in items if x.get("producto_id") in productos]
+            out_items = calcular_batch(
+                tipo_venta,
+                validos,
+                [productos[x["producto_id"]] for x in validos],
+                backend=request.data.get("backend"),
+            )
 
             return Response({"tipo_venta": tipo_venta, "items": out_items}, status=200)
 
@@ -165,10 +232,173 @@ class CalcularBatchView(APIView):
             return Response({"detail": f"Error batch: {str(e)}"}, status=400)
 
 
+def _ndjson(obj) -> bytes:
+    # mismo encoder que el JSONRenderer de DRF (Decimal -> número)
+    return (json.dumps(obj, cls=JSONEncoder, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _items_ndjson(stream):
+    """Lee un item por línea del body sin cargarlo entero en memoria."""
+    for n, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = None
+        if not isinstance(item, dict):
+            yield {"_error": f"Línea {n}: JSON inválido"}
+            continue
+        yield item
+
+
+def _stream_batch(tipo_venta, items, backend, chunk_size):
+    total_bruto = Decimal("0.00")
+    total_utilidad = Decimal("0.00")
+    calculados = 0
+    omitidos = 0
+
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+
+        ids = [x.get("producto_id") for x in chunk if isinstance(x.get("producto_id"), int)]
+        productos = precios_productos(ids)
+
+        # primero se validan los items del bloque, luego se emite en el orden de entrada
+        errores, validos, cantidades = [], [], []
+        for x in chunk:
+            pid = x.get("producto_id")
+            error = None
+            if "_error" in x:
+                error = {"error": x["_error"]}
+            elif not isinstance(pid, int) or pid not in productos:
+                error = {"producto_id": pid, "error": "Producto no existe"}
+            else:
+                try:
+                    cantidades.append(int(x.get("cantidad") or 1))
+                    validos.append(x)
+                except (TypeError, ValueError):
+                    error = {"producto_id": pid, "error": "cantidad inválida"}
+            errores.append(error)
+
+        rows = iter(calcular_batch(
+            tipo_venta, validos, [productos[x["producto_id"]] for x in validos], backend=backend
+        ))
+        cantidades = iter(cantidades)
+        for error in errores:
+            if error:
+                omitidos += 1
+                yield _ndjson(error)
+                continue
+
+            row = next(rows)
+            cantidad = next(cantidades)
+            total_bruto += row.get("precio_ie", row.get("precio_consigna", 0)) * cantidad
+            total_utilidad += row["utilidad_be_x_un"] * cantidad
+            calculados += 1
+            yield _ndjson(row)
+
+    yield _ndjson({
+        "totales": {
+            "items": calculados,
+            "omitidos": omitidos,
+            "total_bruto": total_bruto,
+            "total_utilidad": total_utilidad,
+        }
+    })
+
+
+class CalcularBatchStreamView(APIView):
+    """
+    Igual que CalcularBatchView pero responde NDJSON: una línea por item calculado
+    y al final una línea {"totales": ...} (ponderados por cantidad).
+
+    Entrada:
+    - JSON {tipo_venta, backend?, items: [...]}
+    - o NDJSON (Content-Type: application/x-ndjson), un item por línea, con
+      ?tipo_venta=...&backend=... ; así tampoco se carga la entrada completa.
+    Se calcula por bloques de CHUNK_SIZE items, la memoria no crece con el total.
+    """
+    CHUNK_SIZE = 500
+
+    def post(self, request):
+        if (request.content_type or "").startswith("application/x-ndjson"):
+            tipo_venta = request.query_params.get("tipo_venta")
+            backend = request.query_params.get("backend")
+            items = _items_ndjson(request._request)
+        else:
+            tipo_venta = request.data.get("tipo_venta")
+            backend = request.data.get("backend")
+            items = request.data.get("items", [])
+            if not isinstance(items, list) or not items:
+                return Response({"detail": "items debe ser una lista no vacía"}, status=400)
+            items = (x if isinstance(x, dict) else {"_error": "Item inválido"} for x in items)
+
+        if not tipo_venta:
+            return Response({"detail": "tipo_venta es requerido"}, status=400)
+        try:
+            tipo_venta = validar_tipo_venta(tipo_venta)
+            validar_backend(backend)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        resp = StreamingHttpResponse(
+            _stream_batch(tipo_venta, items, backend, self.CHUNK_SIZE),
+            content_type="application/x-ndjson",
+        )
+        resp["X-Accel-Buffering"] = "no"
+        return resp
+
+
+# =========================================================
+# LISTADOS DE PANEL (filtros + orden en SQL + paginación opcional)
+# =========================================================
+def _es_resumen(request):
+    return (request.query_params.get("resumen") or "").lower() in ("1", "true", "si", "sí")
+
+
+def _listado_panel(request, queryset, filterset_class, serializer_class, ordenables, defecto=("-id",)):
+    """
+    Filtros (FilterSet) + ?ordering= (lista blanca) + ?page / ?cursor (PanelPagination).
+    Sin parámetros de paginación responde la lista completa, como antes.
+    serializer_class puede ser un ValuesSerializer (filas desde .values()) o un DRF.
+    """
+    filtro = filterset_class(request.query_params, queryset=queryset, request=request)
+    if not filtro.is_valid():
+        return Response(filtro.errors, status=400)
+
+    orden = orden_solicitado(request, ordenables, defecto)
+    qs = filtro.qs.order_by(*orden)
+    paginator = PanelPagination(ordering=orden)
+
+    if hasattr(serializer_class, "preparar"):
+        qs = serializer_class.preparar(qs, extra=[o.lstrip("-") for o in orden])
+        page = paginator.paginate_queryset(qs, request)
+        data = serializer_class.filas(qs if page is None else page)
+    else:
+        page = paginator.paginate_queryset(qs, request)
+        data = serializer_class(qs if page is None else page, many=True).data
+
+    if page is None:
+        return Response(data, status=200)
+    return paginator.get_paginated_response(data)
+
+
 # =========================================================
 # COTIZACIONES (V1)
 # =========================================================
 class GuardarCotizacionView(APIView):
+    """
+    Guarda cabecera + detalles en consultas constantes: validación y precios del lote
+    completo en memoria (snapshot + calcular_batch) y un solo bulk_create de detalles.
+    Si algún item es inválido no se guarda nada y se devuelve "errores" con su posición.
+    """
+
+    @idempotente
     @transaction.atomic
     def post(self, request):
         try:
@@ -183,55 +413,99 @@ class GuardarCotizacionView(APIView):
                 return Response({"detail": "tipo_venta es requerido"}, status=400)
             if not items:
                 return Response({"detail": "Debe enviar items"}, status=400)
+            if not isinstance(items, list):
+                return Response({"detail": "items debe ser una lista"}, status=400)
+
+            try:
+                tipo_venta = validar_tipo_venta(tipo_venta)
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=400)
+
+            # 1) validar items (sin consultas)
+            errores = []
+            validos = []   # (index, item, producto_id, cantidad)
+            for i, x in enumerate(items):
+                if not isinstance(x, dict):
+                    errores.append({"index": i, "producto_id": None, "detail": "Item inválido."})
+                    continue
+                try:
+                    pid, _, cantidad = validar_item(x, tipo_venta)
+                except ValueError as e:
+                    errores.append({"index": i, "producto_id": x.get("producto_id"), "detail": str(e)})
+                    continue
+                if cantidad < 1:
+                    errores.append({"index": i, "producto_id": pid, "detail": "cantidad inválida."})
+                    continue
+                validos.append((i, x, pid, cantidad))
+
+            # 2) una sola carga de precios para todo el lote
+            productos = precios_productos([pid for _, _, pid, _ in validos])
+            for i, x, pid, _ in validos:
+                if pid not in productos:
+                    errores.append({"index": i, "producto_id": pid, "detail": "Producto no existe."})
+
+            if errores:
+                errores.sort(key=lambda e: e["index"])
+                return Response({"detail": "Hay items inválidos", "errores": errores}, status=400)
+
+            # 3) precios del lote + un INSERT para los detalles
+            calcs = calcular_batch(
+                tipo_venta,
+                [x for _, x, _, _ in validos],
+                [productos[pid] for _, _, pid, _ in validos],
+            )
 
             cot = Cotizacion.objects.create(
                 institucion_id=institucion_id,
                 asesor_id=asesor_id or None,
             )
 
-            productos_ids = [x.get("producto_id") for x in items if x.get("producto_id")]
-            productos = {
-                p.id: p
-                for p in Producto.objects.filter(id__in=productos_ids).select_related("editorial")
-            }
-
-            for x in items:
-                pid = x.get("producto_id")
-                if not pid or pid not in productos:
-                    continue
+            DetalleCotizacion.objects.bulk_create(
+                [
+                    DetalleCotizacion(
+                        cotizacion=cot,
+                        producto_id=pid,
+                        cantidad=cantidad,
+                        precio_be=calc.get("precio_be") or Decimal("0"),
+                        desc_proveedor=calc.get("desc_proveedor") or Decimal("0"),
+                        precio_proveedor=calc.get("precio_proveedor") or Decimal("0"),
+                        descuento_ie=calc.get("descuento_ie") or Decimal("0"),
+                        precio_ie=calc.get("precio_ie", calc.get("precio_consigna")) or Decimal("0"),
+                        precio_ppff=calc.get("precio_ppff") or Decimal("0"),
+                        utilidad_ie=calc.get("utilidad_ie") or Decimal("0"),
+                        roi_ie=calc.get("utilidad_be_x_un") or Decimal("0"),
+                        tipo_venta=calc.get("tipo_venta"),
+                    )
+                    for (_, _, pid, cantidad), calc in zip(validos, calcs)
+                ],
+                batch_size=500,
+            )
 
-                calc = calcular_item(tipo_venta, productos[pid], x)
-
-                descuento_ie = Decimal(calc.get("descuento_ie", 0) or 0)
-                precio_ie = Decimal(calc.get("precio_ie", calc.get("precio_consigna", 0)) or 0)
-                precio_ppff = Decimal(calc.get("precio_ppff", 0) or 0)
-                utilidad_ie = Decimal(calc.get("utilidad_ie", 0) or 0)
-
-                DetalleCotizacion.objects.create(
-                    cotizacion=cot,
-                    producto_id=pid,
-                    cantidad=int(x.get("cantidad") or 1),
-                    precio_be=Decimal(calc.get("precio_be") or 0),
-                    desc_proveedor=Decimal(calc.get("desc_proveedor") or 0),
-                    precio_proveedor=Decimal(calc.get("precio_proveedor") or 0),
-                    descuento_ie=descuento_ie,
-                    precio_ie=precio_ie,
-                    precio_ppff=precio_ppff,
-                    utilidad_ie=utilidad_ie,
-                    roi_ie=Decimal(calc.get("utilidad_be_x_un") or 0),
-                    tipo_venta=calc.get("tipo_venta"),
-                )
+            # bulk_create no dispara señales: resumen (tipo_venta / totales) una sola vez
+            recalcular_resumen_cotizacion(cot.id)
 
+            cot = (
+                Cotizacion.objects.select_related("institucion", "asesor")
+                .prefetch_related("detalles__producto__editorial")
+                .get(pk=cot.pk)
+            )
             return Response(CotizacionSerializer(cot).data, status=201)
 
         except Exception as e:
+            transaction.set_rollback(True)
             return Response({"detail": f"Error guardando: {str(e)}"}, status=400)
 
 
 class ListarCotizacionesView(APIView):
     def get(self, request):
-        qs = Cotizacion.objects.select_related("institucion", "asesor").prefetch_related("detalles").order_by("-id")
-        return Response(CotizacionListSerializer(qs, many=True).data, status=200)
+        # ?estado ?asesor ?institucion ?tipo_venta ?fecha_desde ?fecha_hasta ?ordering ?page|?cursor
+        return _listado_panel(
+            request,
+            Cotizacion.objects.all(),
+            CotizacionFilter,
+            CotizacionListRapidoSerializer,
+            ordenables=("id", "fecha", "estado", "cantidad_total", "total_precio_ie"),
+        )
 
 
 class DetalleCotizacionRetrieveView(APIView):
@@ -271,6 +545,20 @@ class CambiarEstadoCotizacionView(APIView):
             return Response({"detail": "Cotización no existe"}, status=404)
 
 
+class CambiarEstadoLoteView(APIView):
+    """
+    POST {"ids": [..], "estado": "APROBADA"}  o  {"cambios": [{"id", "estado", "motivo"}]}
+    Un UPDATE condicional por estado destino; responde el resultado por id.
+    """
+
+    def post(self, request):
+        try:
+            cambios = normalizar_cambios(request.data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        return Response(transicionar_cotizaciones(cambios), status=200)
+
+
 class PDFCotizacionView(APIView):
     def get(self, request, pk):
         try:
@@ -293,6 +581,14 @@ class PDFCotizacionView(APIView):
 # ADOPCIONES (V1)
 # =========================================================
 class CrearAdopcionView(APIView):
+    """
+    Registra (o reemplaza) la adopción de una cotización en consultas constantes:
+    todos los detalle_id se resuelven en una consulta, se compara con los DetalleAdopcion
+    existentes y solo se inserta / actualiza / borra lo que cambió (bulk_*).
+    cantidad_total se recalcula una sola vez al final.
+    """
+
+    @idempotente
     @transaction.atomic
     def post(self, request):
         try:
@@ -307,53 +603,108 @@ class CrearAdopcionView(APIView):
             if cot.estado not in [EstadoCotizacion.APROBADA, EstadoCotizacion.PENDIENTE]:
                 return Response({"detail": "La cotización no se puede adoptar en este estado."}, status=400)
 
-            adopcion, _ = Adopcion.objects.get_or_create(cotizacion=cot)
-
-            adopcion.detalles.all().delete()
-
-            total = 0
-            for x in items:
-                detalle_id = x.get("detalle_id")
-                cantidad = int(x.get("cantidad") or 0)
-                mes_lectura = x.get("mes_lectura") or None
+            if not isinstance(items, list):
+                return Response({"detail": "items debe ser una lista"}, status=400)
 
+            # 1) items pedidos (cantidad <= 0 => no se adopta), validados antes de consultar
+            pedidos = []   # (detalle_id, cantidad, mes_lectura)
+            errores = []
+            for i, x in enumerate(items):
+                if not isinstance(x, dict):
+                    errores.append({"index": i, "detalle_id": None, "detail": "Item inválido."})
+                    continue
+                try:
+                    cantidad = int(x.get("cantidad") or 0)
+                except (TypeError, ValueError):
+                    errores.append({"index": i, "detalle_id": x.get("detalle_id"), "detail": "cantidad inválida."})
+                    continue
                 if cantidad <= 0:
                     continue
+                try:
+                    detalle_id = int(x.get("detalle_id"))
+                except (TypeError, ValueError):
+                    errores.append({"index": i, "detalle_id": x.get("detalle_id"), "detail": "detalle_id inválido."})
+                    continue
+                pedidos.append((detalle_id, cantidad, x.get("mes_lectura") or None))
 
-                det = DetalleCotizacion.objects.select_related("producto").get(id=detalle_id, cotizacion=cot)
+            if errores:
+                return Response({"detail": "Hay items inválidos", "errores": errores}, status=400)
 
-                DetalleAdopcion.objects.create(
-                    adopcion=adopcion,
-                    producto=det.producto,
-                    cantidad_adoptada=cantidad,
-                    mes_lectura=mes_lectura,
-                )
-                total += cantidad
+            # 2) detalle_id -> producto_id en una sola consulta
+            productos = dict(
+                DetalleCotizacion.objects.filter(cotizacion=cot, id__in={d for d, _, _ in pedidos})
+                .values_list("id", "producto_id")
+            )
+            faltantes = sorted({d for d, _, _ in pedidos if d not in productos})
+            if faltantes:
+                return Response({"detail": "Detalle no existe", "detalle_ids": faltantes}, status=404)
+
+            adopcion, _ = Adopcion.objects.get_or_create(cotizacion=cot)
 
-            adopcion.cantidad_total = total
-            adopcion.save(update_fields=["cantidad_total"])
+            # 3) diff por producto (en orden, respeta productos repetidos)
+            existentes = {}
+            for det in adopcion.detalles.order_by("id"):
+                existentes.setdefault(det.producto_id, []).append(det)
+
+            crear, actualizar = [], []
+            for detalle_id, cantidad, mes_lectura in pedidos:
+                pid = productos[detalle_id]
+                previos = existentes.get(pid)
+                if previos:
+                    det = previos.pop(0)
+                    if det.cantidad_adoptada != cantidad or det.mes_lectura != mes_lectura:
+                        det.cantidad_adoptada = cantidad
+                        det.mes_lectura = mes_lectura
+                        actualizar.append(det)
+                else:
+                    crear.append(DetalleAdopcion(
+                        adopcion=adopcion,
+                        producto_id=pid,
+                        cantidad_adoptada=cantidad,
+                        mes_lectura=mes_lectura,
+                    ))
+            borrar = [det.id for dets in existentes.values() for det in dets]
+
+            with recalculo_suspendido():
+                if borrar:
+                    DetalleAdopcion.objects.filter(id__in=borrar).delete()
+                if actualizar:
+                    DetalleAdopcion.objects.bulk_update(actualizar, ["cantidad_adoptada", "mes_lectura"], batch_size=500)
+                if crear:
+                    DetalleAdopcion.objects.bulk_create(crear, batch_size=500)
+
+            recalcular_cantidad_adopcion(adopcion.id)
 
             cot.estado = EstadoCotizacion.ADOPTADA
             cot.save(update_fields=["estado"])
 
-            return Response({"detail": "Adopción registrada correctamente."}, status=201)
+            return Response(
+                {
+                    "detail": "Adopción registrada correctamente.",
+                    "creados": len(crear),
+                    "actualizados": len(actualizar),
+                    "borrados": len(borrar),
+                },
+                status=201,
+            )
 
         except Cotizacion.DoesNotExist:
             return Response({"detail": "Cotización no existe"}, status=404)
-        except DetalleCotizacion.DoesNotExist:
-            return Response({"detail": "Detalle no existe"}, status=404)
         except Exception as e:
+            transaction.set_rollback(True)
             return Response({"detail": f"Error adopción: {str(e)}"}, status=400)
 
 
 class ListarAdopcionesView(APIView):
     def get(self, request):
-        qs = (
-            Adopcion.objects.select_related("cotizacion__institucion", "cotizacion__asesor")
-            .prefetch_related("detalles__producto__editorial", "cotizacion__detalles")
-            .order_by("-id")
+        # ?resumen=1 => sin detalles anidados
+        return _listado_panel(
+            request,
+            Adopcion.objects.all(),
+            AdopcionFilter,
+            AdopcionResumenRapidoSerializer if _es_resumen(request) else AdopcionRapidoSerializer,
+            ordenables=("id", "fecha_adopcion", "cantidad_total"),
         )
-        return Response(AdopcionSerializer(qs, many=True).data, status=200)
 
 
 class ExportarAdopcionPDFView(APIView):
@@ -361,7 +712,7 @@ class ExportarAdopcionPDFView(APIView):
         try:
             adop = (
                 Adopcion.objects.select_related("cotizacion__institucion", "cotizacion__asesor")
-                .prefetch_related("detalles__producto__editorial", "cotizacion__detalles")
+                .prefetch_related("detalles__producto__editorial")
                 .get(id=adopcion_id)
             )
             pdf_bytes = generar_pdf_adopcion(adop)
@@ -379,15 +730,18 @@ class ExportarAdopcionPDFView(APIView):
 # =========================================================
 class ListarPedidosView(APIView):
     def get(self, request):
-        qs = (
-            Pedido.objects.select_related("adopcion__cotizacion")
-            .prefetch_related("detalles__producto__editorial")
-            .order_by("-id")
+        # ?resumen=1 => sin detalles anidados
+        return _listado_panel(
+            request,
+            Pedido.objects.all(),
+            PedidoFilter,
+            PedidoResumenRapidoSerializer if _es_resumen(request) else PedidoRapidoSerializer,
+            ordenables=("id", "fecha_pedido", "estado"),
         )
-        return Response(PedidoSerializer(qs, many=True).data, status=200)
 
 
 class CrearPedidoView(APIView):
+    @idempotente
     @transaction.atomic
     def post(self, request):
         try:
@@ -395,44 +749,70 @@ class CrearPedidoView(APIView):
             if not adopcion_id:
                 return Response({"detail": "adopcion_id es requerido"}, status=400)
 
-            adop = (
-                Adopcion.objects.select_related("cotizacion")
-                .prefetch_related("detalles__producto")
-                .get(id=adopcion_id)
-            )
-
-            pedido, _ = Pedido.objects.get_or_create(adopcion=adop)
-
-            pedido.detalles.all().delete()
-            for det in adop.detalles.all():
-                DetallePedido.objects.create(
-                    pedido=pedido,
-                    producto=det.producto,
-                    cantidad=det.cantidad_adoptada,
-                    precio_proveedor=det.producto.precio_proveedor,
+            adopciones = Adopcion.objects.filter(id=adopcion_id)
+            if not adopciones.exists():
+                return Response({"detail": "Adopción no existe"}, status=404)
+
+            # mismo camino y mismos estados regenerables que el lote
+            res = generar_pedidos(adopciones)
+            if res["omitidos"]:
+                omitido = res["omitidos"][0]
+                return Response(
+                    {
+                        "detail": f"El pedido está {omitido['estado']}: ya no se puede regenerar.",
+                        "pedido": omitido["pedido"],
+                        "estado": omitido["estado"],
+                    },
+                    status=409,
                 )
 
-            pedido.estado = EstadoPedido.BORRADOR
-            pedido.save(update_fields=["estado"])
-
             return Response({"detail": "Pedido creado"}, status=201)
 
-        except Adopcion.DoesNotExist:
-            return Response({"detail": "Adopción no existe"}, status=404)
         except Exception as e:
+            transaction.set_rollback(True)
             return Response({"detail": f"Error pedido: {str(e)}"}, status=400)
 
 
+class GenerarPedidosView(APIView):
+    """
+    POST {"asesor", "fecha_desde", "fecha_hasta", "editorial", ...} (filtros de AdopcionFilter)
+    Genera / regenera los pedidos de todas las adopciones que cumplen el filtro.
+    Los pedidos ya enviados (en una orden de compra) o cerrados se omiten y se informan.
+    """
+
+    def post(self, request):
+        filtros = AdopcionFilter(request.data, queryset=Adopcion.objects.all())
+        if not filtros.is_valid():
+            return Response({"detail": "Filtros inválidos", "errores": filtros.errors}, status=400)
+        if not any(v not in (None, "", []) for v in filtros.form.cleaned_data.values()):
+            return Response({"detail": "Debe indicar al menos un filtro"}, status=400)
+
+        res = generar_pedidos(filtros.qs)
+        return Response(res, status=201 if res["pedidos"] else 200)
+
+
 # =========================================================
 # MAESTROS (V1)
 # =========================================================
 class ListarAsesoresView(APIView):
     def get(self, request):
-        qs = AsesorComercial.objects.all().order_by("nombre")
-        return Response(AsesorComercialSerializer(qs, many=True).data, status=200)
+        return _listado_panel(
+            request,
+            AsesorComercial.objects.all(),
+            AsesorFilter,
+            AsesorComercialSerializer,
+            ordenables=("id", "nombre"),
+            defecto=("nombre", "id"),
+        )
 
 
 class ListarColegiosView(APIView):
     def get(self, request):
-        qs = InstitucionEducativa.objects.all().order_by("nombre")
-        return Response(InstitucionEducativaSerializer(qs, many=True).data, status=200)
+        return _listado_panel(
+            request,
+            InstitucionEducativa.objects.all(),
+            ColegioFilter,
+            InstitucionEducativaSerializer,
+            ordenables=("id", "nombre", "distrito"),
+            defecto=("nombre", "id"),
+        )